@@ -0,0 +1,71 @@
+import os
+import queue
+import re
+import threading
+
+
+class Archive(object):
+    '''This class saves the raw HTML of every page downloaded during a run to an
+    archive directory. Pages are handed to a background thread that writes them
+    to disk, so scraping never waits on the archive.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    directory = "archive"  # Default directory the pages are archived in
+
+
+    def __init__(self, directory = None):
+
+        self.directory = directory if directory else Archive.directory
+        os.makedirs(self.directory, exist_ok = True)
+
+        # Pages waiting to be written, a None tells the writer to stop
+        self.pages = queue.Queue()
+        self.count = 0  # Number of pages written so far
+
+        # Start the background thread that writes the pages to disk
+        self.writer = threading.Thread(target = self.write, daemon = True)
+        self.writer.start()
+
+
+    def add(self, link, content):
+        '''Queues the raw content of the page found at the link to be written to
+        the archive directory.'''
+
+        self.pages.put((link, content))
+
+
+    def write(self):
+        '''Writes each queued page to its own file until the archive is closed.
+        This method runs on the background thread.'''
+
+        while True:
+            page = self.pages.get()
+            if page is None:
+                break
+
+            link, content = page
+            # Write to a temporary file first so a half written page is never left behind
+            path = os.path.join(self.directory, Archive.fileName(link))
+            with open(path + ".tmp", "wb") as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
+            self.count += 1
+
+
+    def close(self):
+        '''Waits for every queued page to be written and stops the background thread.'''
+
+        self.pages.put(None)
+        self.writer.join()
+
+
+    @staticmethod
+    def fileName(link):
+        '''Returns the name of the file a link is archived under.'''
+
+        # Drop the scheme and replace anything that is not safe in a file name
+        name = link.split("://", 1)[-1].strip("/")
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", name) + ".html"
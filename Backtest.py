@@ -0,0 +1,177 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Player import Player
+from StatTable import StatTable
+from Store import Store
+from Teams import Teams
+
+
+class Backtest(object):
+    '''This class checks how well the player scores predict what actually
+    happened, using the weeks kept in the store. Each stored week is replayed
+    with the rankings and schedules that were gathered going into that week,
+    every player with a game that week is scored as they would have been, and
+    the ranking of the scores is compared to the ranking of the fantasy points
+    the players actually made with a Spearman rank correlation. Every week is
+    replayed in its own process, so a backtest of several seasons uses every
+    core of the machine. Defenses are left out, their score is not worked out
+    from their matchup and the points they allowed are not stored.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    positions = ["QB", "RB", "WR", "TE"]  # Positions the correlation is also shown for
+
+
+    def __init__(self, path = None, workers = None, seasons = None):
+
+        self.path = path if path else Store.path   # Database the weeks are replayed from
+        self.workers = workers if workers else os.cpu_count()
+        self.seasons = seasons  # Seasons to replay, None replays every season stored
+        self.results = []       # Holds the results of every week once the backtest is run
+
+
+    def weeks(self):
+        '''Returns the (season, week) of every week stored, oldest first.'''
+
+        store = Store(self.path)
+        try:
+            weeks = store.query("SELECT DISTINCT season, week FROM rankings ORDER BY season, week")
+        finally:
+            store.close()
+
+        return [w for w in weeks if not self.seasons or w[0] in self.seasons]
+
+
+    def run(self):
+        '''Replays every week at the same time across a pool of processes and
+        returns the results of each week in order.'''
+
+        weeks = self.weeks()
+        if not weeks:
+            raise LookupError("No weeks to replay in {0}".format(self.path))
+
+        with ProcessPoolExecutor(max_workers = min(self.workers, len(weeks))) as pool:
+            self.results = list(pool.map(Backtest.replayWeek, [(self.path,) + tuple(w) for w in weeks]))
+
+        return self.results
+
+
+    def printResults(self):
+        '''Prints the rank correlation of every week and the average over all of them.'''
+
+        print("\nBacktest of {0} weeks from {1}\n".format(len(self.results), self.path))
+        print("  {0:<8}{1:<6}{2:<9}{3:<10}".format("Season", "Week", "Players", "Spearman") +
+              "".join("{0:<7}".format(pos) for pos in Backtest.positions))
+
+        show = lambda x: "-" if np.isnan(x) else "{0:.3f}".format(x)
+        for r in self.results:
+            print("  {0:<8}{1:<6}{2:<9}{3:<10}".format(r["season"], r["week"], r["players"], show(r["spearman"])) +
+                  "".join("{0:<7}".format(show(r["positions"][pos])) for pos in Backtest.positions))
+
+        # Weeks that could not be ranked are left out of the average
+        weekly = [r["spearman"] for r in self.results if not np.isnan(r["spearman"])]
+        print("\n  Average Spearman: {0}\n".format(show(np.mean(weekly)) if weekly else "-"))
+        print("  Defenses are not backtested: their score is not worked out from their matchup yet,\n"
+              "  and the points each defense allowed are not kept in the store.\n")
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def replayWeek(args):
+        '''Scores every player that played in a stored week the way they would
+        have been scored going into it, and compares the scores to the points
+        they made. Runs in a process of its own, so it opens its own store.'''
+
+        path, season, week = args
+        store = Store(path)
+        try:
+            store.loadLeague(season, week)
+            # A player traded since is scored with the team they were on that week, the closest stored
+            # week before it or else after it, and their newest team when no week of theirs was stored
+            rows = store.query("SELECT p.name, p.position, COALESCE("
+                               "(SELECT w.teamId FROM playerWeeks w WHERE w.name = g.name AND w.season = g.season "
+                               "AND w.week <= g.game ORDER BY w.week DESC LIMIT 1), "
+                               "(SELECT w.teamId FROM playerWeeks w WHERE w.name = g.name AND w.season = g.season "
+                               "AND w.week > g.game ORDER BY w.week LIMIT 1), p.teamId), "
+                               "p.gameCategories, g.opponent, g.stats "
+                               "FROM gameLogs g JOIN players p ON p.name = g.name "
+                               "WHERE g.season = ? AND g.game = ?", (season, week))
+
+            players, actual = [], []
+            for name, position, teamId, categories, opponent, stats in rows:
+                p = Player(name)
+                p.position = position
+                p.teamId = teamId
+                p.opponent = Teams.BYE if opponent is None else opponent
+                # Only the games played before this week were known going into it
+                p.gameCategories = json.loads(categories)
+                p.gameStats = [g for g in store.gameLog(name, season) if int(g[0]) < week]
+                p.schedule = [t for t in (Teams.find(g[1]) for g in p.gameStats) if t is not None]
+                p.gameTable = StatTable(p.gameCategories, p.gameStats)
+                players.append(p)
+                actual.append(Backtest.fantasyPoints(position, p.gameCategories, json.loads(stats)))
+        finally:
+            store.close()
+
+        Player.calculateScores(players)
+        scores = np.array([float(p.score) for p in players])
+        actual = np.array(actual)
+
+        # Rank correlation for everyone and for each position on its own
+        byPosition = {}
+        for pos in Backtest.positions:
+            mask = np.array([p.position == pos for p in players], dtype = bool)
+            byPosition[pos] = Backtest.spearman(scores[mask], actual[mask])
+
+        return {"season": season, "week": week, "players": len(players),
+                "spearman": Backtest.spearman(scores, actual), "positions": byPosition}
+
+
+    @staticmethod
+    def fantasyPoints(position, categories, row):
+        '''Returns the fantasy points made in a single game log row.'''
+
+        p = Player("")
+        p.position = position
+        p.gameStats = [row]
+        p.gameTable = StatTable(categories, [row])
+        return float(p.gamePoints()[0])
+
+
+    @staticmethod
+    def spearman(x, y):
+        '''Returns the Spearman rank correlation of two arrays, NaN when either
+        array has fewer than two values or all of its values are the same.'''
+
+        if len(x) < 2:
+            return np.nan
+
+        rx, ry = Backtest.ranks(x), Backtest.ranks(y)
+        if np.std(rx) == 0 or np.std(ry) == 0:
+            return np.nan
+
+        return float(np.corrcoef(rx, ry)[0, 1])
+
+
+    @staticmethod
+    def ranks(values):
+        '''Returns the rank of each value, tied values share their average rank.'''
+
+        values = np.asarray(values, dtype = float)
+        order = np.argsort(values, kind = "mergesort")
+        ranks = np.empty(len(values))
+        ranks[order] = np.arange(1, len(values) + 1)
+
+        # Give every group of tied values the average of their ranks
+        unique, inverse = np.unique(values, return_inverse = True)
+        sums = np.bincount(inverse, weights = ranks)
+        counts = np.bincount(inverse)
+        return (sums / counts)[inverse]
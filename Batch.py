@@ -0,0 +1,117 @@
+import copy
+import os
+from Scraper import Scraper
+
+
+class Batch(object):
+    '''This class scores many rosters in a single run. Every roster is loaded
+    into its own Scraper, but players and defenses that appear on more than one
+    roster are only fetched and scored once, and each roster then gets a copy
+    of them that keeps the salary given in that roster. The league data is
+    gathered once for the whole batch, and each roster then gets its own
+    sorted team and starting lineup.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    extension = ".txt"  # Roster files picked up when a directory is given
+
+
+    def __init__(self, path, workers = None, slots = None, cap = None):
+
+        self.files = Batch.findRosters(path)  # Roster files in the batch
+        self.scrapers = []                     # Holds a Scraper for each roster
+        self.players = {}                      # Holds every unique player by name
+        self.defenses = {}                     # Holds every unique defense by team name
+
+        # Load each roster, the first roster a player or defense is found on gives the one that is fetched
+        for file in self.files:
+            scraper = Scraper(file = file, workers = workers, slots = slots, cap = cap)
+            scraper.teamName = os.path.splitext(os.path.basename(file))[0]
+            for p in scraper.players:
+                self.players.setdefault(p.name, p)
+            for d in scraper.defense:
+                self.defenses.setdefault(d.team, d)
+            self.scrapers.append(scraper)
+
+        # One scraper holding everyone is used to gather the data for the whole batch
+        self.universe = Scraper(workers = workers)
+        self.universe.teamName = "Batch"
+        self.universe.players = list(self.players.values())
+        self.universe.defense = list(self.defenses.values())
+
+
+    def run(self, directory = None):
+        '''Gathers the data for every unique player and defense, then sorts each
+        roster and picks its lineup. The teams are saved to the directory given,
+        or printed to the console when there is no directory.'''
+
+        print("Scoring {0} rosters with {1} unique players and {2} unique defenses..."
+              .format(len(self.scrapers), len(self.players), len(self.defenses)))
+
+        # Fetch and score everyone once
+        self.universe.getAllData()
+
+        # Players and defenses that could not be fetched were left out of the universe
+        players = {p.name: p for p in self.universe.players}
+        defenses = {d.team: d for d in self.universe.defense}
+
+        for scraper in self.scrapers:
+            scraper.players = Batch.copies(scraper.players, players, lambda p: p.name)
+            scraper.defense = Batch.copies(scraper.defense, defenses, lambda d: d.team)
+            scraper.sort()
+
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+                scraper.save(os.path.join(directory, "Week{0}_{1}.txt".format(Scraper.weekNumber, scraper.teamName)))
+            else:
+                print("\n" + scraper.teamName)
+                scraper.printTeam()
+
+        if directory:
+            print("Saved {0} teams to {1}".format(len(self.scrapers), directory))
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def copies(roster, scored, key):
+        '''Returns a copy of the scored player or defense for each one on the
+        roster, keeping the salary the roster gave it. Those that were not
+        scored are left out.'''
+
+        results = []
+        for x in roster:
+            if key(x) in scored:
+                shared = copy.copy(scored[key(x)])
+                shared.salary = x.salary
+                results.append(shared)
+
+        return results
+
+
+    @staticmethod
+    def findRosters(path):
+        '''Returns the roster files to score. The path can be a directory, where
+        every .txt file is a roster, or a manifest file listing one roster file
+        per line. Relative paths in a manifest are relative to the manifest.'''
+
+        if os.path.isdir(path):
+            return sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(Batch.extension))
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError("No roster directory or manifest found at '{0}'".format(path))
+
+        files = []
+        with open(path, "r") as reader:
+            for line in reader:
+                line = line.strip()
+                # Skip blank lines and comments
+                if line and not line.startswith("#"):
+                    files.append(os.path.join(os.path.dirname(path), line))
+
+        return files
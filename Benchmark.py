@@ -0,0 +1,356 @@
+from Fixtures import Fixtures
+from Transport import Transport
+from Parser import Parser
+from Scraper import Scraper
+from Player import Player
+from Defense import Defense
+from Grapher import Grapher
+from Teams import Teams
+from Lineup import Lineup
+from Simulation import Simulation
+from Snapshot import Snapshot
+from Store import Store
+import getopt
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+
+class Benchmark(object):
+    '''This class times each stage of the program on pages recorded with the
+    --record flag of FantasyFootball.py, so no network access is needed. Every
+    stage is run on synthetic rosters of increasing size built from the recorded
+    players and defenses, and the results are returned as a dictionary that can
+    be saved as JSON and compared with earlier runs.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    sizes = [1, 10, 100, 1000, 5000]  # Default number of players in each synthetic roster
+    threshold = 1.2                   # A stage this many times slower than the baseline is a regression
+    minimum = 0.005                   # Stages faster than this many seconds are too noisy to compare
+    startupRuns = 5                   # Number of times each startup command is run, the fastest run is kept
+
+
+    def __init__(self, directory, seed = 0):
+
+        # Serve every page from the recorded fixtures
+        self.directory = directory
+        self.fixtures = Fixtures(directory, replay = True)
+        Scraper.useTransport(Transport(replay = self.fixtures))
+        self.seed = seed
+
+        self.playerPages = {}    # Holds the stats page and game log page for each recorded player
+        self.schedulePages = []  # Holds each recorded defense schedule page
+        self.loadPages()
+
+
+    def loadPages(self):
+        '''Reads every recorded page into memory so that only parsing is timed.'''
+
+        for link in self.fixtures.index:
+            content = self.fixtures.load(link).content
+
+            # Sort the page by the type of link it was recorded from
+            if link.startswith(Player.statLink.split("{0}")[0]):
+                name = link.split("/")[4]
+                pages = self.playerPages.setdefault(name, [None, None])
+                if link == Player.scheduleLink.format(name):
+                    pages[1] = content
+                elif link == Player.statLink.format(name):
+                    pages[0] = content
+            elif link.startswith(Defense.scheduleLink.split("{0}")[0]):
+                self.schedulePages.append(content)
+            elif link == Player.defenseLink:
+                self.defensePage = content
+            elif link == Defense.offenseLink:
+                self.offensePage = content
+
+        # Only use the players that have both of their pages recorded
+        self.playerPages = {k: v for k, v in self.playerPages.items() if v[0] and v[1]}
+
+        if not self.playerPages or not self.schedulePages:
+            raise LookupError("'{0}' needs at least one recorded player and defense".format(self.directory))
+
+
+    def run(self, sizes = None):
+        '''Runs every stage for each roster size and returns all of the results.'''
+
+        results = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "python": platform.python_version(),
+                   "parser": Parser.backend if Parser.backend else Parser.findBackend(),
+                   "fixtures": self.directory,
+                   "results": []}
+
+        for n in (sizes if sizes else Benchmark.sizes):
+            results["results"].append({"players": n, "stages": self.runSize(n)})
+
+        results["startup"] = Benchmark.startup()
+        return results
+
+
+    def runSize(self, n):
+        '''Builds a synthetic roster of n players and n defenses and times every stage on it.'''
+
+        stages = {}
+        rand = random.Random(self.seed)  # Same roster every run so results can be compared
+        names = sorted(self.playerPages.keys())
+
+        # Create the synthetic roster from the recorded players and defenses
+        players = [Player(names[i % len(names)]) for i in range(n)]
+        defenses = [Defense("Defense {0}".format(i)) for i in range(n)]
+
+        # Parsing stages
+        Benchmark.timeStage(stages, "player_parse", n,
+                            lambda: [Benchmark.parsePlayer(p, self.playerPages[p.name]) for p in players])
+        Benchmark.timeStage(stages, "defense_rankings", 1, lambda: Player.parseDefenseRankings(self.defensePage))
+        Benchmark.timeStage(stages, "offense_rankings", 1, lambda: Defense.parseOffenseRankings(self.offensePage))
+        Benchmark.timeStage(stages, "defense_schedule_parse", n,
+                            lambda: [d.parseSchedule(self.schedulePages[i % len(self.schedulePages)]) for i, d in enumerate(defenses)])
+
+        # Give every player and defense opponents that are in the league tables
+        defenseTeams = sorted(k for k in Player.defenseRankings if k != Teams.BYE)
+        offenseTeams = sorted(k for k in Defense.offenseRankings if k != Teams.BYE)
+        for p in players:
+            p.schedule = [rand.choice(defenseTeams) for _ in range(max(len(p.schedule), 1))]
+            p.opponent = rand.choice(defenseTeams)
+            for game in p.gameStats:
+                game[1] = Teams.nickname(rand.choice(defenseTeams))
+            p.gameTable.setColumn(1, [game[1] for game in p.gameStats])
+        for d in defenses:
+            d.schedule = [rand.choice(offenseTeams) for _ in range(max(len(d.schedule), 1))]
+            d.opponent = rand.choice(offenseTeams)
+
+        # Scoring stages
+        Benchmark.timeStage(stages, "player_score", n, lambda: [p.calculateScore() for p in players])
+        Benchmark.timeStage(stages, "player_score_batch", n, lambda: Player.calculateScores(players))
+        Benchmark.timeStage(stages, "defense_score", n, lambda: [d.calculateScore() for d in defenses])
+        Benchmark.timeStage(stages, "simulation", n, lambda: Simulation(seed = self.seed).run(players))
+
+        # Sorting stage, scores are shuffled so the sort has work to do
+        scraper = Scraper()
+        scraper.players = players
+        scraper.defense = defenses
+        for x in players + defenses:
+            x.score = rand.random()
+        Benchmark.timeStage(stages, "sort", n, scraper.sort)
+
+        # Lineup under a salary cap, with salaries like those of a DFS contest
+        for x in players + defenses:
+            x.salary = rand.randrange(3000, 10000, 100)
+        Benchmark.timeStage(stages, "lineup_capped", n, lambda: Lineup(players, defenses, cap = 50000))
+
+        # Grapher stages
+        rankings = Player.defenseRankings
+        Benchmark.timeStage(stages, "grapher_array_one", n, lambda: [Grapher.playerArrayOne(p, rankings) for p in players])
+        Benchmark.timeStage(stages, "grapher_array_two", n, lambda: [Grapher.playerArrayTwo(p, rankings) for p in players])
+        Benchmark.timeStage(stages, "grapher_array_three", n, lambda: [Grapher.playerArrayThree(p, rankings) for p in players])
+
+        return stages
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def startup(runs = None):
+        '''Times how long FantasyFootball.py takes to start from a fresh Python
+        process, which is paid every time the program is run from cron or a
+        shell script. The help screen, importing the program and a run that
+        sets everything up but has nothing to score are each timed, keeping the
+        fastest of several runs. A command that exits with an error is stored
+        with its error instead.'''
+
+        runs = runs if runs else Benchmark.startupRuns
+        here = os.path.dirname(os.path.abspath(__file__))
+        script = os.path.join(here, "FantasyFootball.py")
+        stages = {}
+
+        # Run in an empty directory so the caches and stores of the run are thrown away
+        with tempfile.TemporaryDirectory() as temp:
+            # A stored week of an empty league and an empty roster make a full run without the network
+            Benchmark.storeEmptyWeek(os.path.join(temp, "empty.db"))
+            open(os.path.join(temp, "empty.txt"), "w").close()
+
+            commands = {"startup_help": [script, "-h"],
+                        "startup_import": ["-c", "import sys; sys.path.insert(0, {0!r}); import FantasyFootball".format(here)],
+                        "startup_noop": [script, "-f", "empty.txt", "--store", "empty.db", "--from-store",
+                                         "--no-cache", "--no-snapshots"]}
+
+            for name, command in commands.items():
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    run = subprocess.run([sys.executable] + command, cwd = temp,
+                                         stdout = subprocess.DEVNULL, stderr = subprocess.PIPE)
+                    times.append(time.perf_counter() - start)
+                    if run.returncode != 0:
+                        break
+
+                # A crash would otherwise look like a very fast startup
+                if run.returncode != 0:
+                    error = run.stderr.decode("utf-8", "replace").strip().splitlines()
+                    stages[name] = {"error": "exit code {0}: {1}".format(run.returncode, error[-1] if error else "")}
+                else:
+                    stages[name] = {"seconds": min(times), "perItem": min(times)}
+
+        return stages
+
+
+    @staticmethod
+    def storeEmptyWeek(path):
+        '''Stores a week where every team has zero stats and nothing has been
+        played, which is enough for a --from-store run to score a roster.'''
+
+        store = Store(path)
+        rows = [(Snapshot.season(), 1, side, team, 0.0, 0.0, 0.0, 0.0)
+                for side in ["defense", "offense"] for team in range(Teams.BYE)]
+        with store.connection:
+            store.connection.executemany("INSERT INTO rankings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        store.close()
+
+
+    @staticmethod
+    def parsePlayer(player, pages):
+        '''Parses the recorded stats page and game log page for a single player.'''
+
+        player.parseData(pages[0])
+        player.parseScheduleData(pages[1])
+
+
+    @staticmethod
+    def timeStage(stages, name, items, function):
+        '''Times a single call of the function and stores the result under the
+        stage name. A stage that fails is stored with its error instead.'''
+
+        start = time.perf_counter()
+        try:
+            function()
+        except Exception as e:
+            stages[name] = {"error": "{0}: {1}".format(type(e).__name__, e)}
+            return
+
+        seconds = time.perf_counter() - start
+        stages[name] = {"seconds": seconds, "perItem": seconds / items}
+
+
+    @staticmethod
+    def compare(results, baseline):
+        '''Prints every stage that got slower than the baseline results by more
+        than the threshold, and every stage that failed. Returns the number of
+        regressions and failures found.'''
+
+        # Index the baseline stages by roster size, the startup times are kept as a roster of none
+        old = {r["players"]: r["stages"] for r in baseline["results"]}
+        old[0] = baseline.get("startup", {})
+        regressions = 0
+
+        for r in results["results"] + [{"players": 0, "stages": results.get("startup", {})}]:
+            for name, stage in r["stages"].items():
+                # A stage that crashes is always a regression, however fast it used to be
+                if "error" in stage:
+                    regressions += 1
+                    print("FAILED: {0} with {1} players raised {2}".format(name, r["players"], stage["error"]))
+                    continue
+
+                before = old.get(r["players"], {}).get(name, {})
+                if "seconds" not in stage or before.get("seconds", 0) < Benchmark.minimum:
+                    continue
+
+                ratio = stage["seconds"] / before["seconds"]
+                if ratio > Benchmark.threshold:
+                    regressions += 1
+                    print("REGRESSION: {0} with {1} players took {2:.4f}s, {3:.2f}x the baseline {4:.4f}s"
+                          .format(name, r["players"], stage["seconds"], ratio, before["seconds"]))
+
+        return regressions
+
+
+def main():
+
+    # Default variable values
+    directory = None     # Directory of recorded pages to run on
+    outputfile = None    # File to save the JSON results to, None prints them
+    baseline = None      # Earlier JSON results to compare against
+    sizes = None         # Roster sizes to run, None uses the default sizes
+    startupOnly = False  # Used to determine whether or not only the startup time is measured
+
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 'd:o:c:n:p:sh',
+            ["fixtures=", "outputfile=", "compare=", "sizes=", "parser=", "startup", "help"])
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+        sys.exit()
+
+    for o, a in opts:
+        if o in ["-d", "--fixtures"]:
+            directory = a
+        elif o in ["-o", "--outputfile"]:
+            outputfile = a
+        elif o in ["-c", "--compare"]:
+            baseline = a
+        elif o in ["-n", "--sizes"]:
+            sizes = [int(s) for s in a.split(",")]
+        elif o in ["-p", "--parser"]:
+            Parser.useBackend(a)
+        elif o in ["-s", "--startup"]:
+            startupOnly = True
+        elif o in ["-h", "--help"]:
+            usage()
+            sys.exit()
+
+    # The startup time does not need any recorded pages
+    if startupOnly:
+        results = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "python": platform.python_version(),
+                   "results": [],
+                   "startup": Benchmark.startup()}
+
+    elif not directory:
+        print("ERROR: a fixture directory recorded with FantasyFootball.py --record is required")
+        usage()
+        sys.exit()
+
+    else:
+        results = Benchmark(directory).run(sizes)
+
+    # Save or print the results as JSON
+    if outputfile:
+        with open(outputfile, "w") as f:
+            json.dump(results, f, indent = 1)
+    else:
+        print(json.dumps(results, indent = 1))
+
+    # Check for regressions against an earlier run
+    if baseline:
+        with open(baseline, "r") as f:
+            if Benchmark.compare(results, json.load(f)):
+                sys.exit(1)
+
+
+def usage():
+    '''This function displays all of the flags available for Benchmark.py.'''
+
+    print("\nAll of the Flags available to use:\n\n")
+    print("   -d, --fixtures [directory]\t-> Directory of pages recorded with FantasyFootball.py --record. Required.")
+    print("   -o, --outputfile [filename]\t-> Saves the JSON results to the file instead of printing them.")
+    print("   -c, --compare [filename]\t-> Compares the results with an earlier JSON results file and exits " +
+                            "with an error if any stage got slower or failed.")
+    print("   -n, --sizes [list]\t\t-> Comma separated roster sizes to run. Default is 1,10,100,1000,5000.")
+    print("   -p, --parser [name]\t\t-> Sets the HTML parser to benchmark, either 'lxml' or 'html.parser'.")
+    print("   -s, --startup\t\t-> Only times how long FantasyFootball.py takes to start, no fixtures are needed. " +
+                            "The startup time is also measured with every full run.")
+    print("   -h, --help\t\t\t-> Displays the help screen describing all of the available flags.")
+
+
+if __name__ == '__main__':
+    main()
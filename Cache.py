@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class Cache(object):
+    '''This class stores the HTTP responses gathered while scraping on disk so
+    that back to back runs do not download the same pages again. Each response
+    is stored under the hash of its link and expires after a time that depends
+    on the type of page. Expired pages are revalidated with the ETag and
+    Last-Modified headers, and the least recently used pages are evicted once
+    the cache grows past its size limit.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    directory = ".cache"           # Default directory the cache is stored in
+    maxSize = 200 * 1024 * 1024    # Default size limit of the cache in bytes
+
+    # Number of seconds each type of page stays fresh
+    ttl = {"league": 60 * 60,              # League wide team tables refresh hourly
+           "stats": 24 * 60 * 60,          # Player career stats and game logs refresh daily
+           "schedule": 7 * 24 * 60 * 60}   # Schedules refresh weekly
+
+    # Parts of a link used to decide the type of page, checked in order
+    resources = [("schedule", ["/nfl/schedule", "/team/schedule/"]),
+                 ("league", ["/stats/team", "/team-stats/"]),
+                 ("stats", ["/players/"])]
+
+
+    def __init__(self, directory = None, maxSize = None):
+
+        # Use the class defaults for anything that was not given
+        self.directory = directory if directory else Cache.directory
+        self.maxSize = maxSize if maxSize else Cache.maxSize
+
+        self.entries = {}               # Holds the details of every page in the cache by key
+        self.lock = threading.Lock()    # Guards the entries while fetching concurrently
+
+        # Counts used to report how useful the cache was during a run
+        self.hits = 0          # Pages served straight from the cache
+        self.revalidated = 0   # Expired pages the server confirmed had not changed
+        self.misses = 0        # Pages that had to be downloaded
+
+        # Create the cache directory and load all of the entries already in it,
+        # raising an OSError when it can not be written to
+        os.makedirs(self.directory, exist_ok = True)
+        if not os.access(self.directory, os.W_OK):
+            raise PermissionError("Can not write to the cache directory '{0}'".format(self.directory))
+        self.loadEntries()
+
+
+    def loadEntries(self):
+        '''Reads the details of every page already stored in the cache directory.'''
+
+        for f in os.listdir(self.directory):
+            if f.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, f), "r") as reader:
+                        self.entries[f[:-5]] = json.load(reader)
+                except (OSError, ValueError):
+                    # Skip entries that were only partly written
+                    continue
+
+
+    def get(self, link, fetch):
+        '''Returns the response for the link, using the cached copy when it is still
+        fresh or the server confirms it has not changed, and downloading it with
+        fetch(link, headers) otherwise.'''
+
+        key = Cache.makeKey(link)
+        with self.lock:
+            entry = self.entries.get(key)
+
+        # Serve the page straight from disk when it has not expired yet
+        if entry and time.time() - entry["stored"] < Cache.ttl[entry["resource"]]:
+            response = self.load(key, entry)
+            if response is not None:
+                self.count("hits")
+                return response
+
+        # Ask the server if the expired page has changed since it was stored
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+
+        webpage = fetch(link, headers)
+
+        # Page has not changed, so keep using the stored copy
+        if webpage.status_code == 304 and entry:
+            entry["stored"] = time.time()
+            response = self.load(key, entry)
+            if response is not None:
+                self.count("revalidated")
+                return response
+            # Stored copy is gone, so download the page again without validators
+            webpage = fetch(link)
+
+        self.count("misses")
+        # Only keep successful responses
+        if webpage.status_code == 200:
+            self.store(key, link, webpage)
+
+        return webpage
+
+
+    def count(self, name):
+        '''Adds one to the count with the given name.'''
+
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+    def load(self, key, entry):
+        '''Builds a response from the stored copy of a page. Returns None if the
+        stored copy could not be read.'''
+
+        try:
+            with open(os.path.join(self.directory, key + ".body"), "rb") as reader:
+                body = reader.read()
+        except OSError:
+            return None
+
+        # Mark the entry as the most recently used one
+        entry["accessed"] = time.time()
+        self.writeEntry(key, entry)
+
+        # Create the response the same way requests would, requests is already loaded by the transport
+        import requests
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.encoding = entry["encoding"]
+        response._content = body
+        response.fromCache = True
+        return response
+
+
+    def store(self, key, link, webpage):
+        '''Saves the body and details of a downloaded page to the cache directory.'''
+
+        entry = {"url": link,
+                 "resource": Cache.resourceType(link),
+                 "etag": webpage.headers.get("ETag"),
+                 "lastModified": webpage.headers.get("Last-Modified"),
+                 "encoding": webpage.encoding,
+                 "size": len(webpage.content),
+                 "stored": time.time(),
+                 "accessed": time.time()}
+
+        # Write the body to a temporary file first so readers never see half a page
+        path = os.path.join(self.directory, key + ".body")
+        with open(path + ".tmp", "wb") as f:
+            f.write(webpage.content)
+        os.replace(path + ".tmp", path)
+        self.writeEntry(key, entry)
+
+        with self.lock:
+            self.entries[key] = entry
+        self.evict()
+
+
+    def writeEntry(self, key, entry):
+        '''Writes the details of a single page to its json file.'''
+
+        path = os.path.join(self.directory, key + ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(entry, f)
+        os.replace(path + ".tmp", path)
+
+
+    def evict(self):
+        '''Removes the least recently used pages until the cache fits within its size limit.'''
+
+        with self.lock:
+            total = sum(e["size"] for e in self.entries.values())
+            if total <= self.maxSize:
+                return
+
+            # Go through the entries from least to most recently used
+            for key, entry in sorted(self.entries.items(), key = lambda e: e[1]["accessed"]):
+                if total <= self.maxSize:
+                    break
+                total -= entry["size"]
+                del self.entries[key]
+                self.remove(key)
+
+
+    def remove(self, key):
+        '''Deletes the files that belong to a single page.'''
+
+        for ext in [".body", ".json"]:
+            try:
+                os.remove(os.path.join(self.directory, key + ext))
+            except OSError:
+                pass
+
+
+    def purge(self):
+        '''Deletes every file in the cache directory, including pages that were
+        only partly written. Raises an OSError when a file can not be deleted.'''
+
+        with self.lock:
+            for f in os.listdir(self.directory):
+                path = os.path.join(self.directory, f)
+                try:
+                    if os.path.isfile(path):
+                        os.remove(path)
+                except FileNotFoundError:
+                    # Already deleted by another run
+                    continue
+            self.entries = {}
+
+
+    def printStats(self):
+        '''Prints how many pages were served from the cache during this run.'''
+
+        print("Cache: {0} hits, {1} revalidated, {2} downloaded\n"
+              .format(self.hits, self.revalidated, self.misses))
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def makeKey(link):
+        '''Returns the key a link is stored under in the cache.'''
+
+        return hashlib.sha256(link.encode("utf-8")).hexdigest()
+
+
+    @staticmethod
+    def resourceType(link):
+        '''Returns the type of page the link points to, which decides how long
+        the page stays fresh in the cache.'''
+
+        for resource, parts in Cache.resources:
+            for part in parts:
+                if part in link:
+                    return resource
+
+        # Everything else is treated as player stats
+        return "stats"
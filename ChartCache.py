@@ -0,0 +1,101 @@
+import os
+import time
+
+
+class ChartCache(object):
+    '''This class keeps the pictures of plots that were already rendered on disk,
+    stored under the hash of everything the plot was drawn from, so a chart only
+    pays for the plots whose data changed since it was last rendered. The least
+    recently used pictures are evicted once the cache grows past its size limit.
+    Rendering processes each use their own copy of the cache, so every write is
+    a whole file put in place at once.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    directory = ".chartcache"      # Default directory the pictures are stored in
+    maxSize = 100 * 1024 * 1024    # Default size limit of the cache in bytes
+    extension = ".chart"           # Extension of every picture in the cache
+
+
+    def __init__(self, directory = None, maxSize = None):
+
+        # Use the class defaults for anything that was not given
+        self.directory = directory if directory else ChartCache.directory
+        self.maxSize = maxSize if maxSize else ChartCache.maxSize
+
+        self.entries = {}  # Holds the [size, last used time] of every picture by key
+        self.size = 0      # Total size of every picture in bytes
+
+        # Raise an OSError when the pictures can not be written
+        os.makedirs(self.directory, exist_ok = True)
+        if not os.access(self.directory, os.W_OK):
+            raise PermissionError("Can not write to the chart cache directory '{0}'".format(self.directory))
+        self.reload()
+
+
+    def reload(self):
+        '''Finds every picture in the cache directory, including the ones other
+        processes have written.'''
+
+        self.entries = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ChartCache.extension):
+                stat = entry.stat()
+                self.entries[entry.name[:-len(ChartCache.extension)]] = [stat.st_size, stat.st_mtime]
+        self.size = sum(e[0] for e in self.entries.values())
+
+
+    def get(self, key):
+        '''Returns the picture stored under the key, or None when there is none.'''
+
+        path = self.path(key)
+        try:
+            with open(path, "rb") as reader:
+                content = reader.read()
+            # Mark the picture as the most recently used one
+            os.utime(path)
+        except OSError:
+            return None
+
+        self.entries[key] = [len(content), time.time()]
+        return content
+
+
+    def put(self, key, content):
+        '''Stores a picture under the key and evicts old pictures if the cache is full.'''
+
+        # Write to a temporary file first so other processes never read half a picture
+        path = self.path(key)
+        temp = "{0}.{1}.tmp".format(path, os.getpid())
+        with open(temp, "wb") as f:
+            f.write(content)
+        os.replace(temp, path)
+
+        old = self.entries.get(key)
+        self.size += len(content) - (old[0] if old else 0)
+        self.entries[key] = [len(content), time.time()]
+
+        if self.size > self.maxSize:
+            self.evict()
+
+
+    def evict(self):
+        '''Removes the least recently used pictures until the cache fits within its size limit.'''
+
+        for key, entry in sorted(self.entries.items(), key = lambda e: e[1][1]):
+            if self.size <= self.maxSize:
+                break
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass  # Another process already removed it
+            self.size -= entry[0]
+            del self.entries[key]
+
+
+    def path(self, key):
+        '''Returns the file the picture stored under the key is kept in.'''
+
+        return os.path.join(self.directory, key + ChartCache.extension)
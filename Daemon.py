@@ -0,0 +1,302 @@
+import copy
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Scraper import Scraper
+from Player import Player
+from Matchups import Matchups
+from Lineup import Lineup
+
+
+class Daemon(object):
+    '''This class keeps the current week, the league data and every player that
+    has been scored warm in memory, and scores rosters sent to a local HTTP API.
+    The league data and players are refreshed in the background on a schedule,
+    so a roster made of players that are already warm is scored without making
+    any web requests.
+
+    The API has two endpoints:
+        GET  /status  -> The current week, the number of warm players and when they were refreshed
+        POST /score   -> Scores the roster in the body, either the lines of a players file or JSON
+                         like {"players": [...], "defenses": [...], "salaries": {...}, "cap": 50000}
+    '''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    host = "127.0.0.1"  # Only listen on this machine by default
+    port = 8750         # Default port of the API
+    refresh = 3600      # Default number of seconds between each background refresh
+
+
+    def __init__(self, port = None, refresh = None, workers = None, slots = None, cap = None):
+
+        self.port = port if port else Daemon.port              # Port the API listens on
+        self.refresh = refresh if refresh else Daemon.refresh  # Seconds between each refresh
+        self.workers = workers if workers else Scraper.maxWorkers
+        self.slots = slots       # Default roster slots for rosters that do not give any
+        self.cap = cap           # Default salary cap for rosters that do not give one
+        self.players = {}        # Every warm player by name, already fetched and scored
+        self.lock = threading.Lock()      # Held while the league data is replaced and while rosters are scored
+        self.stopped = threading.Event()  # Set to stop the background refresh
+        self.refreshed = None             # Time of the last refresh
+        self.server = None
+
+
+    def start(self, filename = None):
+        '''Gathers the league data and the players in the file given, if any, then
+        serves the API until the program is interrupted.'''
+
+        print("Warming up...")
+        scraper = Scraper(file = filename, workers = self.workers)
+        self.addPlayers(scraper.players)
+        self.refreshLeague()
+
+        # Refresh everything in the background while the API is served
+        threading.Thread(target = self.refreshLoop, daemon = True).start()
+
+        self.server = ThreadingHTTPServer((Daemon.host, self.port), Handler)
+        self.server.owner = self  # Lets each request reach the warm data
+        print("Serving week {0} with {1} players on http://{2}:{3}".format(
+              Scraper.weekNumber, len(self.players), Daemon.host, self.port))
+
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            self.server.server_close()
+
+
+    def refreshLoop(self):
+        '''Refreshes the league data and every warm player on the schedule until
+        the daemon is stopped. A failed refresh keeps the data already loaded.'''
+
+        while not self.stopped.wait(self.refresh):
+            try:
+                fresh = self.fetchPlayers([Player(name) for name in list(self.players)])
+                self.refreshLeague(fresh)
+            except Exception as e:
+                print("ERROR: refresh failed, keeping the current data: {0}".format(e))
+
+
+    def refreshLeague(self, fresh = None):
+        '''Gathers the current week and the league data again and swaps in the
+        freshly fetched players. Pages that are still fresh in the cache are not
+        downloaded again. Everything is gathered before the lock is taken, so
+        rosters are scored against the old data while the refresh runs and a
+        failed refresh raises without changing any of it.'''
+
+        league = Scraper.fetchLeague(self.workers)
+
+        with self.lock:
+            Scraper.useLeague(league)
+
+            # Swap in the fresh players and score every player against the new week
+            if fresh:
+                self.players.update(fresh)
+            players = list(self.players.values())
+            for p in players:
+                p.getOpponent(Scraper.matchups)
+            Player.calculateScores(players)
+
+            self.refreshed = time.time()
+
+
+    def fetchPlayers(self, players):
+        '''Fetches the pages of every player given at the same time and returns
+        them by name. Players that can not be found are left out.'''
+
+        found = {}
+        with ThreadPoolExecutor(max_workers = self.workers) as pool:
+            for p, error in zip(players, pool.map(Daemon.tryFetch, players)):
+                if error:
+                    print("ERROR: could not fetch {0}: {1}".format(p.name, error))
+                else:
+                    found[p.name] = p
+
+        return found
+
+
+    def addPlayers(self, players):
+        '''Fetches any of the players given that are not warm yet and scores them.
+        Returns the names of the players that could not be found.'''
+
+        missing = [p for p in players if p.name not in self.players]
+        found = self.fetchPlayers(missing)
+
+        with self.lock:
+            for p in found.values():
+                p.getOpponent(Scraper.matchups)
+            # The league data is only there once the daemon has warmed up
+            if Scraper.weekNumber != -1 and Matchups.current:
+                Player.calculateScores(list(found.values()))
+            self.players.update(found)
+
+        return [p.name for p in missing if p.name not in found]
+
+
+    def score(self, body):
+        '''Scores the roster in the body of a request and returns the results as
+        a dictionary. Raises a LookupError when a player or defense can not be found.'''
+
+        scraper, salaries, cap = self.readRoster(body)
+
+        # Players that are not warm yet are fetched once and kept for later requests
+        unknown = self.addPlayers(scraper.players)
+        if unknown:
+            raise LookupError("Players not found: {0}".format(", ".join(unknown)))
+
+        with self.lock:
+            # Copies of the warm players keep the salaries of this roster to itself
+            players = []
+            for p in scraper.players:
+                warm = copy.copy(self.players[p.name])
+                warm.salary = salaries.get(p.name, p.salary)
+                players.append(warm)
+            scraper.players = players
+
+            for d in scraper.defense:
+                d.salary = salaries.get(d.team, d.salary)
+                Matchups.current.setSchedule(d)
+                d.getData()
+                d.calculateScore()
+
+            scraper.cap = cap
+            scraper.sort()
+            week = Scraper.weekNumber
+
+        return Daemon.results(scraper, week)
+
+
+    def readRoster(self, body):
+        '''Reads a roster sent as JSON or as the lines of a players file. Returns a
+        Scraper holding the roster, the salaries given and the salary cap.'''
+
+        text = body.decode("utf-8")
+        # The week is never gathered here while the league data is being replaced
+        with self.lock:
+            scraper = Scraper(workers = self.workers, slots = self.slots, cap = self.cap)
+
+        if not text.lstrip().startswith("{"):
+            scraper.loadLines(text.splitlines())
+            return scraper, {}, self.cap
+
+        roster = json.loads(text)
+        Daemon.checkRoster(roster)
+        scraper.loadLines(roster.get("players", []))
+        scraper.loadLines("defense: " + d for d in roster.get("defenses", []))
+        if "slots" in roster:
+            scraper.slots = roster["slots"]
+
+        return scraper, roster.get("salaries", {}), roster.get("cap", self.cap)
+
+
+    def status(self):
+        '''Returns the state of the daemon as a dictionary.'''
+
+        return {"week": Scraper.weekNumber, "players": len(self.players), "refreshed": self.refreshed,
+                "refreshEvery": self.refresh}
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def checkRoster(roster):
+        '''Makes sure a JSON roster has the expected shape. Raises a ValueError
+        naming the first field that does not.'''
+
+        isCount = lambda x: isinstance(x, int) and not isinstance(x, bool)
+
+        if not isinstance(roster, dict):
+            raise ValueError("The roster must be a JSON object")
+        for field in ["players", "defenses"]:
+            names = roster.get(field, [])
+            if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+                raise ValueError("'{0}' must be a list of names".format(field))
+        for field in ["salaries", "slots"]:
+            counts = roster.get(field, {})
+            if not isinstance(counts, dict) or not all(isCount(c) for c in counts.values()):
+                raise ValueError("'{0}' must map names to whole numbers".format(field))
+        if roster.get("cap") is not None and not isCount(roster["cap"]):
+            raise ValueError("'cap' must be a whole number")
+
+
+    @staticmethod
+    def tryFetch(player):
+        '''Fetches a single player, returning the error instead of raising it.'''
+
+        try:
+            Scraper.fetchPlayer(player)
+            return None
+        except Exception as e:
+            return e
+
+
+    @staticmethod
+    def results(scraper, week):
+        '''Returns the team and starting lineup of a sorted scraper as a dictionary.'''
+
+        entry = lambda x: {"name": Lineup.label(x), "score": float(x.score), "salary": Lineup.salaryOf(x)}
+        results = {"week": week,
+                   "team": {pos: [entry(p) for p in group] for pos, group in scraper.team.items()},
+                   "defenses": [entry(d) for d in scraper.defense],
+                   "lineup": None}
+
+        if scraper.lineup:
+            results["lineup"] = {"starters": [dict(entry(x), slot = slot) for slot, x in scraper.lineup.starters],
+                                 "bench": [entry(x) for x in scraper.lineup.bench],
+                                 "score": float(scraper.lineup.score),
+                                 "salary": scraper.lineup.salary}
+
+        return results
+
+
+class Handler(BaseHTTPRequestHandler):
+    '''Handles each request to the API of the Daemon.'''
+
+    def do_GET(self):
+
+        if self.path == "/status":
+            self.reply(200, self.server.owner.status())
+        else:
+            self.reply(404, {"error": "Unknown path {0}".format(self.path)})
+
+
+    def do_POST(self):
+
+        if self.path != "/score":
+            self.reply(404, {"error": "Unknown path {0}".format(self.path)})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            self.reply(200, self.server.owner.score(body))
+        except (ValueError, LookupError) as e:
+            self.reply(400, {"error": str(e)})
+        except Exception as e:
+            # Anything else is a bug, so the client still gets a reply instead of a dropped connection
+            self.reply(500, {"error": "{0}: {1}".format(type(e).__name__, e)})
+
+
+    def reply(self, code, results):
+        '''Sends the results as JSON.'''
+
+        content = json.dumps(results).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+    def log_message(self, format, *args):
+        # Requests are not logged to keep the console quiet
+        pass
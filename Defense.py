@@ -1,5 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
+from Parser import Parser
+from Profiler import Profiler
+from StatTable import StatTable
+from Teams import Teams
+from Matchups import Matchups
+import numpy as np
 
 class Defense(object):
 	'''This class represents a Defensive team in the NFL'''
@@ -8,10 +12,18 @@ class Defense(object):
 	# Declare all class level variables here
 	####################################################
 
-	# Holds all of the defense category labels that are gathered
+	# Holds every teams stats by team id
 	Alldata = {}  # Passing, Rushing, Scoring
-	# Holds all of the teams and some relevant stats for their offenses
+	# Holds the category labels of each league table, in the same order as tableTypes
+	dataCategories = []
+	# The league tables that are gathered for every team
+	tableTypes = ["passing", "rushing", "scoring"]
+	# Holds all of the teams by team id and some relevant stats for their offenses
 	offenseRankings = {}
+	# Shared HTTP transport used for every request, set by Scraper.useTransport
+	transport = None
+	# Used to make sure the league tables are only gathered once per run
+	tablesLoaded = False
 
 	# Store all links used for defenses here
 	offenseLink = "https://www.espn.com/nfl/stats/team"
@@ -21,148 +33,66 @@ class Defense(object):
 	def __init__(self, name):
 
 		# Initialize all of the variables used for an individual defense
-		self.team = name    # Holds the name of the team
-		self.data = []      # Holds all of the relevant data for this defense
-		self.schedule = []  # Holds all of the teams this defense has faced
-		self.opponent = ""  # Holds the name of the opponent the defense is facing
-		self.score = 0      # Holds the Fantasy score of the defense
-
-	def getData(self, dir):
-		'''This method is used to make the HTTP request to the website
-		in order to get the appropriate data. The data gathered will be both
-		the passing defense and the rushing defense statistics.'''
-
-		# Make all three of the links
-		passLink = Defense.defenseLink.format("passing")
-		rushLink = Defense.defenseLink.format("rushing")
-		scoreLink = Defense.defenseLink.format("scoring")
-
-		# Make the requests to get the webpage
-		passPage = requests.get(passLink)
-		rushPage = requests.get(rushLink)
-		scorePage = requests.get(scoreLink)
-
-		# Make the files to store the webpages in
-		passFile = open("{0}/{1}.html".format(dir, "passing_defense_stats"), "w")
-		rushFile = open("{0}/{1}.html".format(dir, "rushing_defense_stats"), "w")
-		scoreFile = open("{0}/{1}.html".format(dir, "scoring_defense_stats"), "w")
-
-		# Write data to the file
-		passFile.write(passPage.text)
-		rushFile.write(rushPage.text)
-		scoreFile.write(scorePage.text)
-
-		# Close all three files
-		passFile.close()
-		rushFile.close()
-		scoreFile.close()
-
-		# Start with the Pass Ranking
-		with open("{0}/{1}.html".format(dir, "passing_defense_stats"), "r") as f:
-			# Create a Beautiful soup object
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			# Get the data categories first
-			cat = soup.thead.tr.find_all('th')
-			cat_pass = [c.text for c in cat]
-
-			# Append the pass categories to the dataCategories class variable
-			Defense.Alldata["passing_categories"] = cat_pass
-
-			# Get this teams passing stats
-			rows = soup.find_all('tr')[1:]
-			# Go through each row until this team is found
-			for r in rows:
-				
-				tds = r.find_all('td')    # Seperates each column in the row
-
-				# Get the name of the current team
-				name = tds[0].find('div', class_ = "d3-o-club-fullname").text.strip()
-				# initialize this teams data with an  empty array
-				Defense.Alldata[name] = []
-				# Go through each column and append the data to the team array
-				team_arr = [ d.text.strip() for d in tds[1:] ]
-				# Add the current teams passing data to the data dictionary
-				Defense.Alldata[name].append(team_arr)
-
-		# Extract data from the rush File as well
-		with open("{0}/{1}.html".format(dir, "rushing_defense_stats"), "r") as f:
-			# Create a Beautiful Soup Object
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			# Get the data categories first
-			cat = soup.thead.tr.find_all('th')
-			cat_rush = [c.text for c in cat]
-
-			# Append the pass categories to the dataCategories class variable
-			Defense.Alldata["rushing_categories"] = cat_rush
-
-			# Get this teams rushing stats
-			rows = soup.find_all('tr')[1:]
-			# Go through each row of data
-			for r in rows:
-				# Search once for all td elements in this row
-				tds = r.find_all('td')
-				# Get the name from the first element
-				name = tds[0].find('div', class_="d3-o-club-fullname").text.strip()
-				# Go through each column and get the rushing data for the team
-				team_arr = [ d.text.strip() for d in tds[1:] ]
-				# Add the rushing data to the allData dictionary
-				Defense.Alldata[name].append(team_arr)
-
-
-	def getSchedule(self, dir):
+		self.team = name                  # Holds the name of the team
+		self.teamId = Teams.find(name)    # Holds the id of the team
+		self.data = []                    # Holds all of the relevant data for this defense
+		self.schedule = []                # Holds the team ids of all of the teams this defense has faced
+		self.opponent = Teams.BYE         # Holds the team id of the opponent the defense is facing
+		self.score = 0                    # Holds the Fantasy score of the defense
+		self.salary = 0                   # Holds the salary of the defense, used with a salary cap
+		self.matchup = np.zeros(4)        # Holds how this weeks offense compares to the average offense faced
+
+	def getData(self):
+		'''This method looks up the passing, rushing and scoring defense statistics
+		for this team in the league tables. Defense.getLeagueTables must be called
+		once before this method is used.'''
+
+		self.data = Defense.Alldata.get(self.teamId, [])
+
+	def getSchedule(self):
 		'''This method will gather the different offenses that have been faced
 		by this defense up until this point in the season.'''
 
-		# List of odd naming conventions used by ESPN
-		odd = ["Los Angeles Rams", "Los Angeles Chargers", "New York Giants",
-			"New York Jets"]
-		# Split the name to seperate the city from the team
-		name = self.team.split()
-
-		# Get the correct parameter for the link based on team name
-		if(self.team in odd):
-			# Grab the first letter from each of the words in name for link
-			param = (name[0][0] + name[1][0] + name[2][0]).lower()
-		elif(len(self.team.split()) == 3):
-			# Just grab the first letter of the first two words for link
-			param = (name[0][0] + name[1][0]).lower()
-		else:
-			# Grab the first three letters of the first word for link
-			param = name[0][0:3].lower()
-
-		# Create the link to use
-		link = Defense.scheduleLink.format(param)
+		# The team has to be known to find its schedule page
+		if self.teamId is None or self.teamId == Teams.BYE:
+			raise LookupError("Unknown team '{0}'".format(self.team))
+
+		# Create the link to use with the abbreviation ESPN uses for the team
+		link = Defense.scheduleLink.format(Teams.espn(self.teamId))
 		# Make the request to the website
-		webpage = requests.get(link)
-		# Create the file
-		file = open("{0}/{1}.html".format(dir, self.team + "_schedule"), "w")
-		# Write the html webpage to the file
-		file.write(webpage.text)
-		file.close()   # Close the file
-
-		# Open the file and extract the schedule data
-		with open("{0}/{1}.html".format(dir, self.team + "_schedule"), "r") as f:
-			# Create a BeautifulSoup object
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			# Get each game as a row
-			rows = soup.find_all('tr', class_="Table__TR--sm")[2:]
-			# Create a count variable to keep track of the current row
-			count = 0
-			# Go through each row and find the opponent of that week
-			for r in rows:
-				count += 1 # Increment the count variable
-				# Seperate each row by its columns
-				cols = r.find_all('td')
-				if(len(cols) == 8): # Game was played this week
-					# Gather the opponent name
-					ans = " ".join([c.capitalize() for c in r.a.get('href').split("/")[-1].split("-")])
+		with Profiler.stage("defense schedule fetch", self.team):
+			webpage = Defense.transport.get(link)
+		# Extract the data straight from the downloaded page
+		with Profiler.stage("defense schedule parse", self.team):
+			self.parseSchedule(webpage.content)
+
+	def parseSchedule(self, content):
+		'''This method extracts the offenses already faced and this weeks opponent
+		from the content of the teams ESPN schedule page.'''
+
+		# Only build the rows of the schedule table from the downloaded page
+		soup = Parser.parse(content, tags = ["tr"], classes = ["Table__TR--sm"])
+		# Get each game as a row
+		rows = soup.find_all('tr', class_="Table__TR--sm")[2:]
+		# Create a count variable to keep track of the current row
+		count = 0
+		# Go through each row and find the opponent of that week
+		for r in rows:
+			count += 1 # Increment the count variable
+			# Seperate each row by its columns
+			cols = r.find_all('td')
+			if(len(cols) == 8): # Game was played this week
+				# Gather the opponent from the end of the link to their page
+				ans = Teams.find(r.a.get('href').split("/")[-1])
+				if ans is not None:
 					self.schedule.append(ans)
 
-				elif(len(cols) == 6): # Column of length 6 is the next games row
-					# Get the upcoming opponent
-					self.opponent = " ".join([c.capitalize() for c in rows[count].a.get('href').split("/")[-1].split("-")])
-					# Break out of the loop, data has been gathered
-					break
+			elif(len(cols) == 6): # Column of length 6 is the next games row
+				# Get the upcoming opponent
+				opp = Teams.find(rows[count].a.get('href').split("/")[-1])
+				self.opponent = Teams.BYE if opp is None else opp
+				# Break out of the loop, data has been gathered
+				break
 
 
 	def calculateScore(self):
@@ -170,23 +100,27 @@ class Defense(object):
 		using all of the data gathered. This score represents the value of
 		this defense for the mathcup this week of the season.'''
 
-		avg_off = [0.0, 0.0, 0.0, 0.0]                    # Used to store the average offenses
+		# When the defense is on a bye, give them a zero and exit the function
+		if(self.opponent == Teams.BYE):
+			self.score = 0
+			self.matchup = np.zeros(4)
+			return
+
+		# Look the matchup up in this weeks matchup matrix when the team is in it
+		if Matchups.current and Matchups.current.knows(self.teamId):
+			self.matchup = Matchups.current.defenseVsOffense[self.teamId, self.opponent]
+			return
+
+		avg_off = np.zeros(4)                             # Used to store the average offenses
 		cur_off = Defense.offenseRankings[self.opponent]  # Used to get the stats of this weeks offense
 
 		# Get the average offense faced by this defense
-		for team in self.schedule:
-			# Grab the teams stats from the offense rankings
-			stats = Defense.offenseRankings[team]
-			# Go through each stat and add them to the avg_off array
-			for i in range(len(stats)):
-				avg_off[i] += float(stats[i])
-
-		# Divide each value in the average array by the number of games played
-		for i in range(len(avg_off)):
-			avg_off[i] /= len(self.schedule)
+		if self.schedule:
+			avg_off = np.mean([Defense.offenseRankings[team] for team in self.schedule], axis = 0)
 
 		# Get the difference between the average and the current offenses
-		diff = [float(cur_off[i]) - avg_off[i] for i in range(4)]
+		diff = cur_off - avg_off
+		self.matchup = diff
 
 
 	def printDefense(self):
@@ -194,7 +128,7 @@ class Defense(object):
 
 		# Print the teams name first
 		print("\nDEFENSE: " + self.team)
-		print("This weeks Opponent: " + self.opponent + "\n")
+		print("This weeks Opponent: " + Teams.name(self.opponent) + "\n")
 
 		# Print passing stats
 		print("Passing Stats:\n")
@@ -211,7 +145,7 @@ class Defense(object):
 		# Print all opponents up until this point
 		print("Opponents faced:\n")
 		for o in self.schedule:
-			print("\t-> " + o)
+			print("\t-> " + Teams.name(o))
 
 ##############################################################
 # STATIC METHODS
@@ -223,41 +157,103 @@ class Defense(object):
 		variable in a readable manner to the console.'''
 
 		for k, v in Defense.offenseRankings.items():
-			print(k + ":\n")
+			print(Teams.name(k) + ":\n")
 			print("   --> Total yds/g: {0} , Passing yds/g: {1} , Rushing yds/g: {2} , Points/g : {3}"
 				.format(v[0], v[1], v[2], v[3]))
 			print()
 
 	@staticmethod
-	def getOffenseRankings(dir):
+	def getOffenseRankings():
 		'''This method will gather all of the teams in the league and some of
 		the general data that is associated with their offenses. This data will
 		then be stored in the class variable, offenseRankings.'''
 
+		# Callers asking for the rankings at the same time share one fetch and parse
+		Defense.offenseRankings.update(Defense.transport.shared(Defense.offenseLink, Defense.fetchOffenseRankings))
+
+	@staticmethod
+	def fetchOffenseRankings():
+		'''This method fetches and parses the ESPN offense page without changing the
+		offenseRankings class variable. Returns the rankings by team id.'''
+
 		# Make the web request to get the html
-		webpage = requests.get(Defense.offenseLink)
-		# Create the file and write the page to it
-		file = open("{0}/{1}.html".format(dir, "espn_offenses"), "w")
-		file.write(webpage.text)
-		file.close()
-
-		# Open the file and extract the appropriate data
-		with open("{0}/{1}.html".format(dir, "espn_offenses"), "r") as f:
-			# Create a BeautifulSoup object
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			data = soup.find_all('tr', class_ = 'Table__TR--sm')
-
-			# Go through once for each NFL team and get the data and team name
-			for i in range(32):
-				# Get team name
-				team = data[i].text
-				temp_list = []  # Holds all of the data
-				# Get all of the div elements from the html
-				temp_data = data[i + 32].find_all('div')
-				# Add the correct columns to the list
-				temp_list.append(temp_data[2].text)
-				temp_list.append(temp_data[4].text)
-				temp_list.append(temp_data[6].text)
-				temp_list.append(temp_data[8].text)
-				# Add the list to the dictionary with the team name as key
-				Defense.offenseRankings[team] = temp_list
+		with Profiler.stage("league fetch", "offense rankings"):
+			webpage = Defense.transport.get(Defense.offenseLink)
+		# Extract the data straight from the downloaded page
+		with Profiler.stage("league parse", "offense rankings"):
+			return Defense.parseOffenseRankings(webpage.content, {})
+
+	@staticmethod
+	def parseOffenseRankings(content, rankings = None):
+		'''This method extracts the stats of every offense in the league from the
+		content of the ESPN offense page into the rankings given, the offenseRankings
+		class variable when none are given. Returns the rankings.'''
+
+		if rankings is None:
+			rankings = Defense.offenseRankings
+
+		# Only build the rows of the offense tables from the downloaded page
+		soup = Parser.parse(content, tags = ["tr"], classes = ["Table__TR--sm"])
+		data = soup.find_all('tr', class_ = 'Table__TR--sm')
+
+		# Go through once for each NFL team and get the data and team name
+		for i in range(32):
+			# Get the id of the team from its name
+			team = Teams.find(data[i].text)
+			# Get all of the div elements from the html
+			temp_data = data[i + 32].find_all('div')
+			# Add the correct columns as numbers to the dictionary with the team name as key
+			rankings[team] = StatTable.toArray([temp_data[j].text for j in (2, 4, 6, 8)])
+
+		# Add a entry for a bye week
+		rankings[Teams.BYE] = np.zeros(4)
+		return rankings
+
+
+	@staticmethod
+	def getLeagueTables():
+		'''This method gathers the passing, rushing and scoring defense tables for
+		the whole league from NFL.com and stores every teams stats in the Alldata
+		class variable by team name. The tables are only gathered once per run and
+		are shared by every Defense object, even when several defenses ask for
+		them at the same time.'''
+
+		# Tables have already been gathered this run
+		if Defense.tablesLoaded:
+			return
+
+		# Callers asking for the tables at the same time share one fetch and parse
+		tables, categories = Defense.transport.shared(Defense.defenseLink, Defense.fetchLeagueTables)
+		Defense.Alldata.update(tables)
+		Defense.dataCategories[:] = categories
+		Defense.tablesLoaded = True
+
+	@staticmethod
+	def fetchLeagueTables():
+		'''This method fetches and parses every league table without changing the
+		tables in use. Returns the tables of every team by team id and the data
+		categories of each table.'''
+
+		tables = {}
+		categories = []
+		for kind in Defense.tableTypes:
+			# Make the request to get the webpage
+			with Profiler.stage("league fetch", kind + " defense"):
+				webpage = Defense.transport.get(Defense.defenseLink.format(kind))
+
+			with Profiler.stage("league parse", kind + " defense"):
+				# Only build the stats table from the downloaded page
+				soup = Parser.parse(webpage.content, tags = ["table"])
+				# Get the data categories first
+				cat = soup.thead.tr.find_all('th')
+				categories.append([c.text for c in cat])
+
+				# Go through each teams row of data
+				for r in soup.find_all('tr')[1:]:
+					tds = r.find_all('td')    # Seperates each column in the row
+					# Get the id of the current team from its name
+					team = Teams.find(tds[0].find('div', class_ = "d3-o-club-fullname").text)
+					# Add this tables data to the teams list of tables
+					tables.setdefault(team, []).append([ d.text.strip() for d in tds[1:] ])
+
+		return tables, categories
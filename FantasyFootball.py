@@ -1,4 +1,7 @@
-from Scraper import Scraper
+from Cache import Cache
+from Parser import Parser
+from Profiler import Profiler
+import cProfile
 import sys
 import os
 import getopt
@@ -11,11 +14,42 @@ def main():
     save = False             # Boolean to store whether or not to save outout to file
     outputfile = None        # Default value for the output file to save to
     graph = False            # Used to determine whether or not to graph data
+    graphDir = None          # Directory the charts are saved to, None uses a directory for the week
+    graphFormats = None      # Image formats the charts are saved in, None uses the Grapher default
+    graphed = None           # Holds the scraper whose players and defenses are graphed
+    workers = None           # Number of pages fetched at once, None uses the Scraper default
+    search = None            # Holds the search option and name when searching for a player or defense
+    timeout = None           # Seconds to wait on each request, None uses the Transport default
+    rate = None              # Requests started each second for each site, None uses the Throttle default
+    retries = None           # Times a failed or throttled request is tried again, None uses the Throttle default
+    useCache = True          # Used to determine whether or not pages are served from the cache
+    useSnapshots = True      # Used to determine whether or not players are reused from their last snapshot
+    archiveDir = None        # Directory to archive the raw HTML of each page in, None turns archiving off
+    recordDir = None         # Directory to record every page of the run into
+    replayDir = None         # Directory of recorded pages to replay the run from
+    profile = False          # Used to determine whether or not the time spent in each stage is shown
+    profileFile = None       # File to save a cProfile dump or JSON trace of the run to
+    slots = None             # Roster slots to fill in the starting lineup, None uses the default slots
+    cap = None               # Salary cap for the starting lineup, None for no cap
+    batchPath = None         # Directory or manifest of roster files to score together
+    batchOut = None          # Directory to save each teams results to in batch mode
+    daemonPort = None        # Port to serve the scoring API on, None runs once and exits
+    refresh = None           # Minutes between each refresh of the daemons data, None uses the default
+    storePath = None         # Database file every week of data is saved to, None stores nothing
+    fromStore = False        # Used to determine whether or not the newest stored week is scored without scraping
+    backtest = False         # Used to determine whether or not the stored weeks are replayed to test the scores
+    trials = None            # Number of trials to simulate for each player, None turns the simulation off
+    seed = None              # Seed of the simulation, None for different trials every run
 
     # Use getopt to parse the arguments
     try:
-        opts, args = getopt.getopt(sys.argv[1:], 'f:v:so:hg',
-            ["filename=", "verbosity=", "save", "outputfile=", "help", "sp=", "sd=", "graph"])
+        opts, args = getopt.getopt(sys.argv[1:], 'f:v:so:hgw:t:a:p:',
+            ["filename=", "verbosity=", "save", "outputfile=", "help", "sp=", "sd=", "graph", "workers=", "timeout=",
+             "rate=", "retries=",
+             "no-cache", "purge-cache", "no-snapshots", "archive=", "parser=",
+             "record=", "replay=", "profile", "profile-out=", "slots=", "cap=", "batch=", "batch-out=", "daemon=", "refresh=",
+             "store=", "from-store", "backtest", "simulate=", "seed=",
+             "graph-out=", "graph-format="])
     except getopt.GetoptError as err:
         print(err) # Print the error
         usage()    # Call usage to show user how app is used
@@ -40,37 +74,302 @@ def main():
             outputfile = a
         elif(o in ["-g", "--graph"]):
             graph = True
-        elif o == "--sp":
-            # User is searching for a player
-            Scraper.searchPlayer(a)
-            sys.exit()
-        elif o == "--sd":
-            # User is searching for a defense
-            Scraper.searchDefense(a)
+        elif o == "--graph-out":
+            # Save the charts to this directory, which also turns graphing on
+            graph = True
+            graphDir = a
+        elif o == "--graph-format":
+            graphFormats = [f.strip().lower() for f in a.split(",")]
+            if any(f not in ["png", "svg", "pdf"] for f in graphFormats):
+                print("ERROR: option --graph-format requires a list of png, svg or pdf")
+                sys.exit()
+        elif(o in ["-w", "--workers"]):
+            if a.isdigit() and int(a) > 0:
+                workers = int(a)
+            else:
+                print("ERROR: option -w requires a number greater than 0")
+                sys.exit()
+        elif(o in ["-t", "--timeout"]):
+            try:
+                timeout = float(a)
+            except ValueError:
+                print("ERROR: option -t requires a number of seconds")
+                sys.exit()
+        elif o == "--rate":
+            try:
+                rate = float(a)
+                if rate <= 0:
+                    raise ValueError
+            except ValueError:
+                print("ERROR: option --rate requires a number of requests each second greater than 0")
+                sys.exit()
+        elif o == "--retries":
+            if a.isdigit():
+                retries = int(a)
+            else:
+                print("ERROR: option --retries requires a whole number")
+                sys.exit()
+        elif(o in ["-a", "--archive"]):
+            # Save the raw HTML of every page to the archive directory
+            archiveDir = a
+        elif o == "--record":
+            # Record every page used into a fixture directory
+            recordDir = a
+        elif o == "--replay":
+            # Serve every page from a recorded fixture directory
+            replayDir = a
+        elif(o in ["-p", "--parser"]):
+            # Use a specific HTML parser instead of the fastest one installed
+            try:
+                Parser.useBackend(a)
+            except ValueError as e:
+                print("ERROR: " + str(e))
+                sys.exit()
+        elif o == "--no-cache":
+            # Download every page even if it is stored in the cache
+            useCache = False
+        elif o == "--no-snapshots":
+            # Parse every players pages even if they have not changed
+            useSnapshots = False
+        elif o == "--purge-cache":
+            # Delete everything stored in the cache and exit
+            try:
+                Cache().purge()
+            except OSError as e:
+                print("ERROR: could not purge the cache: " + str(e))
+                sys.exit(1)
+            print("Cache purged")
             sys.exit()
+        elif o == "--profile":
+            # Time every stage of the run and show where the time went
+            profile = True
+        elif o == "--profile-out":
+            # Save the profile to a file, which also turns profiling on
+            profile = True
+            profileFile = a
+        elif o == "--slots":
+            # Roster slots given as POSITION=COUNT pairs
+            try:
+                slots = {}
+                for pair in a.split(","):
+                    pos, count = pair.split("=")
+                    slots[pos.strip().upper()] = int(count)
+            except ValueError:
+                print("ERROR: option --slots requires a list like QB=1,RB=2,WR=2,TE=1,FLEX=1,DST=1")
+                sys.exit()
+        elif o == "--cap":
+            if a.isdigit():
+                cap = int(a)
+            else:
+                print("ERROR: option --cap requires a whole number")
+                sys.exit()
+        elif o == "--batch":
+            # Score every roster in a directory or manifest together
+            batchPath = a
+        elif o == "--batch-out":
+            batchOut = a
+        elif o == "--daemon":
+            # Keep the data warm and score rosters sent to the API on this port
+            if a.isdigit():
+                daemonPort = int(a)
+            else:
+                print("ERROR: option --daemon requires a port number")
+                sys.exit()
+        elif o == "--refresh":
+            try:
+                refresh = float(a) * 60
+            except ValueError:
+                print("ERROR: option --refresh requires a number of minutes")
+                sys.exit()
+        elif o == "--store":
+            # Save every week of data gathered to the database
+            storePath = a
+        elif o == "--from-store":
+            # Score the newest week in the database without scraping anything
+            fromStore = True
+        elif o == "--backtest":
+            # Replay every stored week and compare the scores to the points actually made
+            backtest = True
+        elif o == "--simulate":
+            # Simulate the range of outcomes of every player with this many trials each
+            if a.isdigit() and int(a) > 0:
+                trials = int(a)
+            else:
+                print("ERROR: option --simulate requires a number of trials greater than 0")
+                sys.exit()
+        elif o == "--seed":
+            if a.isdigit():
+                seed = int(a)
+            else:
+                print("ERROR: option --seed requires a whole number")
+                sys.exit()
+        elif o in ["--sp", "--sd"]:
+            # Searches are handled once all of the other options are read
+            search = (o, a)
         elif(o in ["-h", "--help"]):
             usage()
             sys.exit()
 
-    # Create the scraper object using the filename
-    scraper = Scraper(file = filename)
+    # Everything that needs requests, NumPy or BeautifulSoup is only imported once the
+    # options are read, so -h and bad options exit without loading any of them
+    from Scraper import Scraper
+    from Transport import Transport
+    from Archive import Archive
+
+    # Create the transport that every request will be made through
+    # Recording keeps the pages in a fixture directory instead of a plain archive
+    archive = None
+    if recordDir or replayDir:
+        from Fixtures import Fixtures
+    if recordDir:
+        archive = Fixtures(recordDir)
+    elif archiveDir:
+        archive = Archive(archiveDir)
+
+    # Replaying never touches the network, so the cache is not used either
+    replay = None
+    if replayDir:
+        try:
+            replay = Fixtures(replayDir, replay = True)
+        except FileNotFoundError as e:
+            print("ERROR: " + str(e))
+            sys.exit()
+        useCache = False
+        useSnapshots = False
+
+    # Every request to the web is limited to a rate each site tolerates and retried when it fails
+    throttle = None
+    if not replay:
+        from Throttle import Throttle
+        throttle = Throttle(rate = rate, retries = retries)
+
+    cache = None
+    if useCache:
+        # A read only working directory runs without the cache instead of failing
+        try:
+            cache = Cache()
+        except OSError as e:
+            print("WARNING: running without the cache: {0}".format(e))
+    transport = Transport(timeout = timeout, poolSize = workers, cache = cache, archive = archive, replay = replay,
+                          throttle = throttle)
+    Scraper.useTransport(transport)
+    # Optional parts of the run are only imported when they are turned on
+    if useSnapshots:
+        from Snapshot import Snapshot
+        try:
+            Scraper.snapshot = Snapshot()
+        except OSError as e:
+            print("WARNING: running without snapshots: {0}".format(e))
+    if storePath or fromStore:
+        from Store import Store
+        Scraper.store = Store(storePath)
+    if trials:
+        from Simulation import Simulation
+        Scraper.simulation = Simulation(trials, seed)
+
+    # Start timing before the scraper gathers the current week or searches
+    profiler = None
+    if profile:
+        Profiler.enable()
+        # A .prof file gets a full cProfile dump instead of a trace. cProfile only sees the
+        # main thread, so the fetching and parsing done by the worker threads is left out of it
+        if profileFile and profileFile.endswith(".prof"):
+            profiler = cProfile.Profile()
+            profiler.enable()
 
-    # Call the correct function to start the program
-    if verbosity == 1:
-        verbosity_one(scraper)
-    elif verbosity == 2:
-        verbosity_two(scraper)
-    else:
-        verbosity_three(scraper)
+    # Check if the user is searching for a single player or defense
+    if search:
+        try:
+            if search[0] == "--sp":
+                Scraper.searchPlayer(search[1])
+            else:
+                Scraper.searchDefense(search[1])
+        finally:
+            transport.close()
+        if profile:
+            finish_profile(profiler, profileFile)
+        sys.exit()
+
+    # Make sure archived or recorded pages are written even if the run fails part way
+    try:
+        # Load the newest stored week before the scraper would gather the current week
+        if fromStore:
+            try:
+                Scraper.loadStoredWeek()
+            except LookupError as e:
+                print("ERROR: " + str(e))
+                sys.exit()
+
+        # Replay the stored weeks to see how well the scores predicted them
+        if backtest:
+            from Backtest import Backtest
+            try:
+                tester = Backtest(storePath, workers = workers)
+                tester.run()
+                tester.printResults()
+            except LookupError as e:
+                print("ERROR: " + str(e))
+
+        # Serve the scoring API until the program is interrupted
+        elif daemonPort:
+            from Daemon import Daemon
+            daemon = Daemon(port = daemonPort, refresh = refresh, workers = workers, slots = slots, cap = cap)
+            daemon.start(filename if os.path.isfile(filename) else None)
+
+        # Score every roster of the batch together, sharing the players found on several rosters
+        elif batchPath:
+            from Batch import Batch
+            try:
+                batch = Batch(batchPath, workers = workers, slots = slots, cap = cap)
+            except FileNotFoundError as e:
+                print("ERROR: " + str(e))
+                sys.exit()
+            batch.run(batchOut)
+            graphed = batch.universe
 
-    # Check if the user wants to save to file
-    if save:
-        scraper.save(outputfile)
+        else:
+            # Create the scraper object using the filename
+            scraper = Scraper(file = filename, workers = workers, slots = slots, cap = cap)
+
+            # Call the correct function to start the program
+            if verbosity == 1:
+                verbosity_one(scraper)
+            elif verbosity == 2:
+                verbosity_two(scraper)
+            else:
+                verbosity_three(scraper)
+
+            # Check if the user wants to save to file
+            if save:
+                scraper.save(outputfile)
+            graphed = scraper
+
+    finally:
+        # Finish writing any archived pages and close the connections
+        transport.close()
+        if Scraper.store:
+            Scraper.store.close()
 
     # Graph the results if the user used graph flags
-    #if graph:
+    if graph and graphed:
+        graphed.graph(graphDir, graphFormats)
+
+    # Show where the time went and save the profile if asked to
+    if profile:
+        finish_profile(profiler, profileFile)
 
 
+def finish_profile(profiler, profileFile):
+    '''This function shows where the time of the run went and saves the cProfile
+    dump or the JSON trace of the run to the profile file, if one was given.'''
+
+    Profiler.printSummary()
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(profileFile)
+    elif profileFile:
+        Profiler.saveTrace(profileFile)
+
 
 def verbosity_one(scraper):
     '''This method will call all of the appropriate functions from the Scraper
@@ -97,9 +396,9 @@ def verbosity_two(scraper):
     print("Gathering Defense Data")
     scraper.getDefenseData()
     print("Done")
-    print("Deleting the temporary data directory")
-    Scraper.deleteDataDirectory(scraper.tempDir)
-    print("Done\n\n")
+    scraper.storeWeek()
+    print("\n")
+    scraper.printStats()
     scraper.printSchedule()
     scraper.sort()
     scraper.printTeam()
@@ -119,9 +418,9 @@ def verbosity_three(scraper):
     print("Gathering Defense Data...")
     scraper.getDefenseData()
     print("Done")
-    print("Deleting the Temporary data directory used...")
-    Scraper.deleteDataDirectory(scraper.tempDir)
-    print("Done\n\n")
+    scraper.storeWeek()
+    print("\n")
+    scraper.printStats()
     scraper.printSchedule()
     scraper.printCurrentData()
     print("\n\nAll of the general data gathered on offenses and defenses:\n\n")
@@ -157,7 +456,88 @@ def usage():
 
     print("  -g, --graph\t\t\t-> Allows the user to display relevant graphs based on the players and defenses that are " +
                             "used. Can work both when using a file as imput with multiple players and defenses " +
-                            "or when just searching for a single player or defense.")
+                            "or when just searching for a single player or defense. The charts of a players file " +
+                            "or batch are saved to graphs/Week[n]_[team] without opening any windows.")
+
+    print("   --graph-out [directory]\t-> Turns on --graph and saves the charts to the directory given.")
+
+    print("   --graph-format [list]\t-> Sets the image formats the charts are saved in, any of png, svg and pdf. " +
+                            "Default is png.")
+
+    print("   -w, --workers [number]\t-> Sets how many players or defenses are fetched from the web at the " +
+                            "same time. Default is 8.")
+
+    print("   -t, --timeout [seconds]\t-> Sets how long to wait on each web request before giving up. " +
+                            "Default is 5 seconds to connect and 15 seconds to respond.")
+
+    print("   --rate [number]\t\t-> Sets how many requests are started each second for each site. A site that " +
+                            "throttles the program is slowed down until it recovers. Default is 5.")
+
+    print("   --retries [number]\t\t-> Sets how many times a request that fails or is throttled is tried again, " +
+                            "waiting longer before each retry. Default is 4.")
+
+    print("   -a, --archive [directory]\t-> Saves the raw HTML of every page used to the directory given. " +
+                            "Pages are written in the background while the program runs.")
+
+    print("   --record [directory]\t\t-> Records every page used during the run into a fixture directory " +
+                            "so the run can be replayed later.")
+
+    print("   --replay [directory]\t\t-> Runs entirely from the pages recorded in a fixture directory " +
+                            "without using the network.")
+
+    print("   -p, --parser [name]\t\t-> Sets the HTML parser used to read each page, either 'lxml' or " +
+                            "'html.parser'. By default lxml is used when it is installed.")
+
+    print("   --profile\t\t\t-> Times every stage of the run, such as fetching, parsing and scoring each " +
+                            "player, and shows where the time went once the team is printed.")
+
+    print("   --profile-out [filename]\t-> Turns on --profile and saves the profile to the file. A file ending " +
+                            "in .prof gets a cProfile dump of the main thread only, which leaves out the pages " +
+                            "fetched and parsed by the worker threads. Any other file gets a JSON trace of every " +
+                            "thread that can be opened in chrome://tracing.")
+
+    print("   --slots [list]\t\t-> Sets the roster slots of the starting lineup as POSITION=COUNT pairs. " +
+                            "Default is QB=1,RB=2,WR=2,TE=1,FLEX=1,DST=1, where FLEX can be a RB, WR or TE. " +
+                            "Add BENCH=n to only keep the best n players on the bench.")
+
+    print("   --cap [amount]\t\t-> Picks the best starting lineup whose total salary is under the cap. " +
+                            "Salaries are given after each name in the players file, as in 'patrick-mahomes, 8200'.")
+
+    print("   --batch [path]\t\t-> Scores many rosters at once. The path is a directory of roster files or a " +
+                            "manifest listing one roster file per line. Players on several rosters are only fetched once.")
+
+    print("   --batch-out [directory]\t-> Saves each teams results from --batch to the directory instead of " +
+                            "printing them.")
+
+    print("   --daemon [port]\t\t-> Keeps the league data and players warm and scores rosters sent to " +
+                            "http://127.0.0.1:[port]/score until interrupted. The players in the players file are " +
+                            "loaded when it starts.")
+
+    print("   --refresh [minutes]\t\t-> Sets how often the daemon refreshes its data in the background. " +
+                            "Default is 60 minutes.")
+
+    print("   --store [filename]\t\t-> Saves the players, game logs, rankings and schedules gathered each week " +
+                            "to a SQLite database so they can be used again without scraping.")
+
+    print("   --from-store\t\t-> Scores the players file with the newest week saved with --store instead of " +
+                            "scraping anything. Uses 'season.db' unless --store gives another file.")
+
+    print("   --backtest\t\t\t-> Replays every week saved with --store using the data gathered going into it, " +
+                            "and shows how well the ranking of the scores matched the fantasy points actually made. " +
+                            "Weeks are replayed in parallel, -w sets how many at once.")
+
+    print("   --simulate [trials]\t\t-> Simulates this many outcomes of every players week from their game log " +
+                            "and matchup, and shows their 10th, 50th and 90th percentile and chance to boom or bust.")
+
+    print("   --seed [number]\t\t-> Seeds the simulation so the same outcomes are drawn every run.")
+
+    print("   --no-cache\t\t\t-> Downloads every page from the web instead of using the copies stored " +
+                            "in the cache from earlier runs.")
+
+    print("   --no-snapshots\t\t-> Parses every players pages again instead of reusing the snapshot " +
+                            "saved for them on an earlier run when their pages have not changed.")
+
+    print("   --purge-cache\t\t-> Deletes every page stored in the cache and exits.")
 
     print("   -h, --help\t\t\t-> Displays the help screen describing all of the available flags.")
 
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import requests
+from Archive import Archive
+
+
+class Fixtures(Archive):
+    '''This class records every page used during a run into a fixture directory
+    and can later replay a run entirely from that directory. Recording works the
+    same way as the Archive, with an index that maps each link to the file it was
+    saved in so the exact page can be found again without any network access.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    indexName = "index.json"  # Name of the file that maps each link to its page
+
+
+    def __init__(self, directory, replay = False):
+
+        self.replay = replay            # True when pages are served from the directory
+        self.index = {}                 # Maps each link to the file the page is saved in
+        self.lock = threading.Lock()    # Guards the index while recording concurrently
+
+        # Load the index of a directory that was already recorded
+        path = os.path.join(directory, Fixtures.indexName)
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                self.index = json.load(f)
+        elif replay:
+            raise FileNotFoundError("No recorded pages found in '{0}'".format(directory))
+
+        # Replaying only reads pages, so the background writer is not needed
+        if replay:
+            self.directory = directory
+        else:
+            Archive.__init__(self, directory)
+
+
+    def add(self, link, content):
+        '''Records the page found at the link and queues it to be written.'''
+
+        with self.lock:
+            self.index[link] = Archive.fileName(link)
+        Archive.add(self, link, content)
+
+
+    def load(self, link):
+        '''Returns the recorded response for the link. Raises a LookupError when
+        the link was not recorded, the network is never used instead.'''
+
+        if link not in self.index:
+            raise LookupError("No recorded page for {0}".format(link))
+
+        with open(os.path.join(self.directory, self.index[link]), "rb") as f:
+            content = f.read()
+
+        # Create the response the same way requests would
+        response = requests.Response()
+        response.status_code = 200
+        response.url = link
+        response.encoding = "utf-8"
+        response._content = content
+        return response
+
+
+    def close(self):
+        '''Finishes writing the recorded pages and saves the index.'''
+
+        if self.replay:
+            return
+
+        Archive.close(self)
+        with open(os.path.join(self.directory, Fixtures.indexName), "w") as f:
+            json.dump(self.index, f, indent = 1, sort_keys = True)
@@ -1,5 +1,13 @@
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
 import matplotlib.pyplot as plt 
 import numpy as np 
+from PIL import Image
+from Teams import Teams
 
 class Grapher(object):
     '''Grapher object that is built to use NFL player data and defense data 
@@ -9,14 +17,15 @@ class Grapher(object):
     # STATIC VARIABLES
     #########################################
 
-    # Team colors that will be used to distinguish between different players
-    teamColor = {"Arizona Cardinals": ["#97233F", "#000000"], "Baltimore Ravens": ["#241773", "#9E7C0C"], 
+    # Team colors that will be used to distinguish between different players, by team id
+    teamColor = {Teams.find(k): v for k, v in {
+                 "Arizona Cardinals": ["#97233F", "#000000"], "Baltimore Ravens": ["#241773", "#9E7C0C"], 
                  "Carolina Panthers": ["#0085CA", "#101820"], "Cincinnati Bengals": ["#FB4F14", "#000000"], 
                  "Dallas Cowboys": ["#041E42", "#869397"], "Detroit Lions": ["#0076B6", "#B0B7BC"],
                  "Houston Texans": ["#03202F", "#A71930"], "Jacksonville Jaguars": ["#006778", "#9F792C"], 
                  "Los Angeles Chargers": ["#002A5E", "#FFC20E"], "Miami Dolphins": ["#008E97", "#FC4C02"], 
                  "New England Patriots": ["#002244", "#C60C30"], "New York Giants": ["#0B2265", "#A71930"], 
-                 "Oakland Raiders": ["#000000", "#A5ACAF"], "Pittsburgh Steelers": ["#101920", "#FFB612"], 
+                 "Las Vegas Raiders": ["#000000", "#A5ACAF"], "Pittsburgh Steelers": ["#101920", "#FFB612"], 
                  "Seattle Seahawks": ["#002244", "#69BE28"], "Tennessee Titans": ["#0C2340", "#4B92DB"], 
                  "Atlanta Falcons": ["#A71930", "#000000"], "Buffalo Bills": ["#C60C30", "#00338D"],
                  "Chicago Bears": ["#0B162A", "#C83803"], "Cleveland Browns": ["#311D00", "#FF3C00"], 
@@ -24,8 +33,26 @@ class Grapher(object):
                  "Indianapolis Colts": ["#002C5F", "#A2AAAD"], "Kansas City Chiefs": ["#E31837", "#FFB81C"], 
                  "Los Angeles Rams": ["#003594", "#FFA300"], "Minnesota Vikings": ["#4F2683", "#FFC62F"], 
                  "New Orleans Saints": ["#D3BC8D", "#101820"], "New York Jets": ["#125740", "#000000"], 
-                 "Philadelpha Eagles": ["#004C54", "#A5ACAF"], "San Francisco 49ers": ["#AA0000", "#B3995D"], 
-                 "Tampa Bay Buccaneers": ["#D50A0A", "#34302B"], "Washington Football Team": ["#773141", "#FFB612"]}
+                 "Philadelphia Eagles": ["#004C54", "#A5ACAF"], "San Francisco 49ers": ["#AA0000", "#B3995D"], 
+                 "Tampa Bay Buccaneers": ["#D50A0A", "#34302B"], "Washington Football Team": ["#773141", "#FFB612"]}.items()}
+
+    defaultColor = ["#000000", "#A5ACAF"]  # Colors used for a team that is not known
+
+    formats = ["png"]          # Default image formats each chart set is saved in
+    workers = os.cpu_count()   # Default number of processes charts are rendered in at once
+    dpi = 80                   # Resolution of the saved charts
+    figureSize = (18, 12)      # Size of a whole chart set in inches
+    titleHeight = 0.8          # Height of the title strip of a chart set put together from cached plots
+
+    # Fonts used for the labels and the title of every chart
+    labelFont = {'family': 'serif', 'size': 15}
+    titleFont = {'family': 'serif', 'size': 20}
+
+    cache = None  # Pictures of plots already rendered, None renders every plot every time
+
+    # League rankings used by each rendering process, set by Grapher.headless
+    defenseRankings = {}
+    offenseRankings = {}
 
 
     def __init__(self, rankings, statList):
@@ -47,14 +74,33 @@ class Grapher(object):
         '''This method will be used for the search player function in the Scraper class to display the 
         correct graphs for a single player'''
 
-        colors = Grapher.teamColor[player.stats[0][1]] # Grabs the main color and accet collor of the players team from the grapher
+        Grapher.drawPlayer(player, defenseRankings)
+        plt.show()  # Print the final graph for the player
+
+    @staticmethod
+    def drawPlayer(player, defenseRankings):
+        '''This method draws the four graphs of a single player on a new figure and returns the figure'''
+
+        figure = plt.figure(figsize = Grapher.figureSize)  # Sets the size of the graph when it is displayed
+
+        # Draw each plot in its place on the figure
+        for i, plot in enumerate(Grapher.playerPlots(player, defenseRankings)):
+            plt.subplot(2, 2, i + 1)
+            Grapher.drawPlot(plot)
+
+        # Add a supertitle to the whole window
+        plt.suptitle(str(player.name), **Grapher.titleFont)
+
+        return figure
+
+    @staticmethod
+    def playerPlots(player, defenseRankings):
+        '''This method returns the four plots of a single player, each as the name of the method
+        that draws it and everything that method draws from'''
+
+        colors = Grapher.teamColor.get(player.teamId, Grapher.defaultColor) # Grabs the main color and accet collor of the players team from the grapher
         mainColor = colors[0]           # Grabs the main color 
         accentColor = colors[1]         # Grabs the accent color
-        plt.figure(figsize = (18, 12))  # Sets the size of the graph when it is displayed
-
-        # Create the fonts for the different component of the graphs
-        font1 = {'family': 'serif', 'size': 15}
-        title_font = {'family': 'serif', 'size': 20}
 
         # Generate the numpy arrays for the first plot
         graph1_x, graph1_y1, graph1_y2 = Grapher.playerArrayOne(player, defenseRankings)
@@ -65,8 +111,23 @@ class Grapher(object):
         # Fourth plot arrays
         graph4_x, graph4_y = Grapher.playerArrayFour(player, defenseRankings)
 
-        # Plot 1
-        plt.subplot(2, 2, 1)
+        return [("yardsPlot", (graph1_x, graph1_y1, graph1_y2, mainColor, accentColor)),
+                ("statsPlot", (graph2_x, graph2_y, graph2_lbl, mainColor, accentColor)),
+                ("yearlyPlot", (graph3_x, graph3_y, mainColor, accentColor)),
+                ("linePlot", (graph4_x, graph4_y, "label for graph 4", "Label for graph 4", "Graph #4"))]
+
+    @staticmethod
+    def drawPlot(plot):
+        '''This method draws a single plot on the current subplot'''
+
+        name, args = plot
+        getattr(Grapher, name)(*args)
+
+    @staticmethod
+    def yardsPlot(graph1_x, graph1_y1, graph1_y2, mainColor, accentColor):
+        '''This method draws the yards of a player each week against the defense they faced'''
+
+        font1 = Grapher.labelFont
         plt.plot(graph1_x, graph1_y1, marker = 'o', ms = 12, mec = accentColor, c = mainColor)
         plt.plot(graph1_x, graph1_y2, marker = 'o', ms = 8, c = "#000000")
         plt.grid(linestyle = '--', linewidth = 0.5)
@@ -75,8 +136,11 @@ class Grapher(object):
         plt.ylabel("Yards", fontdict = font1)
         plt.title("Yards VS. Defenses")
 
-        # Plot 2
-        plt.subplot(2, 2, 2)
+    @staticmethod
+    def statsPlot(graph2_x, graph2_y, graph2_lbl, mainColor, accentColor):
+        '''This method draws the main stats of a player for each year'''
+
+        font1 = Grapher.labelFont
         barwidth = 0.25   # Width of the bars in the graph
         bar_list = []     # Will hold the x positions of all of the bars
 
@@ -100,8 +164,11 @@ class Grapher(object):
         plt.title("Stats Per Year")
         plt.legend()
 
-        # Plot 3
-        plt.subplot(2, 2, 3)
+    @staticmethod
+    def yearlyPlot(graph3_x, graph3_y, mainColor, accentColor):
+        '''This method draws the yards of a player for each year'''
+
+        font1 = Grapher.labelFont
         plt.bar(graph3_x, graph3_y, color = mainColor, edgecolor = accentColor, label = "Yards")
         plt.grid(linestyle = '--', linewidth = 0.5)
         plt.xlabel("Year", fontdict = font1)
@@ -110,35 +177,47 @@ class Grapher(object):
         plt.title("Yards Per year")
         plt.legend()
 
-        # Plot 4
-        plt.subplot(2, 2, 4)
-        plt.plot(graph4_x, graph4_y)
+    @staticmethod
+    def linePlot(x, y, xlabel, ylabel, title):
+        '''This method draws a plain line plot with the labels given'''
 
-        plt.grid(linestyle = '--', linewidth = 0.5)
-        plt.xlabel("label for graph 4", fontdict = font1)
-        plt.ylabel("Label for graph 4", fontdict = font1)
-        plt.title("Graph #4")
+        font1 = Grapher.labelFont
+        plt.plot(x, y)
 
-        # Add a supertitle to the whole window
-        plt.suptitle(str(player.name), fontdict = title_font)
-
-        plt.show()  # Print the final graph for the player
+        plt.grid(linestyle = '--', linewidth = 0.5)
+        plt.xlabel(xlabel, fontdict = font1)
+        plt.ylabel(ylabel, fontdict = font1)
+        plt.title(title)
 
     @staticmethod
     def graphSingleDefense(defense, offenseRankings):
         '''This method will be used for the search defense function in the scraper class to display the 
         correct graphs for a single player.'''
 
-        # Get the appropriate main color and accent color from the color dictionary
-        colors = Grapher.teamColor["Arizona Cardinals"]
-        mainColor = colors[0]
-        accentColor = colors[1]
+        Grapher.drawDefense(defense, offenseRankings)
+        # Display the graph
+        plt.show()
+
+    @staticmethod
+    def drawDefense(defense, offenseRankings):
+        '''This method draws the four graphs of a single defense on a new figure and returns the figure'''
+
+        figure = plt.figure(figsize = Grapher.figureSize) # Sets the size of the window holding all four graphs
+
+        # Draw each plot in its place on the figure
+        for i, plot in enumerate(Grapher.defensePlots(defense, offenseRankings)):
+            plt.subplot(2, 2, i + 1)
+            Grapher.drawPlot(plot)
 
-        plt.figure(figsize = (18, 12)) # Sets the size of the window holding all four graphs
+        # Set the window title 
+        plt.suptitle(str(defense.team))
+
+        return figure
 
-        # Create the fonts for the different component of the graphs
-        font1 = {'family': 'serif', 'size': 15}
-        title_font = {'family': 'serif', 'size': 20}
+    @staticmethod
+    def defensePlots(defense, offenseRankings):
+        '''This method returns the four plots of a single defense, each as the name of the method
+        that draws it and everything that method draws from'''
 
         # Get all of the arrays for the graphs
         graph1_x, graph1_y = Grapher.defenseArrayOne(defense, offenseRankings)
@@ -146,52 +225,214 @@ class Grapher(object):
         graph3_x, graph3_y = Grapher.defenseArrayThree(defense, offenseRankings)
         graph4_x, graph4_y = Grapher.defenseArrayFour(defense, offenseRankings)
 
-        # Plot 1
-        plt.subplot(2, 2, 1)
-        plt.plot(graph1_x, graph1_y)
+        return [("linePlot", (graph1_x, graph1_y, "Label for graph #1", "Label for graph #1", "Graph #1")),
+                ("linePlot", (graph2_x, graph2_y, "Label for graph #2", "Label for graph #2", "Graph #2")),
+                ("linePlot", (graph3_x, graph3_y, "Label for graph #3", "Label for graph #3", "Graph #3")),
+                ("linePlot", (graph4_x, graph4_y, "Label for graph #4", "Label for graph #4", "Graph #4"))]
 
-        # Set labels for graph 1
-        plt.grid(linestyle = '--', linewidth = 0.5)
-        plt.xlabel("Label for graph #1", fontdict = font1)
-        plt.ylabel("Label for graph #1", fontdict = font1)
-        plt.title("Graph #1")
 
-        # Plot 2
-        plt.subplot(2, 2, 2)
-        plt.plot(graph2_x, graph2_y)
+    ##################################
+    #  Headless rendering            #
+    ##################################
 
-        # Set the labels for graph 2
-        plt.grid(linestyle = '--', linewidth = 0.5)
-        plt.xlabel("Label for graph #2", fontdict = font1)
-        plt.ylabel("Label for graph #2", fontdict = font1)
-        plt.title("Graph #2")
+    @staticmethod
+    def renderAll(players, defenses, defenseRankings, offenseRankings, directory, formats = None, workers = None):
+        '''This method saves the charts of every player and defense given to the directory without
+        showing anything on screen. The charts are rendered at the same time across a pool of processes,
+        and the files written are returned. Plots that were already rendered with the same data are
+        taken from the chart cache instead of being drawn again.'''
+
+        formats = formats if formats else Grapher.formats
+        workers = workers if workers else Grapher.workers
+        os.makedirs(directory, exist_ok = True)
+
+        # Each job is the kind of chart, the player or defense and the file name without an extension
+        jobs = [("player", p, os.path.join(directory, Grapher.fileName(p.name))) for p in players]
+        jobs += [("defense", d, os.path.join(directory, Grapher.fileName(d.team))) for d in defenses]
+        if not jobs:
+            return []
+
+        files = []
+        hits, misses = 0, 0
+        cache = Grapher.cache
+        with ProcessPoolExecutor(max_workers = min(workers, len(jobs)), initializer = Grapher.headless,
+                                 initargs = (defenseRankings, offenseRankings, cache)) as pool:
+            # Hand the jobs out in chunks so each process gets a steady stream of work
+            chunk = max(1, len(jobs) // (4 * workers))
+            for job, result in zip(jobs, pool.map(Grapher.render, jobs, [formats] * len(jobs), chunksize = chunk)):
+                if isinstance(result, str):
+                    print("ERROR: could not graph {0}: {1}".format(job[2], result))
+                else:
+                    files += result[0]
+                    hits += result[1]
+                    misses += result[2]
+
+        # Each process only knows about its own writes, so trim the cache once they are all done
+        if cache:
+            cache.reload()
+            cache.evict()
+            print("Chart cache: {0} plots reused, {1} rendered".format(hits, misses))
+
+        return files
 
-        # Plot 3
-        plt.subplot(2, 2, 3)
-        plt.plot(graph3_x, graph3_y)
+    @staticmethod
+    def headless(defenseRankings, offenseRankings, cache = None):
+        '''This method sets up a rendering process to draw without a screen and keeps the league
+        rankings and chart cache for every chart it renders.'''
 
-        # Set the labels for graph 3
-        plt.grid(linestyle = '--', linewidth = 0.5)
-        plt.xlabel("Label for graph #3", fontdict = font1)
-        plt.ylabel("Label for graph #3", fontdict = font1)
-        plt.title("Graph #3")
+        matplotlib.use("Agg")
+        Grapher.defenseRankings = defenseRankings
+        Grapher.offenseRankings = offenseRankings
+        Grapher.cache = cache
 
-        # Plot 4
-        plt.subplot(2, 2, 4)
-        plt.plot(graph4_x, graph4_y)
+    @staticmethod
+    def render(job, formats):
+        '''This method renders the charts of a single player or defense in each format. Returns the files
+        written with the number of plots taken from the cache and drawn, or the error as a string when the
+        charts could not be drawn.'''
+
+        kind, x, path = job
+        try:
+            if kind == "player":
+                title = (str(x.name), Grapher.titleFont)
+                plots = Grapher.playerPlots(x, Grapher.defenseRankings)
+            else:
+                title = (str(x.team), {})
+                plots = Grapher.defensePlots(x, Grapher.offenseRankings)
+
+            files, hits, misses = [], 0, 0
+            for f in formats:
+                if f == "png" and Grapher.cache:
+                    # Put the chart together from a picture of each plot, reusing the plots that did not change
+                    reused = Grapher.renderTiles(title, plots, path + "." + f)
+                elif Grapher.cache:
+                    # Vector charts can only be reused as a whole
+                    reused = Grapher.renderWhole(title, plots, path + "." + f, f)
+                else:
+                    Grapher.saveFigure(Grapher.drawFigure(title, plots), path + "." + f, f)
+                    reused = [False]
+                hits += sum(reused)
+                misses += len(reused) - sum(reused)
+                files.append(path + "." + f)
+
+        except Exception as e:
+            plt.close("all")
+            return "{0}: {1}".format(type(e).__name__, e)
+
+        return files, hits, misses
 
-        # Set the labels for graph 4
-        plt.grid(linestyle = '--', linewidth = 0.5)
-        plt.xlabel("Label for graph #4", fontdict = font1)
-        plt.ylabel("Label for graph #4", fontdict = font1)
-        plt.title("Graph #4")
+    @staticmethod
+    def drawFigure(title, plots):
+        '''This method draws a whole chart set on a new figure from its title and plots'''
 
-        # Set the window title 
-        plt.suptitle(str(defense.tean))
-        # Display the graph
-        plt.show()
+        figure = plt.figure(figsize = Grapher.figureSize)
+        for i, plot in enumerate(plots):
+            plt.subplot(2, 2, i + 1)
+            Grapher.drawPlot(plot)
+        plt.suptitle(title[0], **title[1])
+        return figure
+
+    @staticmethod
+    def saveFigure(figure, path, form):
+        '''This method saves a figure in the format given and frees it so the process does not run
+        out of memory'''
+
+        figure.savefig(path, format = form, dpi = Grapher.dpi)
+        plt.close(figure)
+
+    @staticmethod
+    def renderTiles(title, plots, path):
+        '''This method saves a PNG chart set put together from a picture of its title and of each of its
+        plots. Each picture is taken from the cache when one with the same data and styling was already
+        rendered. Returns whether each picture was reused.'''
+
+        width, height = Grapher.figureSize
+        tiles = []
+        reused = []
+        # The title strip across the top, then the plots in a 2 by 2 grid below it
+        specs = [(("titleStrip", title), (width, Grapher.titleHeight))]
+        specs += [(plot, (width / 2, height / 2)) for plot in plots]
+
+        for plot, size in specs:
+            key = Grapher.plotKey(plot, size)
+            tile = Grapher.cache.get(key)
+            reused.append(tile is not None)
+            if tile is None:
+                # Draw the plot on a figure of its own and keep the picture for next time
+                figure = plt.figure(figsize = size)
+                if plot[0] == "titleStrip":
+                    figure.text(0.5, 0.5, title[0], ha = "center", va = "center", **title[1])
+                else:
+                    Grapher.drawPlot(plot)
+                buffer = io.BytesIO()
+                figure.savefig(buffer, format = "png", dpi = Grapher.dpi)
+                plt.close(figure)
+                tile = buffer.getvalue()
+                Grapher.cache.put(key, tile)
+            tiles.append(Image.open(io.BytesIO(tile)))
+
+        # Paste the pictures together into the chart set
+        top = tiles[0].height
+        chart = Image.new("RGBA", (tiles[0].width, top + 2 * tiles[1].height), "white")
+        chart.paste(tiles[0], (0, 0))
+        for i, tile in enumerate(tiles[1:]):
+            chart.paste(tile, ((i % 2) * tiles[1].width, top + (i // 2) * tiles[1].height))
+        chart.save(path)
+
+        return reused
+
+    @staticmethod
+    def renderWhole(title, plots, path, form):
+        '''This method saves a chart set in a vector format, reusing the file rendered before when all
+        of its plots are unchanged. Returns whether the chart was reused.'''
+
+        key = Grapher.plotKey(("chart", (form, title, plots)), Grapher.figureSize)
+        content = Grapher.cache.get(key)
+        reused = content is not None
+        if not reused:
+            buffer = io.BytesIO()
+            Grapher.saveFigure(Grapher.drawFigure(title, plots), buffer, form)
+            content = buffer.getvalue()
+            Grapher.cache.put(key, content)
+
+        with open(path, "wb") as f:
+            f.write(content)
+
+        return [reused]
+
+    @staticmethod
+    def plotKey(plot, size):
+        '''Returns the key a plot is cached under, the hash of the arrays and labels it is drawn from,
+        its size and the styling every plot shares.'''
+
+        hasher = hashlib.sha256()
+        style = (Grapher.dpi, Grapher.labelFont, Grapher.titleFont, matplotlib.__version__)
+        Grapher.hashValue(hasher, (plot, size, style))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def hashValue(hasher, value):
+        '''Adds a value to the hash, looking inside arrays, lists and dictionaries so that equal data
+        always gives the same hash.'''
+
+        if isinstance(value, np.ndarray):
+            hasher.update("array{0}{1}".format(value.dtype, value.shape).encode("utf-8"))
+            hasher.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, (list, tuple)):
+            hasher.update("list{0}".format(len(value)).encode("utf-8"))
+            for v in value:
+                Grapher.hashValue(hasher, v)
+        elif isinstance(value, dict):
+            Grapher.hashValue(hasher, sorted(value.items()))
+        else:
+            hasher.update(("{0}:{1!r};".format(type(value).__name__, value)).encode("utf-8"))
+
+    @staticmethod
+    def fileName(name):
+        '''Returns the name of the file the charts of a player or defense are saved under.'''
+
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", name.strip())
 
-    
     ##################################
     #  Array functions for players   #
     ##################################
@@ -200,25 +441,18 @@ class Grapher(object):
     def playerArrayOne(player, defenseRankings):
         '''This method is used by the graphSinglePlayer method to generate the arrays for the first plot'''
 
-        yards_idx = player.gameCategories.index("YDS")  # Get the index of the yards column
+        games = player.gameTable  # Numeric columns of the players game stats
         # Used to get the correct defense stat to compare the player to
         def_idx = 1
         if player.position == "RB" : def_idx = 2
 
-        # Lists for the plots
-        statArray = []    # Used in the first plot to represent the players stats
-        weeks = []        # Used in the first plot to represent each week of football
-        defense_arr = []  # Used in the first plot to represent the defenses the player faced
-        
-        # Populate the lists with each value of the x axis representing a week in the NFL
-        for game in player.gameStats:
-            weeks.append(int(game[0]))  # Week number
-            defense_arr.append(float(defenseRankings[game[1]][def_idx]))  # Either pass defense or rush defense depending on position of player
-            # Passing yards for each week in the y axis
-            if(not (game[yards_idx] == '')):     
-                statArray.append(int(game[yards_idx]))
-            else:
-                statArray.append(0)
+        # Each value of the x axis represents a week in the NFL
+        weeks = games[0].astype(int)
+        # Yards for each week in the y axis, with missing games counted as zero
+        statArray = games.values("YDS").astype(int)
+        # Either pass defense or rush defense depending on position of player
+        defense_arr = np.array([defenseRankings[Teams.find(opp)][def_idx] for opp in games[1]], dtype = float)
+
         # Return the correct arrays
         return weeks, statArray, defense_arr
        
@@ -227,7 +461,6 @@ class Grapher(object):
     def playerArrayTwo(player, defenseRankings):
         '''This method is used by the graphSinglePlayer method to generate the arrays for the second plot'''
 
-        year_arr = []    # Used to holf the years that the player has played in NFL
         stat_arr = []    # Used to hold the relevant stats for the player per year
         label_arr = []   # Will the store the stat labels for the different columns
         cat_arr = [8, 9, 12]  # The columns with the data to show
@@ -239,18 +472,13 @@ class Grapher(object):
             cat_arr = [4, 6, 8]
 
         
-        # Go through each year the player has played
-        for year in player.stats:
-            year_arr.append(year[0])
+        # Get each year the player has played in the NFL
+        year_arr = player.statTable[0].astype(int)
 
-        # Get each stat in their own list and append to the stat array
+        # Get each stats column for every year the player has played
         for col in cat_arr:
-            temp_list = []
             label_arr.append(player.categories[col])
-            # Get each stat for each year the player has played
-            for year in player.stats:
-                temp_list.append(float(year[col]))
-            stat_arr.append(temp_list)
+            stat_arr.append(player.statTable.values(col))
 
         return year_arr, stat_arr, label_arr
 
@@ -258,19 +486,15 @@ class Grapher(object):
     def playerArrayThree(player, defenseRankings):
         '''This method is used by the graphSinglePLayer method to generate the array for the third plot'''
 
-        year_arr = []   # Used to hold the years the player has been in the league
-        yards_arr = []  # Used to hold the yards for each year
         yrd_idx = 6     # Holds the index for the yards column in the players stats
         
         # Change the yard index depending on the players position
         if player.position != "QB":
             yrd_idx = 5
 
-        # Go through each of the years in the players stats
-        for year in player.stats:
-            # Append the correct year and yards for that year into thir arrays
-            year_arr.append(year[0])
-            yards_arr.append(float(year[yrd_idx]))
+        # Get the years the player has been in the league and the yards for each year
+        year_arr = player.statTable[0].astype(int)
+        yards_arr = player.statTable.values(yrd_idx)
 
         # Return both arrays, x then y
         return year_arr, yards_arr
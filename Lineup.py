@@ -0,0 +1,240 @@
+import itertools
+import math
+import numpy as np
+
+
+class Lineup(object):
+    '''This class picks the starting lineup with the highest total score from a
+    team of players and defenses. The lineup is made of roster slots, such as two
+    RB slots and a FLEX slot that can hold a RB, WR or TE, and everyone who does
+    not start is put on the bench. Without a salary cap the best players at each
+    position are simply taken in order. With a salary cap, the best choice for
+    each position at every salary is found with a knapsack over salary buckets,
+    and the positions are then combined to find the best lineup under the cap.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    # Default roster slots and how many of each are started, a BENCH slot limits the size of the bench
+    slots = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "DST": 1}
+    flex = ["RB", "WR", "TE"]  # Positions that can be started in a FLEX slot
+    salaryUnit = 100           # Salaries are rounded up to this amount when a salary cap is used
+
+
+    def __init__(self, players, defenses, slots = None, cap = None):
+
+        self.slots = dict(slots if slots else Lineup.slots)  # Number of each slot to fill
+        self.cap = cap          # Total salary allowed for the starters, None for no cap
+        self.starters = []      # Holds (slot, player or defense) for every starter
+        self.bench = []         # Holds everyone that is not starting, best score first
+        self.score = 0.0        # Total score of the starters
+        self.salary = 0         # Total salary of the starters
+
+        # Group everyone that can be started by their position, defenses fill the DST slots
+        self.candidates = {}
+        for p in players:
+            self.candidates.setdefault(p.position, []).append(p)
+        if defenses:
+            self.candidates["DST"] = list(defenses)
+
+        self.optimize()
+
+
+    def optimize(self):
+        '''Fills every slot with the lineup that has the highest total score and
+        puts everyone else on the bench.'''
+
+        # Never ask for more players at a position than there are
+        fixed = {}
+        for pos, n in self.slots.items():
+            if pos not in ["FLEX", "BENCH"]:
+                fixed[pos] = min(n, len(self.candidates.get(pos, [])))
+        # Or more FLEX players than are left over once the other slots are filled
+        left = sum(len(self.candidates.get(pos, [])) - fixed.get(pos, 0) for pos in Lineup.flex)
+        flexCount = min(self.slots.get("FLEX", 0), left)
+
+        if self.cap is None:
+            chosen, flexPicks = self.pickBest(fixed, flexCount)
+        else:
+            chosen, flexPicks = self.pickUnderCap(fixed, flexCount)
+
+        # List the starters in the order of the slots
+        for pos in self.slots:
+            if pos == "FLEX":
+                self.starters += [("FLEX", x) for x in flexPicks]
+            elif pos != "BENCH":
+                self.starters += [(pos, x) for x in Lineup.ranked(chosen.get(pos, []))]
+
+        starting = set(id(x) for _, x in self.starters)
+        everyone = [x for group in self.candidates.values() for x in group]
+        self.bench = Lineup.ranked([x for x in everyone if id(x) not in starting])
+        if "BENCH" in self.slots:
+            self.bench = self.bench[:self.slots["BENCH"]]
+        self.score = sum(x.score for _, x in self.starters)
+        self.salary = sum(Lineup.salaryOf(x) for _, x in self.starters)
+
+
+    def pickBest(self, fixed, flexCount):
+        '''Without a salary cap the best lineup takes the highest scores at each
+        position, and then the highest scores left over for the FLEX slots.'''
+
+        ranked = {pos: Lineup.ranked(group) for pos, group in self.candidates.items()}
+        chosen = {pos: ranked.get(pos, [])[:n] for pos, n in fixed.items()}
+
+        # Everyone left at a FLEX position competes for the FLEX slots
+        rest = [x for pos in Lineup.flex for x in ranked.get(pos, [])[fixed.get(pos, 0):]]
+        return chosen, Lineup.ranked(rest)[:flexCount]
+
+
+    def pickUnderCap(self, fixed, flexCount):
+        '''With a salary cap, tries every way of giving the FLEX slots to the
+        FLEX positions and keeps the best lineup that fits under the cap. Raises
+        a ValueError when no lineup fits.'''
+
+        buckets = int(self.cap // Lineup.salaryUnit)
+
+        # Best score for each position and number of players at every salary, found once
+        tables = {}
+        for pos in set(fixed) | set(Lineup.flex if flexCount else []):
+            extra = flexCount if pos in Lineup.flex else 0
+            most = min(fixed.get(pos, 0) + extra, len(self.candidates.get(pos, [])))
+            tables[pos] = Lineup.positionTable(self.candidates.get(pos, []), most, buckets)
+
+        best = None
+        for flexPositions in itertools.combinations_with_replacement(Lineup.flex, flexCount):
+            counts = dict(fixed)
+            for pos in flexPositions:
+                counts[pos] = counts.get(pos, 0) + 1
+
+            # Skip a FLEX choice that needs more players than a position has
+            if any(counts[pos] > len(self.candidates.get(pos, [])) for pos in flexPositions):
+                continue
+
+            score, budgets = Lineup.combine([tables[pos][0][counts[pos]] for pos in counts])
+            if score > -np.inf and (best is None or score > best[0]):
+                best = (score, counts, budgets, flexPositions)
+
+        if best is None:
+            raise ValueError("No lineup fits under the salary cap of {0}".format(self.cap))
+
+        # Rebuild the players picked at each position from the salary each was given
+        score, counts, budgets, flexPositions = best
+        chosen = {}
+        for pos, budget in zip(counts, budgets):
+            chosen[pos] = Lineup.pickFromTable(self.candidates.get(pos, []), tables[pos], counts[pos], budget)
+
+        # The lowest scoring players at each FLEX position are the ones in the FLEX slots
+        flexPicks = []
+        for pos in set(flexPositions):
+            group = Lineup.ranked(chosen[pos])
+            extra = flexPositions.count(pos)
+            chosen[pos], flexPicks = group[:len(group) - extra], flexPicks + group[len(group) - extra:]
+
+        return chosen, Lineup.ranked(flexPicks)
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def positionTable(group, most, buckets):
+        '''Runs a knapsack over the salary buckets for a single position. Returns
+        the best score of exactly j players with a total salary of at most c, for
+        every j up to most and every c up to the number of buckets, along with the
+        choices made so the players can be found again.'''
+
+        best = np.full((most + 1, buckets + 1), -np.inf)
+        best[0] = 0.0
+        taken = np.zeros((len(group), most + 1, buckets + 1), dtype = bool)
+
+        for i, x in enumerate(group):
+            w = Lineup.bucketOf(x)
+            if w > buckets:
+                continue
+            # Go down through the counts so each player is only used once
+            for j in range(most, 0, -1):
+                option = best[j - 1, :buckets + 1 - w] + x.score
+                better = option > best[j, w:]
+                best[j, w:] = np.where(better, option, best[j, w:])
+                taken[i, j, w:] = better
+
+        return best, taken
+
+
+    @staticmethod
+    def pickFromTable(group, table, count, budget):
+        '''Finds the players the position table picked for count players with the
+        salary budget given.'''
+
+        best, taken = table
+        picked = []
+        for i in range(len(group) - 1, -1, -1):
+            if count == 0:
+                break
+            if taken[i, count, budget]:
+                picked.append(group[i])
+                count -= 1
+                budget -= Lineup.bucketOf(group[i])
+
+        return picked
+
+
+    @staticmethod
+    def combine(rows):
+        '''Combines the best score at every salary of each position into the best
+        score of the whole lineup under the cap. Returns that score and the salary
+        given to each position.'''
+
+        total = rows[0]
+        splits = []
+        for row in rows[1:]:
+            # For each total salary, try every way of splitting it with the new position
+            merged = np.empty_like(total)
+            split = np.zeros(len(total), dtype = int)
+            for c in range(len(total)):
+                options = total[c::-1] + row[:c + 1]
+                split[c] = np.argmax(options)
+                merged[c] = options[split[c]]
+            total = merged
+            splits.append(split)
+
+        # Follow the splits back to find the salary each position was given
+        c = len(total) - 1
+        budgets = []
+        for split in reversed(splits):
+            budgets.append(int(split[c]))
+            c -= int(split[c])
+        budgets.append(c)
+
+        return total[-1], list(reversed(budgets))
+
+
+    @staticmethod
+    def ranked(group):
+        '''Returns the players or defenses from the highest score to the lowest.'''
+
+        return sorted(group, key = lambda x: x.score, reverse = True)
+
+
+    @staticmethod
+    def salaryOf(x):
+        '''Returns the salary of a player or defense, zero when it is not known.'''
+
+        return getattr(x, "salary", 0)
+
+
+    @staticmethod
+    def bucketOf(x):
+        '''Returns the number of salary buckets a player or defense costs.'''
+
+        return int(math.ceil(Lineup.salaryOf(x) / Lineup.salaryUnit))
+
+
+    @staticmethod
+    def label(x):
+        '''Returns the name used to show a player or defense.'''
+
+        return x.name if hasattr(x, "name") else x.team
@@ -0,0 +1,98 @@
+import threading
+import numpy as np
+from Teams import Teams
+
+
+class Matchups(object):
+    '''This class holds the strength of every matchup in the league for a single
+    week. It is built once from the league rankings, the schedule of every team
+    and this weeks games, and holds a team vs team matrix for offenses and one
+    for defenses. Each cell is the difference between the unit a team faces and
+    the average unit that team has faced so far, so scoring a player or defense
+    is a single lookup. The matrices are indexed by team id and include the bye
+    week, which always has a difference of zero.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    weeks = {}                # Matchups already built this run, by week number
+    current = None            # Matchups for the week being scored, used by Player and Defense scoring
+    lock = threading.Lock()   # Makes sure each week is only built once when scrapers run together
+
+
+    def __init__(self, week, defenseRankings, offenseRankings, schedules, opponents):
+
+        self.week = week              # Week of the season the matchups are for
+        self.schedules = schedules    # Ids of the teams each team has faced so far, by team id
+        self.defense = Matchups.matrix(defenseRankings)  # Stats of every defense, one row per team id
+        self.offense = Matchups.matrix(offenseRankings)  # Stats of every offense, one row per team id
+
+        # This weeks opponent of every team, teams that are not playing are on a bye
+        self.opponents = np.full(Teams.count, Teams.BYE, dtype = int)
+        for team, opp in opponents.items():
+            if team is not None and opp is not None:
+                self.opponents[team] = opp
+
+        # Count how many times each team has faced each other team
+        faced = np.zeros((Teams.count, Teams.count))
+        for team, games in schedules.items():
+            np.add.at(faced[team], np.array(games, dtype = int), 1)
+        self.games = faced.sum(axis = 1)  # Number of games each team has played
+
+        # Schedule adjusted averages, the average defense and offense each team has faced
+        played = np.maximum(self.games, 1)[:, None]
+        self.avgDefense = faced @ self.defense / played
+        self.avgOffense = faced @ self.offense / played
+
+        # Team vs team matrices, row is the team being scored and column is the opponent
+        self.offenseVsDefense = self.defense[None, :, :] - self.avgDefense[:, None, :]
+        self.defenseVsOffense = self.offense[None, :, :] - self.avgOffense[:, None, :]
+        # Nothing is gained or lost on a bye
+        self.offenseVsDefense[:, Teams.BYE] = 0
+        self.defenseVsOffense[:, Teams.BYE] = 0
+
+
+    def knows(self, team):
+        '''Returns True when the schedule of the team was gathered, so its row of
+        the matrices can be used.'''
+
+        return team is not None and team != Teams.BYE and team in self.schedules
+
+
+    def setSchedule(self, defense):
+        '''Fills in the schedule and this weeks opponent of a defense from the
+        schedules gathered for the whole league. Raises a LookupError when the
+        team is not known.'''
+
+        if not self.knows(defense.teamId):
+            raise LookupError("Unknown team '{0}'".format(defense.team))
+
+        defense.schedule = list(self.schedules[defense.teamId])
+        defense.opponent = int(self.opponents[defense.teamId])
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def matrix(rankings):
+        '''Returns the rankings as a matrix with one row of stats for each team id,
+        including the bye week.'''
+
+        matrix = np.zeros((Teams.count, 4))
+        for team, stats in rankings.items():
+            if team is not None:
+                matrix[team] = stats
+
+        return matrix
+
+
+    @staticmethod
+    def use(matchups):
+        '''Stores the matchups for their week and makes them the current matchups.'''
+
+        Matchups.weeks[matchups.week] = matchups
+        Matchups.current = matchups
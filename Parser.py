@@ -0,0 +1,76 @@
+import re
+
+
+class Parser(object):
+    '''This class turns the pages downloaded while scraping into BeautifulSoup
+    objects. The HTML parser used is pluggable, the fast lxml parser is used when
+    it is installed and the pure Python html.parser is used otherwise. Callers can
+    also ask for only the parts of the page they need so the rest of the page is
+    never built into a tree.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    # Parsers that can be used, in order of preference
+    backends = ["lxml", "html.parser"]
+    backend = None  # Parser currently being used, picked the first time a page is parsed
+
+
+    @staticmethod
+    def parse(content, tags = None, classes = None):
+        '''Parses the content of a page with the current backend. When tags or classes
+        are given, only the elements with one of those tag names and one of those
+        classes are built, along with everything inside of them.'''
+
+        # BeautifulSoup is only imported once the first page is parsed
+        from bs4 import BeautifulSoup
+
+        # Pick the fastest backend available the first time a page is parsed
+        if not Parser.backend:
+            Parser.useBackend(Parser.findBackend())
+
+        return BeautifulSoup(content, Parser.backend, parse_only = Parser.strainer(tags, classes))
+
+
+    @staticmethod
+    def strainer(tags = None, classes = None):
+        '''Creates the SoupStrainer used to only build the wanted parts of a page.
+        Returns None when the whole page is wanted.'''
+
+        if not tags and not classes:
+            return None
+
+        attrs = {}
+        # Match one of the classes anywhere in an elements list of classes
+        if classes:
+            attrs["class"] = re.compile(r"(^|\s)({0})(\s|$)".format("|".join(re.escape(c) for c in classes)))
+
+        from bs4 import SoupStrainer
+        return SoupStrainer(tags, attrs = attrs)
+
+
+    @staticmethod
+    def findBackend():
+        '''Returns the first backend in the list of backends that is installed.'''
+
+        from bs4 import BeautifulSoup, FeatureNotFound
+        for backend in Parser.backends:
+            try:
+                BeautifulSoup("", backend)
+                return backend
+            except FeatureNotFound:
+                continue
+
+        return "html.parser"
+
+
+    @staticmethod
+    def useBackend(backend):
+        '''Sets the backend that is used to parse every page. Raises a ValueError
+        if the backend is not one of the available parsers.'''
+
+        if backend not in Parser.backends:
+            raise ValueError("Unknown parser '{0}', choose from: {1}".format(backend, ", ".join(Parser.backends)))
+
+        Parser.backend = backend
@@ -1,5 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
+from Parser import Parser
+from Profiler import Profiler
+from StatTable import StatTable
+from Teams import Teams
+from Matchups import Matchups
+import numpy as np
 
 class Player(object):
 	'''This class represents a Player in the NFL'''
@@ -8,11 +12,15 @@ class Player(object):
 	# Declare all static class variables here     #
 	###############################################
 
-	# Dictionary to hold names and rankings of defenses to compare to players data
+	# Dictionary to hold the rankings of each defense by team id to compare to players data
 	defenseRankings = {}
 
-	# Store default data locations
-	scheduleLoc = "current_week_schedule"
+	# Shared HTTP transport used for every request, set by Scraper.useTransport
+	transport = None
+
+	# Fantasy points for each game log column, passing columns come first for a QB
+	points = {"QB": {"YDS": 0.04, "TD": 4, "INT": -2, "YDS_2": 0.1, "TD_2": 6, "LOST": -2},
+			  "other": {"REC": 1, "YDS": 0.1, "TD": 6, "YDS_2": 0.1, "TD_2": 6, "LOST": -2}}
 
 	# Store all of the links to gather data from
 	statLink = "https://www.nfl.com/players/{0}/stats/"
@@ -28,12 +36,18 @@ class Player(object):
 		self.stats = []            # Holds all of the stats for the player for the past year
 		self.gameStats = []        # Holds all of the stats per game for the current or past season
 		self.gameCategories = []   # Holds all of the categories for the individual games
-		self.schedule = []         # Holds the past schedule of the player
-		self.opponent = ""         # Holds the current opponent
+		self.teamId = None         # Holds the id of the players current team
+		self.schedule = []         # Holds the team ids of the past schedule of the player
+		self.opponent = Teams.BYE  # Holds the team id of the current opponent
 		self.score = 0             # Holds the final score value for the player
+		self.salary = 0            # Holds the salary of the player, used with a salary cap
+		self.matchup = np.zeros(4) # Holds how this weeks defense compares to the average defense faced
 		self.categories = []       # Holds all of the data categories for the player
+		self.statTable = None      # Holds the stats for each year as numeric columns by category
+		self.gameTable = None      # Holds the stats for each game as numeric columns by category
+		self.projection = None     # Holds the percentiles and boom and bust chances once simulated
 
-	def getData(self, dir):
+	def getData(self):
 		'''This method will make the HTTP request to the website in order to get the
 		appropriate data. This data includes the players statistics going into the
 		current week, as well as the teams that they have faced, and the team they
@@ -42,60 +56,71 @@ class Player(object):
 		# Create the link to the website
 		link = Player.statLink.format(self.name)
 		# Create the request to the webpage
-		webpage = requests.get(link)
-		# Make a temporary file to store the HTML
-		file = open("{0}/{1}.html".format(dir, self.name), "w")
-		# Save the webpage to the file
-		file.write(webpage.text)
-		file.close() # Close the file
+		with Profiler.stage("player fetch", self.name):
+			webpage = Player.transport.get(link)
+		# Extract the data straight from the downloaded page
+		with Profiler.stage("player parse", self.name):
+			self.parseData(webpage.content)
 
-		# Extract the data from the file
-		with open("{0}/{1}.html".format(dir, self.name), 'r') as f:
+	def parseData(self, content):
+		'''This method extracts the players position, game stats and career stats
+		from the content of their NFL.com stats page.'''
 
-			# Create a beautiful soup object to scrape through data
-			soup = BeautifulSoup(f.read(), 'html.parser')
+		# Only build the position header and the table rows from the downloaded page
+		soup = Parser.parse(content, tags = ["span", "tr"])
 
-			# Get the players stats, their position, and column headers from the html
-			position = soup.find_all('span', class_="nfl-c-player-header__position")
+		# Get the players stats, their position, and column headers from the html
+		position = soup.find_all('span', class_="nfl-c-player-header__position")
 
-			# Get all of the total stats associated with the current or previous year
+		# Get all of the total stats associated with the current or previous year
 
-			stats = soup.find_all('tr')     # All of the accumulated stats for the past few year and every week so far in the season
-			self.position = position[0].text.strip()               # Store position of the player
-			# The first line of stats consists of the categories for the weekly games
-			self.gameCategories = [ a.text.strip() for a in stats[0].find_all('th') ]
+		stats = soup.find_all('tr')     # All of the accumulated stats for the past few year and every week so far in the season
+		self.position = position[0].text.strip()               # Store position of the player
+		# The first line of stats consists of the categories for the weekly games
+		self.gameCategories = [ a.text.strip() for a in stats[0].find_all('th') ]
 
-			# Boolean to determine when the total season stats are reached
-			switch_to_career = False
-			# Gather all of the data for the weekly games and the seasons
-			for line in stats[1:-1]:
+		# Boolean to determine when the total season stats are reached
+		switch_to_career = False
+		# Gather all of the data for the weekly games and the seasons
+		for line in stats[1:-1]:
 
-				if (line.th):      # This means it must be the season header
+			if (line.th):      # This means it must be the season header
 	
-					temp = line.find_all('th')
-					self.categories = [ a.text.strip() for a in temp ]
-					switch_to_career = True
+				temp = line.find_all('th')
+				self.categories = [ a.text.strip() for a in temp ]
+				switch_to_career = True
 					
-				elif(not switch_to_career):  # Still working on the week games list above the career stats
+			elif(not switch_to_career):  # Still working on the week games list above the career stats
 
-					temp = line.find_all('td')
-					temp_list = [ a.text.strip() for a in temp ]
-					self.gameStats.append(temp_list)
+				temp = line.find_all('td')
+				temp_list = [ a.text.strip() for a in temp ]
+				self.gameStats.append(temp_list)
 				
-				else:
+			else:
+
+				temp = line.find_all('td')
+				temp_list = [ a.text.strip() for a in temp ]
+				self.stats.append(temp_list)
 
-					temp = line.find_all('td')
-					temp_list = [ a.text.strip() for a in temp ]
-					self.stats.append(temp_list)
+		# Sort the game stats
+		self.sortGameStats() 
+		# Clean the data to get rid of the '@' in the matchups column
+		self.cleanMatchups()
 
-			# Sort the game stats
-			self.sortGameStats() 
-			# Clean the data to get rid of the '@' in the matchups column
-			self.cleanMatchups()
+		# Once the matchups are cleaned, add the teams played to the schedule list
+		for game in self.gameStats:
+			team = Teams.find(game[1])
+			# Skip anything in the column that is not a team
+			if team is not None:
+				self.schedule.append(team)
 
-			# Once the matchups are cleaned, add them to the schedule list
-			for game in self.gameStats:
-				self.schedule.append(game[1])
+		# The latest season holds the team the player is on now
+		if self.stats:
+			self.teamId = Teams.find(self.stats[-1][1])
+
+		# Convert the stats to numeric columns once so scoring and graphing do not have to
+		self.gameTable = StatTable(self.gameCategories, self.gameStats)
+		self.statTable = StatTable(self.categories, self.stats)
 
 	def sortGameStats(self):
 		'''This method will sort the game stats after they are gathered. This is necessary due to the fact that 
@@ -128,68 +153,47 @@ class Player(object):
 			opp = self.gameStats[i][1]
 			if("@" in opp):
 				self.gameStats[i][1] = opp[1:]
-			if(opp == "Football Team"):
-				self.gameStats[i][1] = "Washington"
 
-				
 
-	def getScheduleData(self, dir):
+	def getScheduleData(self):
 		'''This method will get the opponents defenses that the player has faced
 		up until this point'''
 
 		# Create the link to get the games played so far
 		link = Player.scheduleLink.format(self.name)
-		# Make the HTTP request and save it to the file
-		webpage = requests.get(link) # Stores the opponents played against
-		file = open("{0}/{1}.html".format(dir, self.name + "_schedule"), "w")
-		# Save the webpage to the file
-		file.write(webpage.text)
-		file.close() # Close the file
-
-		# Extract the defenses that have been played against
-		with open("{0}/{1}.html".format(dir, self.name + "_schedule"), "r") as f:
-			# Create a BeautifulSoup object to parse the data
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			# Isolate all of the tr elements
-			data = soup.tbody.find_all('tr')
-			# Go through each table in the data and
-			for table in data:
-				# Grab all of the td elements in the table
-				values = table.find_all('td')
-				# Get the 3rd value in the list representing the team faced
-				opp = values[2].text.strip()
-				# Remove the first value of the String if it is an @ symbol
-				if("@" in opp):
-					opp = opp[1:]
-
-				if(opp == 'Football Team'):
-					opp = "Washington"
-				# Append the value into the players schedule
+		# Make the HTTP request
+		with Profiler.stage("player schedule fetch", self.name):
+			webpage = Player.transport.get(link) # Stores the opponents played against
+		# Extract the data straight from the downloaded page
+		with Profiler.stage("player schedule parse", self.name):
+			self.parseScheduleData(webpage.content)
+
+	def parseScheduleData(self, content):
+		'''This method extracts the opponents faced so far from the content of the
+		players NFL.com game log page.'''
+
+		# Only build the body of the game log table from the downloaded page
+		soup = Parser.parse(content, tags = ["tbody"])
+		# Isolate all of the tr elements
+		data = soup.tbody.find_all('tr')
+		# Go through each table in the data and
+		for table in data:
+			# Grab all of the td elements in the table
+			values = table.find_all('td')
+			# Get the 3rd value in the list representing the team faced, an @ in front is ignored
+			opp = Teams.find(values[2].text)
+			# Append the team into the players schedule
+			if opp is not None:
 				self.schedule.append(opp)
 
 
 	def getOpponent(self, dic):
-		'''This method will take in a dictionary holding all of this weeks
-		games and then find the current players opponent of the week'''
-
-
-		opp = "Bye Week"                    # Create a default value for opponent
-		team = self.stats[0].split()[-1]    # Takes the team and separates the city
-		print(team)
-
-		# Account for Washington Football Team
-		if (team == "Team"):
-			team = "Washington"
+		'''This method will take in a dictionary holding the opponent of every
+		team playing this week by team id and then find the current players
+		opponent of the week'''
 
-		# Search through the dictionary
-		for k, v in dic.items():
-			if team in k:     # Team is away this week
-				opp = v
-			elif(team in v):  # Team is home this week
-				opp = k
-
-		# Update the opponent attribute of the player
-		self.opponent = opp
+		# Teams that are not in the dictionary are on a bye
+		self.opponent = dic.get(self.teamId, Teams.BYE)
 
 
 	def calculateScore(self):
@@ -199,32 +203,49 @@ class Player(object):
 		week of the season.'''
 
 		# When the current player is on a bye, give them a zero and exit the function
-		if(self.opponent == "Bye Week"):
+		if(self.opponent == Teams.BYE):
 			self.score = 0
+			self.matchup = np.zeros(4)
+			return
+
+		# Look the matchup up in this weeks matchup matrix when the players team is in it
+		if Matchups.current and Matchups.current.knows(self.teamId):
+			self.matchup = Matchups.current.offenseVsDefense[self.teamId, self.opponent]
+			self.score = len(self.name)
 			return
 
 		# First get the average defense that this player has faced up until now
-		avg_def = [0.0 ,0.0, 0.0, 0.0]
+		avg_def = np.zeros(4)
 		cur_def = Player.defenseRankings[self.opponent] # Get this weeks opponent
 
-		# Go through each of the defenses faced so far
-		for team in self.schedule:
-			# Get the defensive stats of current defense
-			stats = Player.defenseRankings[team]
-			# Add each of the stats to the average defense
-			for i in range(len(stats)):
-				avg_def[i] += float(stats[i])
-
-		# Divide each statistic by the number of teams played
-		for i in range(len(avg_def)):
-			avg_def[i] /= len(self.schedule)
+		# Average the stats of each of the defenses faced so far
+		if self.schedule:
+			avg_def = np.mean([Player.defenseRankings[team] for team in self.schedule], axis = 0)
 
 		# Get the difference between the average defense and the current one
-		diff = [float(cur_def[i]) - avg_def[i] for i in range(4)]
+		diff = cur_def - avg_def
+		self.matchup = diff
 
 		self.score = len(self.name)
 
 
+	def gamePoints(self):
+		'''This method returns the fantasy points the player made in each game of
+		their game log, scored with the points class variable.'''
+
+		points = np.zeros(len(self.gameStats))
+		if self.gameTable is None:
+			return points
+
+		# Add up the points of every column that is worth something
+		weights = Player.points["QB" if self.position == "QB" else "other"]
+		for category, weight in weights.items():
+			if category in self.gameTable:
+				points += weight * self.gameTable.values(category)
+
+		return points
+
+
 	def printPlayer(self):
 		'''This method Takes all of the available data for the current player
 		and prints it to the console neatly.'''
@@ -239,7 +260,7 @@ class Player(object):
 
 		print("\nTEAMS PLAYED: \n")
 		for s in self.schedule:
-			print("\t --> " + s)
+			print("\t --> " + Teams.name(s))
 
 ####################################################
 # STATIC METHODS
@@ -253,47 +274,102 @@ class Player(object):
 		# Go through each of the defenses currently stored
 		for k, v in Player.defenseRankings.items():
 			# Print the team name first
-			print(k + ":\n")
+			print(Teams.name(k) + ":\n")
 			print("   --> Total yds/g: {0} , Passing yds/g: {1} , Rushing yds/g: {2} , Points/g : {3}"
 				  .format(v[0], v[1], v[2], v[3]))
 			print()
 
 
 	@staticmethod
-	def getDefenseRankings(dir):
+	def calculateScores(players):
+		'''This method calculates the score of every player in the list at once.
+		It gives the same results as calling calculateScore on each player, but
+		the average defense faced and this weeks matchup are found for all of the
+		players together with a few NumPy operations. Players whose team is in
+		this weeks matchup matrix use their teams row of the matrix instead.'''
+
+		if not players:
+			return
+
+		# Stats of every defense with one row per team id, the bye week row is all zeros
+		defenses = Matchups.matrix(Player.defenseRankings)
+
+		# Count how many times each player has faced each defense
+		faced = np.zeros((len(players), Teams.count))
+		games = [len(p.schedule) for p in players]
+		rows = np.repeat(np.arange(len(players)), games)
+		cols = np.array([team for p in players for team in p.schedule], dtype = int)
+		np.add.at(faced, (rows, cols), 1)
+
+		# Average defense faced by each player, players with no games faced get zeros
+		avg_def = faced @ defenses / np.maximum(games, 1)[:, None]
+
+		# Get the difference between the average defense and this weeks defense
+		opponents = np.array([p.opponent for p in players], dtype = int)
+		diff = defenses[opponents] - avg_def
+		bye = opponents == Teams.BYE
+
+		# Players on a team in this weeks matchup matrix are a single lookup
+		if Matchups.current:
+			known = [i for i, p in enumerate(players) if Matchups.current.knows(p.teamId)]
+			if known:
+				teams = np.array([players[i].teamId for i in known], dtype = int)
+				diff[known] = Matchups.current.offenseVsDefense[teams, opponents[known]]
+
+		for i, p in enumerate(players):
+			# Players on a bye get a zero the same way calculateScore gives them
+			if bye[i]:
+				p.score = 0
+				p.matchup = np.zeros(4)
+			else:
+				p.matchup = diff[i]
+				p.score = len(p.name)
+
+
+	@staticmethod
+	def getDefenseRankings():
 		'''This method will go through ESPN data and get all passing and rushing
 		stats for all defenses in the NFL. Results will be stored in the instance
 		variable defenseRankings'''
 
+		# Callers asking for the rankings at the same time share one fetch and parse
+		Player.defenseRankings.update(Player.transport.shared(Player.defenseLink, Player.fetchDefenseRankings))
+
+	@staticmethod
+	def fetchDefenseRankings():
+		'''This method fetches and parses the ESPN defense page without changing the
+		defenseRankings class variable. Returns the rankings by team id.'''
+
 		# Make the request to the webpage at ESPN
-		webpage = requests.get(Player.defenseLink)
-		# Create the file to store the resulting webpage
-		file = open("{0}/{1}.html".format(dir, "espn_defenses"), "w")
-		file.write(webpage.text)  # Write the HTML to file
-		file.close()              # Close the file
-
-		# Open the file and extract the data
-		with open("{0}/{1}.html".format(dir, "espn_defenses"), "r") as f:
-			# Create a BeautifulSoup object to parse the data
-			soup = BeautifulSoup(f.read(), 'html.parser')
-			# Get all of the tables that store the teams defense data
-			tables = soup.find_all('tr', class_ = "Table__TR--sm")
-
-			# Go through the tables and add name and data to the Player.defenseRankings
-			for i in range(32):
-				# Get the team name
-				team_name = tables[i].text.split()[-1]
-				# Get the correct data
-				temp_list = []     # Used to store the relevant data
-				# Get the data for the team as a list
-				temp_data = tables[i+32].find_all('div')
-				# Add correct data to the list
-				temp_list.append(temp_data[2].text)
-				temp_list.append(temp_data[4].text)
-				temp_list.append(temp_data[6].text)
-				temp_list.append(temp_data[8].text)
-				# Add the list and the team name to the dictionary
-				Player.defenseRankings[team_name] = temp_list
+		with Profiler.stage("league fetch", "defense rankings"):
+			webpage = Player.transport.get(Player.defenseLink)
+		# Extract the data straight from the downloaded page
+		with Profiler.stage("league parse", "defense rankings"):
+			return Player.parseDefenseRankings(webpage.content, {})
+
+	@staticmethod
+	def parseDefenseRankings(content, rankings = None):
+		'''This method extracts the stats of every defense in the league from the
+		content of the ESPN defense page into the rankings given, the defenseRankings
+		class variable when none are given. Returns the rankings.'''
+
+		if rankings is None:
+			rankings = Player.defenseRankings
+
+		# Only build the rows of the defense tables from the downloaded page
+		soup = Parser.parse(content, tags = ["tr"], classes = ["Table__TR--sm"])
+		# Get all of the tables that store the teams defense data
+		tables = soup.find_all('tr', class_ = "Table__TR--sm")
+
+		# Go through the tables and add team id and data to the rankings
+		for i in range(32):
+			# Get the id of the team from its name
+			team_name = Teams.find(tables[i].text)
+			# Get the data for the team as a list
+			temp_data = tables[i+32].find_all('div')
+			# Add the correct columns as numbers and the team name to the dictionary
+			rankings[team_name] = StatTable.toArray([temp_data[j].text for j in (2, 4, 6, 8)])
 
 		# Add a entry for a bye week
-		Player.defenseRankings["Bye Week"] = [0.0, 0.0, 0.0, 0.0]
+		rankings[Teams.BYE] = np.zeros(4)
+		return rankings
@@ -0,0 +1,119 @@
+import contextlib
+import json
+import threading
+import time
+
+
+class Profiler(object):
+    '''This class records the wall time and CPU time spent in each stage of a
+    run, for every player and defense. Stages are timed by wrapping them in
+    Profiler.stage, which does nothing unless profiling has been turned on.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    enabled = False                    # Used to determine whether or not stages are recorded
+    records = []                       # Holds (stage, entity, start, wall, cpu, thread) for every timed stage
+    lock = threading.Lock()            # Guards the records while stages run concurrently
+    start = 0.0                        # Time profiling was turned on, used as the start of the trace
+    nothing = contextlib.nullcontext() # Returned by stage when profiling is turned off
+
+
+    @staticmethod
+    def enable():
+        '''Turns profiling on and clears any earlier records.'''
+
+        Profiler.enabled = True
+        Profiler.records = []
+        Profiler.start = time.perf_counter()
+
+
+    @staticmethod
+    def stage(name, entity = ""):
+        '''Returns a context manager that times the stage for the entity given,
+        such as a players name. Costs nothing when profiling is turned off.'''
+
+        if not Profiler.enabled:
+            return Profiler.nothing
+
+        return Timer(name, entity)
+
+
+    @staticmethod
+    def record(name, entity, start, wall, cpu):
+        '''Stores the timing of a single stage.'''
+
+        with Profiler.lock:
+            Profiler.records.append((name, entity, start, wall, cpu, threading.get_ident()))
+
+
+    @staticmethod
+    def summary():
+        '''Returns the total count, wall time, CPU time and slowest entity for each
+        stage, sorted from the most to the least wall time.'''
+
+        stages = {}
+        for name, entity, start, wall, cpu, thread in Profiler.records:
+            s = stages.setdefault(name, {"count": 0, "wall": 0.0, "cpu": 0.0, "max": 0.0, "slowest": ""})
+            s["count"] += 1
+            s["wall"] += wall
+            s["cpu"] += cpu
+            if wall >= s["max"]:
+                s["max"] = wall
+                s["slowest"] = entity
+
+        return sorted(stages.items(), key = lambda s: s[1]["wall"], reverse = True)
+
+
+    @staticmethod
+    def printSummary():
+        '''Prints the time spent in each stage to the console, slowest stage first.
+        Wall times of stages that ran concurrently overlap, so they can add up to
+        more than the length of the run.'''
+
+        print("\nProfile ({0:.3f}s total):\n".format(time.perf_counter() - Profiler.start))
+        print("  {0:<24}{1:>7}{2:>11}{3:>11}{4:>11}   {5}".format("stage", "count", "wall(s)", "cpu(s)", "max(s)", "slowest"))
+
+        for name, s in Profiler.summary():
+            print("  {0:<24}{1:>7}{2:>11.3f}{3:>11.3f}{4:>11.3f}   {5}"
+                  .format(name, s["count"], s["wall"], s["cpu"], s["max"], s["slowest"]))
+        print()
+
+
+    @staticmethod
+    def saveTrace(file):
+        '''Saves every recorded stage as a JSON trace that can be opened in
+        chrome://tracing or Perfetto.'''
+
+        events = []
+        for name, entity, start, wall, cpu, thread in Profiler.records:
+            events.append({"name": name, "cat": "stage", "ph": "X", "pid": 0, "tid": thread,
+                           "ts": (start - Profiler.start) * 1e6, "dur": wall * 1e6,
+                           "args": {"entity": entity, "cpu": cpu}})
+
+        with open(file, "w") as f:
+            json.dump({"traceEvents": events}, f)
+
+
+class Timer(object):
+    '''Context manager used by Profiler.stage to time a single stage.'''
+
+    def __init__(self, name, entity):
+
+        self.name = name      # Name of the stage being timed
+        self.entity = entity  # Player, defense or table the stage is working on
+
+
+    def __enter__(self):
+
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()  # CPU time of this thread only, so concurrent stages are not mixed up
+        return self
+
+
+    def __exit__(self, *exc):
+
+        Profiler.record(self.name, self.entity, self.wall,
+                        time.perf_counter() - self.wall, time.thread_time() - self.cpu)
+        return False
@@ -1,10 +1,16 @@
 import os
-import requests
 import sys
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from Defense import Defense
 from Player import Player
-from Grapher import Grapher
+from Transport import Transport
+from Parser import Parser
+from Profiler import Profiler
+from Teams import Teams
+from Matchups import Matchups
+from Lineup import Lineup
+from Snapshot import Snapshot
+from Simulation import Simulation
 
 
 class Scraper(object):
@@ -17,33 +23,46 @@ class Scraper(object):
 
     # Used to get the current week that will be used for all Scraper objects
     gameLink = "https://www.espn.com/nfl/schedule"
-    directory = "search"  # Directory used when searching for a single player or defense
 
     weekNumber = -1   # Used to store the current week number, default -1
     scraperCount = 0  # Used to count number of scrapers being used at once
+    maxWorkers = 8    # Default limit on the number of pages fetched at the same time
 
-    schedule = {}     # Stores all of the matchups for the week
+    schedule = {}     # Stores all of the matchups for the week as away team id to home team id
+    matchups = {}     # Stores the opponent of every team playing this week by team id
+    transport = None  # HTTP transport shared by the Scraper, Player and Defense classes
+    snapshot = None   # Snapshots of the players parsed data, None parses every player every run
+    store = None      # Database every week of data is saved to, None when nothing is stored
+    offline = False   # True when players are loaded from the store instead of scraped
+    simulation = None # Simulates the range of outcomes of every player, None only gives the score
 
 
-    def __init__(self, file = None):
+    def __init__(self, file = None, workers = None, transport = None, slots = None, cap = None):
 
         # Initialize all of the variables associated with the scraper objects
         self.players = []          # Holds all of the players in the Fantasy team
         self.defense = []          # Holds all of the Defenses in the Fantasy team
         self.team = {}             # Holds the resulting team of players
+        self.slots = slots         # Roster slots to fill in the lineup, None uses the Lineup default
+        self.cap = cap             # Salary cap for the starting lineup, None for no cap
+        self.lineup = None         # Holds the best starting lineup once the team is sorted
+        # Holds the number of players or defenses that can be fetched at once
+        self.workers = workers if workers else Scraper.maxWorkers
+
+        # Use the transport given, otherwise share one pooled transport between all scrapers
+        if transport:
+            Scraper.useTransport(transport)
+        elif not Scraper.transport:
+            Scraper.useTransport(Transport(poolSize = self.workers))
 
         Scraper.scraperCount += 1  # Increment the count class variable
         # Used to name each team in case multiple scrap objects exist
         self.teamName = "Team_{0}".format(Scraper.scraperCount)
-        # Create a temp directory to store data for each scraper object
-        self.tempDir = "temp_{0}".format(Scraper.scraperCount)
-        # Create the data directory that is associated with this Scraper
-        Scraper.makeDataDirectory(self.tempDir)
 
-        # Create data directory and update the current week when first Scraper is created
+        # Update the current week when first Scraper is created
         if (Scraper.weekNumber == -1):
             # Get the current weeks schedule
-            Scraper.getCurrentWeek(self.tempDir)
+            Scraper.getCurrentWeek()
 
         # If the user entered a file then load it here
         if file:
@@ -59,50 +78,229 @@ class Scraper(object):
             print("ERROR: The file you entered does not exit")
             sys.exit()
 
-        # open players file and cycle through each line until the end
+        # open players file and load each line until the end
         with open(filename, 'r') as reader:
-            for line in reader:
-                # Check if the current line in the file is a player or a defense
-                if(line[0:7] != "defense"):
-                    # Create a new player and add them to the players list
-                    newPlayer = Player(line.rstrip())
-                    self.players.append(newPlayer)
-                else:
-                    # Create a new Defense and add them to the defense list
-                    newDefense = Defense(line[9:].rstrip())
-                    self.defense.append(newDefense)
+            try:
+                self.loadLines(reader)
+            except ValueError as e:
+                print("ERROR: {0} in {1}".format(e, filename))
+                sys.exit()
+
+
+    def loadLines(self, lines):
+        '''This method will load the players and defenses from the lines of a
+        players file, one player or defense on each line. Raises a ValueError
+        naming the line when its salary is not a whole number.'''
+
+        for number, line in enumerate(lines, 1):
+            # Skip any blank lines
+            if(not line.strip()):
+                continue
+
+            # A salary can follow the name after a comma, used with a salary cap
+            salary = 0
+            if("," in line):
+                name, salary = line.rsplit(",", 1)
+                # Salaries are plain whole numbers, so '$9000' and '9,000' are both mistakes
+                if not salary.strip().isdigit() or "," in name:
+                    raise ValueError("Bad salary on line {0} '{1}', expected a name and a whole number like "
+                                     "'patrick-mahomes, 9000'".format(number, line.strip()))
+                line, salary = name, int(salary.strip())
+
+            # Check if the current line in the file is a player or a defense
+            if(line[0:7] != "defense"):
+                # Create a new player and add them to the players list
+                newPlayer = Player(line.strip())
+                newPlayer.salary = salary
+                self.players.append(newPlayer)
+            else:
+                # Create a new Defense and add them to the defense list
+                newDefense = Defense(line[9:].strip())
+                newDefense.salary = salary
+                self.defense.append(newDefense)
 
 
     def getPlayerData(self):
         '''This method will use the previously loaded players to make get
-        requests to NFL.com in order to retrieve the HTML'''
-
-        # Get the current defense stats and upcoming schedule
-        Player.getDefenseRankings(self.tempDir)
-
-        # Go through each player
-        for player in self.players:
-            # Get data for players
-            player.getData(self.tempDir)          # Gather all of the players stats
-            player.getScheduleData(self.tempDir)  # Get the opponents faced so far
-            player.getOpponent(Scraper.schedule)  # Get upcoming opponent
-            player.calculateScore()               # Calculate the final Fantasy score
+        requests to NFL.com in order to retrieve the HTML. Up to self.workers
+        players are fetched at the same time, and every player is scored
+        together once all of their pages have been parsed. Players that can not
+        be fetched are reported and left out.'''
+
+        with ThreadPoolExecutor(max_workers = self.workers) as pool:
+            # Get this weeks league data while the players are being fetched
+            league = pool.submit(Scraper.getLeagueData, self.workers)
+            # Start fetching every player at once
+            futures = {pool.submit(Scraper.fetchPlayer, p): p for p in self.players}
+
+            # Go through each player as soon as their data arrives
+            failed = []
+            for future in as_completed(futures):
+                try:
+                    player = future.result()
+                except Exception as e:
+                    print("ERROR: could not fetch {0}: {1}".format(futures[future].name, e))
+                    failed.append(futures[future])
+                    continue
+                player.getOpponent(Scraper.matchups)  # Get upcoming opponent
+
+            league.result()  # Scoring needs the defense rankings and matchups
+
+        self.players = [p for p in self.players if p not in failed]
+
+        # Calculate the final Fantasy score of every player at once
+        with Profiler.stage("player score", "{0} players".format(len(self.players))):
+            Player.calculateScores(self.players)
+
+        # Simulate the range of outcomes of every player once they are scored
+        if Scraper.simulation:
+            with Profiler.stage("simulation", "{0} players".format(len(self.players))):
+                Scraper.simulation.run(self.players)
 
 
     def getDefenseData(self):
         '''This method will go through the list of available defenses and
         call the appropriate methods in order to get all of the data for
-        each defense.'''
+        each defense. The schedule of every team is gathered with this weeks
+        league data, and the league tables are only gathered once for all of them.
+        Defenses that can not be found are reported and left out.'''
+
+        with ThreadPoolExecutor(max_workers = self.workers) as pool:
+            # Get this weeks league data and the league defense tables at the same time
+            league = pool.submit(Scraper.getLeagueData, self.workers)
+            tables = pool.submit(Defense.getLeagueTables)
+            league.result()  # Every teams schedule is gathered with the league data
+            tables.result()  # Looking up the defense needs the league tables
+
+        # Score each defense from the data gathered for the whole league
+        for d in list(self.defense):
+            try:
+                Matchups.current.setSchedule(d)  # Gets all of the offenses already played
+            except LookupError as e:
+                print("ERROR: could not find {0}: {1}".format(d.team, e))
+                self.defense.remove(d)
+                continue
+            d.getData()                      # Gets all of the general data
+            with Profiler.stage("defense score", d.team):
+                d.calculateScore()           # Calculate the Fantasy score of the defense
 
-        # Get the general offense data
-        Defense.getOffenseRankings(self.tempDir)
 
-        # Cycle through each defense and get the data
-        for d in self.defense:
-            # Get the data for the defense
-            d.getData(self.tempDir)           # Gets all of the general data
-            d.getSchedule(self.tempDir)       # Gets all of the offenses already played
-            d.calculateScore()                # Calculate the Fantasy score of the defense
+    @staticmethod
+    def fetchPlayer(player):
+        '''Gathers and parses all of the pages for a single player. Used as
+        the unit of work that is run concurrently by getPlayerData.'''
+
+        # Load the player from the database when scoring a stored week
+        if Scraper.offline:
+            Scraper.store.loadPlayer(player)
+            return player
+
+        # Only parse the pages again when they changed since the last snapshot
+        if Scraper.snapshot:
+            Scraper.snapshot.update(player, Scraper.weekNumber)
+            return player
+
+        player.getData()          # Gather all of the players stats
+        player.getScheduleData()  # Get the opponents faced so far
+        return player
+
+
+    @staticmethod
+    def fetchDefense(defense):
+        '''Gathers and parses the schedule page for a single team. Used as
+        the unit of work that is run concurrently by getLeagueData.'''
+
+        defense.getSchedule()  # Gets all of the offenses already played
+        return defense
+
+
+    @staticmethod
+    def getLeagueData(workers = None):
+        '''Gathers the offense and defense rankings, the league defense tables and
+        the schedule of every team in the league, then builds the matchup matrix
+        for the current week. This is only done once per week, every scraper
+        scoring that week shares it. Teams whose schedule can not be gathered are
+        left out of the matrix.'''
+
+        with Matchups.lock:
+            # The matchups for this week have already been built
+            if Scraper.weekNumber in Matchups.weeks:
+                Matchups.current = Matchups.weeks[Scraper.weekNumber]
+                return
+
+            # The current week was already gathered when the scraper was created
+            Scraper.useLeague(Scraper.fetchLeague(workers, (Scraper.weekNumber, dict(Scraper.schedule))))
+
+
+    @staticmethod
+    def collectSchedules(futures):
+        '''Waits for the schedule of every team being fetched and returns them by
+        team id. A team whose schedule can not be gathered is reported and left
+        out, so it stays unknown to the matchups and its players are scored from
+        their own schedule instead.'''
+
+        schedules = {}
+        for future, team in futures.items():
+            try:
+                future.result()
+                schedules[team.teamId] = team.schedule
+            except Exception as e:
+                print("WARNING: could not gather the schedule of the {0}: {1}".format(team.team, e))
+
+        return schedules
+
+
+    @staticmethod
+    def fetchLeague(workers = None, current = None):
+        '''Gathers all of the league data for a week without changing the league
+        data in use, so a failed fetch leaves it untouched. The week is given as
+        its number and games, the current week is gathered when none is given.
+        Returns the data as a dictionary that useLeague swaps in. Callers asking
+        for the same page at the same time share one fetch and parse.'''
+
+        week, games = current if current else Scraper.transport.shared(Scraper.gameLink, Scraper.fetchCurrentWeek)
+
+        # Every team in the league, used to gather their schedules
+        teams = [Defense(Teams.name(i)) for i in range(Teams.BYE)]
+
+        with ThreadPoolExecutor(max_workers = workers if workers else Scraper.maxWorkers) as pool:
+            defense = pool.submit(Player.transport.shared, Player.defenseLink, Player.fetchDefenseRankings)
+            offense = pool.submit(Defense.transport.shared, Defense.offenseLink, Defense.fetchOffenseRankings)
+            tables = pool.submit(Defense.transport.shared, Defense.defenseLink, Defense.fetchLeagueTables)
+            schedules = Scraper.collectSchedules({pool.submit(Scraper.fetchDefense, d): d for d in teams})
+            # Scoring needs the rankings and tables, so any error gathering them is raised
+            league = {"week": week, "games": games, "defenseRankings": defense.result(),
+                      "offenseRankings": offense.result(), "tables": tables.result()}
+
+        # Both directions of every game, the same way useWeek stores them
+        opponents = dict(games)
+        opponents.update({home: away for away, home in games.items()})
+        with Profiler.stage("matchup matrix", "week {0}".format(week)):
+            league["matchups"] = Matchups(week, league["defenseRankings"], league["offenseRankings"],
+                                          schedules, opponents)
+
+        return league
+
+
+    @staticmethod
+    def useLeague(league):
+        '''Replaces the league data in use with the data gathered by fetchLeague.
+        The caller holds whichever lock keeps scoring away from the data meanwhile.'''
+
+        Scraper.useWeek(league["week"], league["games"])
+
+        Player.defenseRankings.clear()
+        Player.defenseRankings.update(league["defenseRankings"])
+        Defense.offenseRankings.clear()
+        Defense.offenseRankings.update(league["offenseRankings"])
+
+        Matchups.use(league["matchups"])
+
+        tables, categories = league["tables"]
+        Defense.Alldata.clear()
+        Defense.Alldata.update(tables)
+        Defense.dataCategories[:] = categories
+        Defense.tablesLoaded = True
 
 
     def getAllData(self):
@@ -119,16 +317,63 @@ class Scraper(object):
         self.getDefenseData()
         print("Done")
 
-        # Delete all of the temporary files created
-        print("Deleting all temporary files created")
-        Scraper.deleteDataDirectory(self.tempDir)
-        print("Done")
-        
+        # Keep the weeks data for later runs
+        self.storeWeek()
+
+        # Show how many connections were saved by the transport
+        Scraper.printStats()
+
+
+    def storeWeek(self):
+        '''This method saves the players and the league data gathered this week
+        to the store, when one is used.'''
+
+        # A week loaded from the store is already in it
+        if Scraper.store and not Scraper.offline:
+            with Profiler.stage("store save", "week {0}".format(Scraper.weekNumber)):
+                Scraper.store.saveWeek(self.players, Snapshot.season(), Scraper.weekNumber, Scraper.schedule)
+
+
+    def graph(self, directory = None, formats = None):
+        '''This method saves the charts of every player and defense to the directory
+        given, rendering them in parallel without opening any windows.'''
+
+        if not directory:
+            directory = os.path.join("graphs", "Week{0}_{1}".format(Scraper.weekNumber, self.teamName))
+        # Matplotlib is slow to import, so it is only loaded when charts are drawn
+        from Grapher import Grapher
+        from ChartCache import ChartCache
+
+        # Only render the plots whose data changed since they were last rendered
+        if not Grapher.cache:
+            try:
+                Grapher.cache = ChartCache()
+            except OSError as e:
+                print("WARNING: rendering every plot without the chart cache: {0}".format(e))
+
+        with Profiler.stage("graph", "{0} charts".format(len(self.players) + len(self.defense))):
+            files = Grapher.renderAll(self.players, self.defense, Player.defenseRankings, Defense.offenseRankings,
+                                      directory, formats)
+        print("Saved {0} charts to {1}".format(len(files), directory))
+
 
     def printTeam(self):
         '''This method will order the players and defenses in order to determine
         which are the best to start this week.'''
 
+        # Show the best starting lineup first
+        if self.lineup:
+            print("\n\nStarting Lineup:\n")
+            for slot, x in self.lineup.starters:
+                print("\t{0:<5} {1} : {2}".format(slot, Lineup.label(x), x.score))
+            print("\n\tTotal score: {0}".format(self.lineup.score))
+            if self.cap is not None:
+                print("\tTotal salary: {0} of {1}".format(self.lineup.salary, self.cap))
+
+            print("\nBench:\n")
+            for x in self.lineup.bench:
+                print("\t-" + Lineup.label(x) + " : " + str(x.score))
+
         print("\n\nFinalized Team:\n\n")
         print("Offensive PLayers:\n")
 
@@ -137,6 +382,9 @@ class Scraper(object):
             print(k)
             for p in v:
                 print("\t-" + p.name + " : " + str(p.score))
+                # Show the range of outcomes when the players were simulated
+                if p.projection:
+                    print("\t    " + Simulation.describe(p.projection))
 
         print("\nDefensive Teams:\n")
         # Go through the defense and print the sorted defenses
@@ -148,44 +396,29 @@ class Scraper(object):
 
     def sort(self):
         '''This method is used to sort the players and defenses in order of their
-        Fantasy points.'''
-
-        # First organize all of the players by position
-        players = {} # Create a dictionary to hold all of the players by position
-    
-        # Go through each player and add them to the dictionary
-        for p in self.players:
-            if p.position in players:
-                players[p.position].append(p)
-            else:
-                players[p.position] = [p]
-
-        # Sort each of the lists
-        for k, v in players.items():
-
-            sorted = False
-            while(not sorted):
-                sorted = True
-                for i in range(len(v) - 1):
-                    if(v[i].score < v[i+1].score):
-                        temp = v[i+1]
-                        v[i+1] = v[i]
-                        v[i] = temp
-                        sorted = False
-
-        # Set the team attribute to this sorted dictionary
-        self.team = players
-
-        sorted = False
-        # Sort the defenses
-        while(not sorted):
-            sorted = True
-            for i in range(len(self.defense) - 1):
-                if(self.defense[i] < self.defense[i + 1]):
-                    temp = self.defense[i+1]
-                    self.defense[i + 1] = self.defense[i]
-                    self.defense[i] = temp
-                    sorted = False
+        Fantasy points, and then pick the starting lineup with the highest total
+        score that fills the roster slots.'''
+
+        with Profiler.stage("sort"):
+            # First organize all of the players by position
+            players = {} # Create a dictionary to hold all of the players by position
+
+            # Go through each player and add them to the dictionary
+            for p in self.players:
+                players.setdefault(p.position, []).append(p)
+
+            # Set the team attribute to the lists sorted from the highest score to the lowest
+            self.team = {k: Lineup.ranked(v) for k, v in players.items()}
+            # Sort the defenses
+            self.defense = Lineup.ranked(self.defense)
+
+        # Pick the best starting lineup
+        with Profiler.stage("lineup"):
+            try:
+                self.lineup = Lineup(self.players, self.defense, self.slots, self.cap)
+            except ValueError as e:
+                print("ERROR: " + str(e))
+                self.lineup = None
 
 
     def save(self, file):
@@ -201,6 +434,12 @@ class Scraper(object):
         with open(loc, "w") as f:
             # Start with a header
             f.write("Fantasy Team for week {0}".format(Scraper.weekNumber))
+            # Write the starting lineup
+            if self.lineup:
+                f.write("\n\nStarting Lineup:\n\n")
+                for slot, x in self.lineup.starters:
+                    f.write("  {0:<5} {1} , score = {2}\n".format(slot, Lineup.label(x), x.score))
+                f.write("\nTotal score = {0}\n".format(self.lineup.score))
             # Write the players in by position
             f.write("\n\nPlayers:\n\n")
             # Cycle through each of the position and the players and write to file
@@ -208,6 +447,8 @@ class Scraper(object):
                 f.write("{0}:\n".format(k))
                 for p in v:
                     f.write("  - {0} , score = {1}\n".format(p.name, p.score))
+                    if p.projection:
+                        f.write("      {0}\n".format(Simulation.describe(p.projection)))
 
             f.write("\nDefenses:\n")
             # Write in the Defenses
@@ -227,44 +468,6 @@ class Scraper(object):
         for d in self.defense:
             print("  --> " + d.team)
 
-    @staticmethod
-    def makeDataDirectory(dir):
-        '''This method creates a temporary data directory to be used to
-        store HTML files collected throughout the scraping process'''
-
-        # Create the path for the directory in the current directory
-        directory = dir
-        current = os.getcwd()
-        path = os.path.join(current, directory)
-
-        # Try to make the directory, error if it already exists
-        try:
-            os.mkdir(path)
-        except OSError as e:  # Directory already exists
-            print("Data directory is already created")
-
-
-    @staticmethod
-    def deleteDataDirectory(dir):
-        '''This method deletes all of the temporary files in the data
-        directory and then deletes the data directory. This method should
-        be called at the end of the scraping process'''
-
-        # Get the path of the data directory
-        data = dir
-        current = os.getcwd()
-        path = os.path.join(current, data)
-        # list all of the files within the directory
-        files = os.listdir(path)
-
-        # Cycle through the files and delete them
-        for f in files:
-            os.remove(os.path.join(path, f))
-
-        # Remove the entire Directory
-        os.rmdir(path)
-
-
     def printCurrentData(self):
         '''This method is used as a simple tool to check on the data at any
         point during operations.'''
@@ -308,7 +511,7 @@ class Scraper(object):
 
         print("\nThis Week's NFL Schedule\n")
         for k, v in Scraper.schedule.items():
-            print("  - " + k + " @ " + v)
+            print("  - " + Teams.name(k) + " @ " + Teams.name(v))
             print()
 
 ######################################################################
@@ -317,34 +520,118 @@ class Scraper(object):
 
 
     @staticmethod
-    def getCurrentWeek(dir):
-        '''This method takes in a directory name and gathers both the current
-        week number in the NFL and the current matchups this week.'''
+    def useTransport(transport):
+        '''This method shares a single Transport between the Scraper, Player and
+        Defense classes so that every request uses the same pool of connections.'''
+
+        Scraper.transport = transport
+        Player.transport = transport
+        Defense.transport = transport
+
+
+    @staticmethod
+    def printStats():
+        '''This method prints how many connections, cached pages and player
+        snapshots were reused during the run.'''
+
+        Scraper.transport.printStats()
+        if Scraper.snapshot:
+            Scraper.snapshot.printStats()
+
+
+    @staticmethod
+    def getCurrentWeek():
+        '''This method gathers both the current
+        week number in the NFL and the current matchups this week. Callers asking
+        for the week at the same time share one fetch and parse.'''
+
+        Scraper.useWeek(*Scraper.transport.shared(Scraper.gameLink, Scraper.fetchCurrentWeek))
+
+
+    @staticmethod
+    def fetchCurrentWeek():
+        '''This method fetches and parses the ESPN schedule page. Returns the week
+        number and its games as away team id to home team id.'''
+
         # Make the request to ESPN
-        webpage = requests.get(Scraper.gameLink)
-        # Create and open the file
-        file = open("{0}/{1}.html".format(dir, Player.scheduleLoc), "w")
-        file.write(webpage.text)  # Write the html to the file
-        file.close()              # Close the file
-
-        # Open the file and het the current week number
-        with open("{0}/{1}.html".format(dir, Player.scheduleLoc), "r") as f:
-            # Create a beautiful soup object
-            soup = BeautifulSoup(f.read(), 'html.parser')
-            # Get the dropdown menu that selects each weeks schedule
-            dropdown = soup.find('div', class_="dropdown-type-week")
-            # Extract from dropwdown the current week option
-            weekOption = dropdown.find(selected="selected")
-            # Update the class attribute that holds the current week
-            Scraper.weekNumber = weekOption.text.split()[1]
-
-            # Get all of the teams matchups for the week
-            matchups = soup.find_all('a', class_="team-name")
-            # Cycle through each game and get the away and home teams
-            for i in range(0, len(matchups), 2):
-                away = matchups[i].abbr.get('title').split()[-1]
-                home = matchups[i+1].abbr.get('title').split()[-1]
-                Scraper.schedule[away] = home
+        with Profiler.stage("league fetch", "schedule"):
+            webpage = Scraper.transport.get(Scraper.gameLink)
+        # Extract the data straight from the downloaded page
+        with Profiler.stage("league parse", "schedule"):
+            return Scraper.parseCurrentWeek(webpage.content)
+
+
+    @staticmethod
+    def useWeek(week, games):
+        '''This method makes the week and its games, away team id to home team id,
+        the current week and matchups.'''
+
+        Scraper.weekNumber = week
+        Scraper.schedule.clear()
+        Scraper.matchups.clear()
+        for away, home in games.items():
+            Scraper.schedule[away] = home
+            # Store both directions so each teams opponent is a single lookup
+            Scraper.matchups[away] = home
+            Scraper.matchups[home] = away
+
+
+    @staticmethod
+    def resetLeagueData():
+        '''This method forgets the current week and all of the league data gathered
+        for it, so that the next scraper gathers everything again.'''
+
+        Scraper.weekNumber = -1
+        Scraper.schedule.clear()
+        Scraper.matchups.clear()
+        Matchups.weeks.clear()
+        Defense.Alldata.clear()
+        Defense.dataCategories.clear()
+        Defense.tablesLoaded = False
+
+
+    @staticmethod
+    def loadStoredWeek(season = None, week = None):
+        '''This method loads a week of league data from the store instead of the
+        web, the newest week stored when none is given. Every player is then
+        loaded from the store as well, so nothing is scraped.'''
+
+        if season is None or week is None:
+            latest = Scraper.store.latestWeek()
+            if not latest:
+                raise LookupError("No weeks are stored in {0}".format(Scraper.store.path))
+            season, week = latest
+
+        Scraper.resetLeagueData()
+        Scraper.useWeek(str(week), Scraper.store.loadLeague(season, week))
+
+        Scraper.offline = True
+
+
+    @staticmethod
+    def parseCurrentWeek(content):
+        '''This method extracts the current week number and this weeks matchups
+        from the content of the ESPN schedule page. Returns the week and its games
+        as away team id to home team id.'''
+
+        # Only build the week dropdown and the team names from the downloaded page
+        soup = Parser.parse(content, classes = ["dropdown-type-week", "team-name"])
+        # Get the dropdown menu that selects each weeks schedule
+        dropdown = soup.find('div', class_="dropdown-type-week")
+        # Extract from dropwdown the current week option
+        weekOption = dropdown.find(selected="selected")
+        week = weekOption.text.split()[1]
+
+        # Get all of the teams matchups for the week
+        matchups = soup.find_all('a', class_="team-name")
+        games = {}
+        # Cycle through each game and get the away and home teams
+        for i in range(0, len(matchups), 2):
+            away = Teams.find(matchups[i].abbr.get('title'))
+            home = Teams.find(matchups[i+1].abbr.get('title'))
+            games[away] = home
+
+        return week, games
 
 
     @staticmethod
@@ -353,16 +640,18 @@ class Scraper(object):
 
         # Create the player object
         player = Player(playerName)
+        # Make sure there is a transport to make the requests with
+        if not Scraper.transport:
+            Scraper.useTransport(Transport())
 
         # Use try block to catch misspelled names here
         try:
-            Scraper.makeDataDirectory(Scraper.directory)   # Create the temporary data directory
-            Player.getDefenseRankings(Scraper.directory)   # Static function that gets all of the defenses and there rankings
-            player.getData(Scraper.directory)              # Get the players data
-            player.printPlayer()                           # Prints the players stats to the terminal 
-            Scraper.deleteDataDirectory(Scraper.directory) # Delete the temporary data dictionary
+            Player.getDefenseRankings()   # Static function that gets all of the defenses and there rankings
+            player.getData()              # Get the players data
+            player.printPlayer()          # Prints the players stats to the terminal 
 
             # Use a Grapher to show the graphs for the player being searched
+            from Grapher import Grapher
             Grapher.graphSinglePlayer(player, Player.defenseRankings)
 
         except Exception as e:
@@ -375,18 +664,20 @@ class Scraper(object):
 
         # Create the Defense object
         defense = Defense(defenseName)
+        # Make sure there is a transport to make the requests with
+        if not Scraper.transport:
+            Scraper.useTransport(Transport())
 
         # Use a try catch block to catch misspelled names and errors
         try:
-            Scraper.makeDataDirectory(Scraper.directory)     # Create the temporary data directory
             print("Before offensive rankings")
-            Defense.getOffenseRankings(Scraper.directory)    # Get all of the offensive rankings for the league
+            Defense.getOffenseRankings()    # Get all of the offensive rankings for the league
             print("After offensive rankings")
-            defense.getData(Scraper.directory)               # Get the defenses data
+            Defense.getLeagueTables()       # Get the defense tables for the league
+            defense.getData()               # Get the defenses data
             print("After get data")
-            #defense.printDefense()                           # Print the current defence to the terminal
-            #defense.getSchedule(Scraper.directory)           # Get the opponents played up until this point
-            Scraper.deleteDataDirectory(Scraper.directory)   # Delete the temporary data directory
+            #defense.printDefense()          # Print the current defence to the terminal
+            #defense.getSchedule()           # Get the opponents played up until this point
 
             # Use the Grapher to graph the current defense
             #Grapher.graphSingleDefense(defense, Defense.offenseRankings)
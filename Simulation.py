@@ -0,0 +1,124 @@
+import numpy as np
+from Player import Player
+from Teams import Teams
+
+
+class Simulation(object):
+    '''This class simulates the range of fantasy points each player could make
+    this week. The points a player made in each game of their game log give the
+    average and spread of their outcomes, the average is adjusted by how many
+    points this weeks defense gives up compared to the rest of the league, and
+    thousands of trials are drawn for every player at once from a gamma
+    distribution with that average and spread. The trials give the percentiles
+    of each players outcomes and the chance they boom or bust.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    trials = 20000                 # Default number of trials drawn for each player
+    maxDraws = 50 * 1000 * 1000    # Most trials drawn in a single run, fewer trials are drawn for huge rosters
+    chunkSize = 2 * 1000 * 1000    # Most trials held in memory at once
+    minSpread = 0.25               # Smallest spread allowed, as a share of the average, for players with few games
+    adjustmentRange = (0.5, 1.5)   # Limits of the matchup adjustment to the average
+
+    percentiles = [10, 25, 50, 75, 90]  # Percentiles of each players outcomes that are reported
+
+    # Fantasy points at or above which a game is a boom and below which it is a bust, by position
+    boom = {"QB": 25, "RB": 20, "WR": 20, "TE": 15}
+    bust = {"QB": 12, "RB": 6, "WR": 6, "TE": 4}
+
+
+    def __init__(self, trials = None, seed = None):
+
+        self.trials = trials if trials else Simulation.trials
+        self.seed = seed                          # Seed of the random numbers, None for a different run every time
+        self.rng = np.random.default_rng(seed)    # Random numbers used for every trial
+
+
+    def run(self, players):
+        '''Simulates every player given and stores the results in the projection
+        of each player.'''
+
+        if not players:
+            return
+
+        # Keep huge rosters within the budget of trials for a single run
+        trials = max(1, min(self.trials, Simulation.maxDraws // len(players)))
+
+        mean, spread = Simulation.distribution(players)
+        mean = mean * Simulation.adjustment(players)
+        spread = np.maximum(spread, Simulation.minSpread * mean)
+
+        # Players on a bye or without any points always make zero
+        playing = (mean > 0) & np.array([p.opponent != Teams.BYE for p in players])
+        safeMean = np.where(playing, mean, 1.0)
+        safeSpread = np.where(playing, np.maximum(spread, 1e-6), 1.0)
+
+        # A gamma distribution with the same average and spread, which never goes below zero
+        shape = (safeMean / safeSpread) ** 2
+        scale = safeSpread ** 2 / safeMean
+        boom = np.array([Simulation.boom.get(p.position, 20) for p in players], dtype = float)
+        bust = np.array([Simulation.bust.get(p.position, 6) for p in players], dtype = float)
+
+        # Draw the trials for as many players at a time as fit in a chunk
+        rows = max(1, Simulation.chunkSize // trials)
+        for start in range(0, len(players), rows):
+            part = slice(start, start + rows)
+            draws = self.rng.standard_gamma(shape[part, None], size = (len(shape[part]), trials))
+            draws *= (scale * playing)[part, None]
+
+            values = np.percentile(draws, Simulation.percentiles, axis = 1)
+            booms = (draws >= boom[part, None]).mean(axis = 1)
+            busts = (draws < bust[part, None]).mean(axis = 1)
+
+            for i, p in enumerate(players[part]):
+                p.projection = {"mean": float(draws[i].mean()), "boom": float(booms[i]), "bust": float(busts[i]),
+                                "trials": trials}
+                for j, pct in enumerate(Simulation.percentiles):
+                    p.projection["p{0}".format(pct)] = float(values[j, i])
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def distribution(players):
+        '''Returns the average and spread of the fantasy points each player has
+        made per game so far.'''
+
+        mean = np.zeros(len(players))
+        spread = np.zeros(len(players))
+        for i, p in enumerate(players):
+            points = p.gamePoints()
+            if len(points):
+                mean[i] = points.mean()
+                spread[i] = points.std()
+
+        return mean, spread
+
+
+    @staticmethod
+    def adjustment(players):
+        '''Returns how much the average of each player is scaled by this weeks
+        matchup, from the points per game the defense gives up above or below
+        the average defense the player has faced, relative to the league.'''
+
+        league = [stats[3] for team, stats in Player.defenseRankings.items() if team != Teams.BYE]
+        average = np.nanmean(league) if league else 0.0
+        if not average or np.isnan(average):
+            return np.ones(len(players))
+
+        # The last stat of each matchup is the difference in points given up per game
+        difference = np.array([np.nan_to_num(p.matchup[3]) for p in players], dtype = float)
+        return np.clip(1 + difference / average, *Simulation.adjustmentRange)
+
+
+    @staticmethod
+    def describe(projection):
+        '''Returns the projection of a player as a short line of text.'''
+
+        return "p10 {0:.1f} / p50 {1:.1f} / p90 {2:.1f}, boom {3:.0%}, bust {4:.0%}".format(
+               projection["p10"], projection["p50"], projection["p90"], projection["boom"], projection["bust"])
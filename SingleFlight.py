@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight(object):
+    '''This class makes sure the same piece of work is only done once at a time.
+    The first caller for a key does the work, and every caller that asks for the
+    same key while that work is still running waits for it and gets the very
+    same result, or the same error, instead of doing the work again. Once the
+    work is done the key is forgotten, so later callers start fresh.'''
+
+    def __init__(self):
+
+        self.calls = {}               # Holds the future of the work running for every key
+        self.lock = threading.Lock()  # Guards the calls and the counts
+        self.started = 0              # Number of times work was actually done
+        self.shared = 0               # Number of callers that got the result of work already running
+
+
+    def do(self, key, function):
+        '''Returns the result of function for the key, calling it only when no
+        other caller is already running it for the same key.'''
+
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Future()
+                self.started += 1
+            else:
+                self.shared += 1
+
+        # Someone else is already doing the work, so wait for their result
+        if not leader:
+            return call.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            self.finish(key)
+            call.set_exception(e)
+            raise
+
+        self.finish(key)
+        call.set_result(result)
+        return result
+
+
+    def finish(self, key):
+        '''Forgets the work of the key so the next caller does it again.'''
+
+        with self.lock:
+            del self.calls[key]
+
+
+    def getStats(self):
+        '''Returns the number of times work was done and the number of callers that shared it.'''
+
+        with self.lock:
+            return {"started": self.started, "shared": self.shared}
@@ -0,0 +1,198 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from Cache import Cache
+from Player import Player
+from Profiler import Profiler
+from StatTable import StatTable
+
+
+class Snapshot(object):
+    '''This class keeps a snapshot of the parsed data of every player on disk,
+    keyed by the season and week it was taken in. A player whose snapshot was
+    already taken this week is not fetched again at all. Otherwise their pages
+    are fetched, which the cache usually answers with a quick revalidation, and
+    the pages are only parsed again when their content has changed since the
+    last snapshot. Players whose pages have not changed get their data straight
+    from the snapshot.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    directory = ".snapshots"  # Default directory the snapshots are stored in
+
+    # Attributes of a player that are saved in a snapshot, everything else is rebuilt from them
+    fields = ["position", "stats", "gameStats", "gameCategories", "categories", "schedule", "teamId"]
+
+    # Finds the position in the header of a stats page, the only data parsed from outside its tables
+    positionPattern = re.compile(rb'nfl-c-player-header__position[^>]*>([^<]*)<')
+
+
+    def __init__(self, directory = None):
+
+        self.directory = directory if directory else Snapshot.directory
+        self.lock = threading.Lock()  # Guards the counts while players are fetched concurrently
+
+        # Counts used to report how many players had to be parsed again during a run
+        self.refreshed = 0   # Players whose pages changed and were parsed again
+        self.reused = 0      # Players whose pages had not changed since the last snapshot
+        self.skipped = 0     # Players whose snapshot was taken this week, so nothing was fetched
+
+        # Raise an OSError when the snapshots can not be written
+        os.makedirs(self.directory, exist_ok = True)
+        if not os.access(self.directory, os.W_OK):
+            raise PermissionError("Can not write to the snapshot directory '{0}'".format(self.directory))
+
+
+    def update(self, player, week):
+        '''Fills in the data of the player for the week given, using their last
+        snapshot wherever possible, and saves a snapshot for this week.'''
+
+        key = Snapshot.makeKey(Snapshot.season(), week)
+        weeks = self.load(player.name)
+        last = weeks[max(weeks, key = Snapshot.order)] if weeks else None
+
+        # A snapshot taken earlier this week is still fresh, so skip the web entirely
+        if key in weeks and time.time() - weeks[key]["stored"] < Cache.ttl["stats"]:
+            with Profiler.stage("player snapshot", player.name):
+                Snapshot.restore(player, weeks[key])
+            self.count("skipped")
+            return
+
+        # Fetch both pages, these are usually served or revalidated by the cache
+        with Profiler.stage("player fetch", player.name):
+            stats = Player.transport.get(Player.statLink.format(player.name)).content
+            logs = Player.transport.get(Player.scheduleLink.format(player.name)).content
+        # Only the parts of the pages that are parsed are hashed, so ads and scripts that
+        # change on every request do not make unchanged pages look new
+        position = Snapshot.positionPattern.search(stats)
+        hashes = [Snapshot.hash((position.group(1) if position else b"") + Snapshot.region(stats, b"<table", b"</table>")),
+                  Snapshot.hash(Snapshot.region(logs, b"<tbody", b"</tbody>"))]
+
+        if last and last["hashes"] == hashes:
+            # Nothing new was played since the last snapshot, so the parsed data is still right
+            with Profiler.stage("player snapshot", player.name):
+                Snapshot.restore(player, last)
+            self.count("reused")
+        else:
+            with Profiler.stage("player parse", player.name):
+                player.parseData(stats)
+            with Profiler.stage("player schedule parse", player.name):
+                player.parseScheduleData(logs)
+            self.count("refreshed")
+
+        # Save the snapshot for this week
+        entry = {field: getattr(player, field) for field in Snapshot.fields}
+        entry["hashes"] = hashes
+        entry["stored"] = time.time()
+        weeks[key] = entry
+        self.save(player.name, weeks)
+
+
+    def load(self, name):
+        '''Returns every snapshot of the player by season and week, an empty
+        dictionary when there are none or they could not be read.'''
+
+        try:
+            with open(self.path(name), "r") as reader:
+                return json.load(reader)
+        except (OSError, ValueError):
+            return {}
+
+
+    def save(self, name, weeks):
+        '''Writes every snapshot of the player to their file.'''
+
+        # Write to a temporary file first so a half written snapshot is never read
+        path = self.path(name)
+        with open(path + ".tmp", "w") as f:
+            json.dump(weeks, f)
+        os.replace(path + ".tmp", path)
+
+
+    def path(self, name):
+        '''Returns the file the snapshots of the player are stored in.'''
+
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9._-]+", "_", name) + ".json")
+
+
+    def count(self, name):
+        '''Adds one to the count with the given name.'''
+
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+    def printStats(self):
+        '''Prints how many players were parsed again and how many were reused.'''
+
+        print("Snapshots: {0} players refreshed, {1} reused, {2} reused without fetching\n"
+              .format(self.refreshed, self.reused, self.skipped))
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def restore(player, entry):
+        '''Fills in the data of the player from a snapshot, the same data that
+        parsing their pages would give.'''
+
+        for field in Snapshot.fields:
+            setattr(player, field, entry[field])
+
+        # The numeric tables are rebuilt from the saved rows
+        player.gameTable = StatTable(player.gameCategories, player.gameStats)
+        player.statTable = StatTable(player.categories, player.stats)
+
+
+    @staticmethod
+    def season(today = None):
+        '''Returns the year the current season started in. Games in January and
+        February still belong to the season that started the year before.'''
+
+        today = today if today else datetime.date.today()
+        return today.year if today.month > 2 else today.year - 1
+
+
+    @staticmethod
+    def makeKey(season, week):
+        '''Returns the key a snapshot is stored under for the season and week.'''
+
+        return "{0}-{1}".format(season, week)
+
+
+    @staticmethod
+    def order(key):
+        '''Returns a key that sorts snapshots from the oldest week to the newest.'''
+
+        season, week = key.split("-", 1)
+        return (int(season), int(week) if week.isdigit() else -1)
+
+
+    @staticmethod
+    def region(content, start, end):
+        '''Returns the part of the content of a page from the first start tag to the
+        end of the last end tag, found without parsing the page. Returns the whole
+        content when either tag is missing.'''
+
+        first = content.find(start)
+        last = content.rfind(end)
+        if first == -1 or last < first:
+            return content
+
+        return content[first:last + len(end)]
+
+
+    @staticmethod
+    def hash(content):
+        '''Returns the hash of the content of a page.'''
+
+        return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class StatTable(object):
+    '''This class holds a table of stats scraped from a page as one NumPy array
+    per category, so the cells are only converted from text once while parsing.
+    Numeric columns are stored as floats with NaN for the empty cells, and any
+    column that is not numeric, such as the opponent or the result of a game,
+    is kept as text. Columns can be looked up by category name or by position.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    missing = ("", "-", "--")  # Cell values that mean the stat is missing
+
+
+    def __init__(self, categories, rows):
+
+        self.names = list(categories)                          # Category names as they appear on the page
+        self.categories = StatTable.uniqueNames(categories)   # Category names used as the column keys
+        self.columns = {}                                      # Holds each column by its category name
+        self.rows = len(rows)                                  # Number of rows in the table
+
+        # Build each column from the cells in that position of every row
+        for i, name in enumerate(self.categories):
+            cells = [row[i] if i < len(row) else "" for row in rows]
+            self.columns[name] = StatTable.makeColumn(cells)
+
+
+    def __len__(self):
+
+        return self.rows
+
+
+    def __getitem__(self, key):
+        '''Returns the column for the category name or position given.'''
+
+        if isinstance(key, int):
+            key = self.categories[key]
+        return self.columns[key]
+
+
+    def __contains__(self, key):
+
+        return key in self.columns
+
+
+    def values(self, key, fill = 0.0):
+        '''Returns a numeric column with its missing values replaced by fill. A
+        text column keeps the cells that are numbers and fills the rest, so a
+        stray cell such as 45T never stops a player from being scored.'''
+
+        column = self[key]
+        if column.dtype == object:
+            column = np.array([StatTable.tryNumber(c) for c in column], dtype = float)
+        return np.where(np.isnan(column), fill, column)
+
+
+    def setColumn(self, key, values):
+        '''Replaces the column for the category name or position given.'''
+
+        if isinstance(key, int):
+            key = self.categories[key]
+        self.columns[key] = StatTable.makeColumn([str(v) for v in values])
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def makeColumn(cells):
+        '''Converts the text of every cell in a column to a float array, or to a
+        text array when any of the cells is not a number.'''
+
+        try:
+            return np.array([StatTable.toNumber(c) for c in cells], dtype = float)
+        except ValueError:
+            return np.array(cells, dtype = object)
+
+
+    @staticmethod
+    def toNumber(cell):
+        '''Converts the text of a single cell to a float. Missing stats become NaN
+        and the commas in large numbers such as 1,596 are removed. Raises a
+        ValueError when the cell is not a number.'''
+
+        cell = cell.strip()
+        if cell in StatTable.missing:
+            return np.nan
+        return float(cell.replace(",", ""))
+
+
+    @staticmethod
+    def tryNumber(cell):
+        '''Converts the text of a single cell to a float, or to NaN when it is not a number.'''
+
+        try:
+            return StatTable.toNumber(str(cell))
+        except ValueError:
+            return np.nan
+
+
+    @staticmethod
+    def toArray(cells):
+        '''Converts a list of cells that are all numbers, such as a teams row in the
+        league rankings, to a float array.'''
+
+        return np.array([StatTable.toNumber(str(c)) for c in cells], dtype = float)
+
+
+    @staticmethod
+    def uniqueNames(categories):
+        '''Returns the category names with a number added to any name that is
+        repeated, such as the passing and rushing YDS columns of a quarterback.'''
+
+        names = []
+        seen = {}
+        for name in categories:
+            seen[name] = seen.get(name, 0) + 1
+            names.append(name if seen[name] == 1 else "{0}_{1}".format(name, seen[name]))
+
+        return names
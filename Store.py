@@ -0,0 +1,230 @@
+import json
+import sqlite3
+import threading
+import numpy as np
+from Player import Player
+from Defense import Defense
+from Matchups import Matchups
+from StatTable import StatTable
+from Teams import Teams
+
+
+class Store(object):
+    '''This class keeps every week of scraped data in a local SQLite database so
+    that it outlives the run it was gathered in. Players, their game logs, the
+    weekly offense and defense rankings, the league defense tables and the
+    schedule of every team are each kept in their own indexed table, along
+    with the team each player was on in every stored week. A whole
+    week is written in a single transaction, and a stored week can be loaded
+    back into the Player, Defense and Matchups classes to score a roster
+    without scraping anything.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    path = "season.db"  # Default file the database is stored in
+
+    # Every table and index in the database
+    schema = ["""CREATE TABLE IF NOT EXISTS players (
+                     name TEXT PRIMARY KEY, position TEXT, teamId INTEGER, season INTEGER, week INTEGER,
+                     categories TEXT, gameCategories TEXT, stats TEXT, schedule TEXT)""",
+              """CREATE TABLE IF NOT EXISTS playerWeeks (
+                     name TEXT, season INTEGER, week INTEGER, teamId INTEGER, position TEXT,
+                     PRIMARY KEY (name, season, week))""",
+              """CREATE TABLE IF NOT EXISTS gameLogs (
+                     name TEXT, season INTEGER, game INTEGER, opponent INTEGER, stats TEXT,
+                     PRIMARY KEY (name, season, game))""",
+              """CREATE TABLE IF NOT EXISTS rankings (
+                     season INTEGER, week INTEGER, side TEXT, teamId INTEGER,
+                     total REAL, passing REAL, rushing REAL, points REAL,
+                     PRIMARY KEY (season, week, side, teamId))""",
+              """CREATE TABLE IF NOT EXISTS defenseTables (
+                     season INTEGER, week INTEGER, teamId INTEGER, tables TEXT,
+                     PRIMARY KEY (season, week, teamId))""",
+              """CREATE TABLE IF NOT EXISTS tableCategories (
+                     season INTEGER, week INTEGER, categories TEXT, PRIMARY KEY (season, week))""",
+              """CREATE TABLE IF NOT EXISTS schedules (
+                     season INTEGER, week INTEGER, teamId INTEGER, game INTEGER, opponent INTEGER,
+                     PRIMARY KEY (season, week, teamId, game))""",
+              """CREATE TABLE IF NOT EXISTS games (
+                     season INTEGER, week INTEGER, away INTEGER, home INTEGER, PRIMARY KEY (season, week, away))""",
+              "CREATE INDEX IF NOT EXISTS gameLogsByWeek ON gameLogs (season, game)",
+              "CREATE INDEX IF NOT EXISTS playersByTeam ON players (teamId)",
+              "CREATE INDEX IF NOT EXISTS schedulesByOpponent ON schedules (season, week, opponent)"]
+
+
+    def __init__(self, path = None):
+
+        self.path = path if path else Store.path
+        self.lock = threading.Lock()  # Only one thread uses the connection at a time
+
+        # The connection is shared by the threads of the scraper, guarded by the lock
+        self.connection = sqlite3.connect(self.path, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        with self.lock, self.connection:
+            for statement in Store.schema:
+                self.connection.execute(statement)
+
+
+    def saveWeek(self, players, season, week, schedule):
+        '''Writes the players given and all of the league data gathered for the
+        week to the database in a single transaction. The schedule holds this
+        weeks games as away team id to home team id.'''
+
+        week = int(week)
+        playerRows, weekRows, logRows = [], [], []
+        for p in players:
+            playerRows.append((p.name, p.position, p.teamId, season, week, json.dumps(p.categories),
+                               json.dumps(p.gameCategories), json.dumps(p.stats), json.dumps(p.schedule)))
+            # The players row only keeps their newest team, so the team of every week is kept on its own
+            weekRows.append((p.name, season, week, p.teamId, p.position))
+            # Only game logs with a week number can be kept by week
+            for row in p.gameStats:
+                if row and row[0].isdigit():
+                    logRows.append((p.name, season, int(row[0]), Teams.find(row[1]), json.dumps(row)))
+
+        # Both rankings, the bye week is left out as it is always zeros
+        rankingRows = []
+        for side, rankings in [("defense", Player.defenseRankings), ("offense", Defense.offenseRankings)]:
+            for team, stats in rankings.items():
+                if team is not None and team != Teams.BYE:
+                    rankingRows.append((season, week, side, team) + tuple(float(s) for s in stats))
+
+        tableRows = [(season, week, team, json.dumps(tables)) for team, tables in Defense.Alldata.items()
+                     if team is not None]
+
+        # The games every team has played so far, kept with the matchups they were gathered for
+        scheduleRows = []
+        if Matchups.current:
+            for team, games in Matchups.current.schedules.items():
+                if team is not None:
+                    scheduleRows += [(season, week, team, i, opp) for i, opp in enumerate(games)]
+        gameRows = [(season, week, away, home) for away, home in schedule.items()
+                    if away is not None and home is not None]
+
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", playerRows)
+            self.connection.executemany("INSERT OR REPLACE INTO playerWeeks VALUES (?, ?, ?, ?, ?)", weekRows)
+            self.connection.executemany("INSERT OR REPLACE INTO gameLogs VALUES (?, ?, ?, ?, ?)", logRows)
+            self.connection.executemany("INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rankingRows)
+            self.connection.executemany("INSERT OR REPLACE INTO defenseTables VALUES (?, ?, ?, ?)", tableRows)
+            if Defense.dataCategories:
+                self.connection.execute("INSERT OR REPLACE INTO tableCategories VALUES (?, ?, ?)",
+                                        (season, week, json.dumps(Defense.dataCategories)))
+            # Replace the schedules of the week as a whole so no stale games are left behind
+            self.connection.execute("DELETE FROM schedules WHERE season = ? AND week = ?", (season, week))
+            self.connection.executemany("INSERT INTO schedules VALUES (?, ?, ?, ?, ?)", scheduleRows)
+            self.connection.execute("DELETE FROM games WHERE season = ? AND week = ?", (season, week))
+            self.connection.executemany("INSERT INTO games VALUES (?, ?, ?, ?)", gameRows)
+
+
+    def query(self, statement, arguments = ()):
+        '''Runs a query against the database and returns every row.'''
+
+        with self.lock:
+            return self.connection.execute(statement, arguments).fetchall()
+
+
+    def latestWeek(self):
+        '''Returns the (season, week) of the newest week stored, or None when no
+        week has been stored yet.'''
+
+        rows = self.query("SELECT season, week FROM rankings ORDER BY season DESC, week DESC LIMIT 1")
+        return rows[0] if rows else None
+
+
+    def rankings(self, season, week, side):
+        '''Returns the "defense" or "offense" rankings stored for the week by team
+        id, with a bye week entry, the same way they are kept when scraped.'''
+
+        rows = self.query("SELECT teamId, total, passing, rushing, points FROM rankings "
+                          "WHERE season = ? AND week = ? AND side = ?", (season, week, side))
+        rankings = {row[0]: np.array(row[1:], dtype = float) for row in rows}
+        rankings[Teams.BYE] = np.zeros(4)
+        return rankings
+
+
+    def schedules(self, season, week):
+        '''Returns the ids of the teams each team had faced by the week given.'''
+
+        schedules = {}
+        for team, opp in self.query("SELECT teamId, opponent FROM schedules WHERE season = ? AND week = ? "
+                                    "ORDER BY teamId, game", (season, week)):
+            schedules.setdefault(team, []).append(opp)
+        return schedules
+
+
+    def games(self, season, week):
+        '''Returns the games of the week given as away team id to home team id.'''
+
+        return dict(self.query("SELECT away, home FROM games WHERE season = ? AND week = ?", (season, week)))
+
+
+    def gameLog(self, name, season):
+        '''Returns the game log rows of a player for a season in order of the week played.'''
+
+        rows = self.query("SELECT stats FROM gameLogs WHERE name = ? AND season = ? ORDER BY game", (name, season))
+        return [json.loads(row[0]) for row in rows]
+
+
+    def loadLeague(self, season, week):
+        '''Loads the league data stored for the week into the Player, Defense and
+        Matchups classes, the same as scraping it would. Returns this weeks games
+        as away team id to home team id. Raises a LookupError when the week was
+        not stored.'''
+
+        Player.defenseRankings = self.rankings(season, week, "defense")
+        Defense.offenseRankings = self.rankings(season, week, "offense")
+        if len(Player.defenseRankings) == 1:
+            raise LookupError("Week {0} of the {1} season is not stored".format(week, season))
+
+        # The league defense tables
+        Defense.Alldata = {team: json.loads(tables) for team, tables in
+                           self.query("SELECT teamId, tables FROM defenseTables WHERE season = ? AND week = ?",
+                                      (season, week))}
+        rows = self.query("SELECT categories FROM tableCategories WHERE season = ? AND week = ?", (season, week))
+        Defense.dataCategories = json.loads(rows[0][0]) if rows else []
+        Defense.tablesLoaded = True
+
+        # Rebuild the matchups for the week from the stored schedules
+        games = self.games(season, week)
+        opponents = {}
+        for away, home in games.items():
+            opponents[away] = home
+            opponents[home] = away
+        Matchups.use(Matchups(str(week), Player.defenseRankings, Defense.offenseRankings,
+                              self.schedules(season, week), opponents))
+
+        return games
+
+
+    def loadPlayer(self, player):
+        '''Fills in the data of a player from the database, the same data that
+        parsing their pages would give. Raises a LookupError when the player
+        was never stored.'''
+
+        rows = self.query("SELECT position, teamId, season, categories, gameCategories, stats, schedule "
+                          "FROM players WHERE name = ?", (player.name,))
+        if not rows:
+            raise LookupError("Player '{0}' is not stored".format(player.name))
+
+        position, teamId, season, categories, gameCategories, stats, schedule = rows[0]
+        player.position = position
+        player.teamId = teamId
+        player.categories = json.loads(categories)
+        player.gameCategories = json.loads(gameCategories)
+        player.stats = json.loads(stats)
+        player.schedule = json.loads(schedule)
+        player.gameStats = self.gameLog(player.name, season)
+
+        # The numeric tables are rebuilt from the stored rows
+        player.gameTable = StatTable(player.gameCategories, player.gameStats)
+        player.statTable = StatTable(player.categories, player.stats)
+
+
+    def close(self):
+        '''Closes the connection to the database.'''
+
+        with self.lock:
+            self.connection.close()
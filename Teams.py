@@ -0,0 +1,120 @@
+class Teams(object):
+    '''This class holds the canonical list of NFL teams. Every team has an integer
+    id, which is its position in the table, and every name a team goes by on ESPN
+    or NFL.com is mapped to that id. Pages name teams by their full name, their
+    nickname, their city or an abbreviation, so any of these can be turned into
+    the same id with a single dictionary lookup.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    # Every team in the league as (city, nickname, NFL.com abbreviation, ESPN abbreviation)
+    table = [("Arizona", "Cardinals", "ARI", "ari"), ("Atlanta", "Falcons", "ATL", "atl"),
+             ("Baltimore", "Ravens", "BAL", "bal"), ("Buffalo", "Bills", "BUF", "buf"),
+             ("Carolina", "Panthers", "CAR", "car"), ("Chicago", "Bears", "CHI", "chi"),
+             ("Cincinnati", "Bengals", "CIN", "cin"), ("Cleveland", "Browns", "CLE", "cle"),
+             ("Dallas", "Cowboys", "DAL", "dal"), ("Denver", "Broncos", "DEN", "den"),
+             ("Detroit", "Lions", "DET", "det"), ("Green Bay", "Packers", "GB", "gb"),
+             ("Houston", "Texans", "HOU", "hou"), ("Indianapolis", "Colts", "IND", "ind"),
+             ("Jacksonville", "Jaguars", "JAX", "jax"), ("Kansas City", "Chiefs", "KC", "kc"),
+             ("Las Vegas", "Raiders", "LV", "lv"), ("Los Angeles", "Chargers", "LAC", "lac"),
+             ("Los Angeles", "Rams", "LA", "lar"), ("Miami", "Dolphins", "MIA", "mia"),
+             ("Minnesota", "Vikings", "MIN", "min"), ("New England", "Patriots", "NE", "ne"),
+             ("New Orleans", "Saints", "NO", "no"), ("New York", "Giants", "NYG", "nyg"),
+             ("New York", "Jets", "NYJ", "nyj"), ("Philadelphia", "Eagles", "PHI", "phi"),
+             ("Pittsburgh", "Steelers", "PIT", "pit"), ("San Francisco", "49ers", "SF", "sf"),
+             ("Seattle", "Seahawks", "SEA", "sea"), ("Tampa Bay", "Buccaneers", "TB", "tb"),
+             ("Tennessee", "Titans", "TEN", "ten"), ("Washington", "Football Team", "WAS", "wsh")]
+
+    BYE = len(table)     # Id used as the opponent of a team that is not playing this week
+    count = BYE + 1      # Number of ids, including the bye week
+
+    # Names that some pages still use for a team, mapped to the teams name in the table
+    otherNames = {"Oakland Raiders": "Las Vegas Raiders", "San Diego Chargers": "Los Angeles Chargers",
+                  "St. Louis Rams": "Los Angeles Rams", "Washington Redskins": "Washington Football Team",
+                  "Washington Commanders": "Washington Football Team", "Redskins": "Washington Football Team",
+                  "Commanders": "Washington Football Team", "JAC": "Jacksonville Jaguars",
+                  "WSH": "Washington Football Team", "LAR": "Los Angeles Rams",
+                  "Bucs": "Tampa Bay Buccaneers", "Niners": "San Francisco 49ers"}
+
+    aliases = {}  # Maps every known name of a team to its id, built by Teams.buildAliases
+
+
+    @staticmethod
+    def buildAliases():
+        '''Fills the aliases dictionary with the full name, nickname, abbreviations
+        and, when no other team shares it, the city of every team.'''
+
+        cities = [t[0] for t in Teams.table]
+
+        for i, (city, nickname, abbreviation, espn) in enumerate(Teams.table):
+            for alias in [city + " " + nickname, nickname, abbreviation, espn]:
+                Teams.aliases[Teams.normalize(alias)] = i
+            # Los Angeles and New York have two teams so the city is not enough
+            if cities.count(city) == 1:
+                Teams.aliases[Teams.normalize(city)] = i
+
+        for alias, name in Teams.otherNames.items():
+            Teams.aliases[Teams.normalize(alias)] = Teams.aliases[Teams.normalize(name)]
+
+        # A bye week is listed in a teams schedule like any other opponent
+        for alias in ["Bye Week", "Bye"]:
+            Teams.aliases[Teams.normalize(alias)] = Teams.BYE
+
+
+    @staticmethod
+    def normalize(name):
+        '''Puts a team name in the form used by the aliases dictionary, so that
+        "@Chiefs", "kansas-city-chiefs" and "Kansas City Chiefs" all match.'''
+
+        name = name.strip().lstrip("@").replace("-", " ").lower()
+        return " ".join(name.split())
+
+
+    @staticmethod
+    def find(name):
+        '''Returns the id of the team with the name given, or None if the name is
+        not one of the names a team goes by. Names like "Kansas Chiefs" that are
+        not an alias themselves are matched by their last word or first word.'''
+
+        name = Teams.normalize(name)
+        if name in Teams.aliases:
+            return Teams.aliases[name]
+
+        # Fall back to the nickname at the end or the city at the start of the name
+        words = name.split()
+        if words:
+            for word in [words[-1], words[0]]:
+                if word in Teams.aliases:
+                    return Teams.aliases[word]
+
+        return None
+
+
+    @staticmethod
+    def name(id):
+        '''Returns the full name of the team with the id given.'''
+
+        if id == Teams.BYE:
+            return "Bye Week"
+        return Teams.table[id][0] + " " + Teams.table[id][1]
+
+
+    @staticmethod
+    def nickname(id):
+        '''Returns the nickname of the team with the id given, such as "Chiefs".'''
+
+        if id == Teams.BYE:
+            return "Bye Week"
+        return Teams.table[id][1]
+
+
+    @staticmethod
+    def espn(id):
+        '''Returns the abbreviation ESPN uses for the team in its links.'''
+
+        return Teams.table[id][3]
+
+
+Teams.buildAliases()
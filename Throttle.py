@@ -0,0 +1,209 @@
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+
+
+class Throttle(object):
+    '''This class schedules every request made to the web so that no site is
+    asked for more pages than it tolerates. Each host gets a token bucket that
+    limits how many requests are started each second, and requests that fail or
+    are throttled with a 429 or 5xx response are retried after a jittered
+    exponential backoff, or after the time the site asks for in its Retry-After
+    header. A host that throttles a request has its rate halved, and the rate
+    then climbs back up to the limit as requests succeed again.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    rate = 5.0          # Default number of requests started each second for each host
+    burst = 10          # Default number of requests a host can be sent at once after being idle
+    retries = 4         # Default number of times a failed request is tried again
+    backoff = 0.5       # Seconds waited before the first retry, doubled for every retry after it
+    maxDelay = 60.0     # Longest time waited before a single retry
+    minRate = 0.2       # Slowest a throttled host is ever slowed down to
+    recovery = 0.1      # Requests per second a host speeds back up by after each success
+
+    retryStatus = [429, 500, 502, 503, 504]  # Responses that are worth trying again
+    retryErrors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+    def __init__(self, rate = None, burst = None, retries = None):
+
+        # Use the class defaults for anything that was not given
+        self.rate = rate if rate else Throttle.rate
+        self.burst = burst if burst else Throttle.burst
+        self.retries = retries if retries is not None else Throttle.retries
+
+        self.buckets = {}             # Holds the token bucket of every host by name
+        self.lock = threading.Lock()  # Guards the buckets and the stats while fetching concurrently
+        self.start = time.time()      # Used to find the number of requests made each second
+        self.stats = {}               # Holds the counts of every host by name
+
+
+    def fetch(self, link, request):
+        '''Makes a request to the link by calling request, waiting for the host
+        to have a free token first and retrying the request when it fails or is
+        throttled. Returns the response. Raises an HTTPError when the site still
+        throttles or fails the request once every retry is used up, and the last
+        error when the request never got a response.'''
+
+        host = urlsplit(link).netloc
+        bucket = self.bucket(host)
+
+        for attempt in range(self.retries + 1):
+            self.count(host, "waited", bucket.take())
+            self.count(host, "requests")
+
+            try:
+                response = request()
+            except Throttle.retryErrors:
+                self.count(host, "errors")
+                if attempt == self.retries:
+                    raise
+                self.wait(host, Throttle.delay(attempt))
+                continue
+
+            if response.status_code not in Throttle.retryStatus:
+                bucket.speedUp()
+                return response
+
+            # The site is throttling us or is struggling, so slow down before trying again
+            self.count(host, "throttled" if response.status_code == 429 else "errors")
+            bucket.slowDown()
+            if attempt == self.retries:
+                raise requests.exceptions.HTTPError("{0} from {1} after {2} attempts"
+                                                    .format(response.status_code, link, attempt + 1), response = response)
+            self.wait(host, Throttle.retryAfter(response, attempt))
+
+
+    def bucket(self, host):
+        '''Returns the token bucket of the host, creating it the first time the host is used.'''
+
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = Bucket(self.rate, self.burst)
+                self.stats[host] = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "waited": 0.0}
+            return self.buckets[host]
+
+
+    def wait(self, host, seconds):
+        '''Waits before retrying a request to the host.'''
+
+        self.count(host, "retries")
+        self.count(host, "waited", seconds)
+        time.sleep(seconds)
+
+
+    def count(self, host, name, amount = 1):
+        '''Adds the amount to the count with the given name for the host.'''
+
+        with self.lock:
+            self.stats[host][name] += amount
+
+
+    def getStats(self):
+        '''Returns the counts of every host along with the number of requests
+        made each second and the rate each host is allowed now.'''
+
+        elapsed = max(time.time() - self.start, 1e-9)
+        with self.lock:
+            stats = {host: dict(s) for host, s in self.stats.items()}
+            for host, s in stats.items():
+                s["perSecond"] = s["requests"] / elapsed
+                s["rate"] = self.buckets[host].rate
+
+        return stats
+
+
+    def printStats(self):
+        '''Prints how many requests were made, retried and throttled for each host.'''
+
+        print("Requests scheduled:\n")
+        for host, s in self.getStats().items():
+            print("  - {0} : {1} requests ({2:.1f}/s), {3} retries, {4} throttled, {5} errors, "
+                  "{6:.1f}s waiting, now {7:.1f}/s allowed"
+                  .format(host, s["requests"], s["perSecond"], s["retries"], s["throttled"], s["errors"],
+                          s["waited"], s["rate"]))
+        print()
+
+
+######################################################################
+# STATIC METHODS
+######################################################################
+
+
+    @staticmethod
+    def delay(attempt):
+        '''Returns the time to wait before a retry, a random time up to an
+        exponentially growing limit so that retries are spread out.'''
+
+        return random.uniform(0, min(Throttle.maxDelay, Throttle.backoff * 2 ** attempt))
+
+
+    @staticmethod
+    def retryAfter(response, attempt):
+        '''Returns the time to wait before retrying a throttled response, the
+        time the site asks for when it sends a Retry-After header.'''
+
+        header = response.headers.get("Retry-After")
+        if header:
+            # The header is either a number of seconds or a date
+            try:
+                return min(Throttle.maxDelay, max(0.0, float(header)))
+            except ValueError:
+                try:
+                    when = email.utils.parsedate_to_datetime(header).timestamp()
+                    return min(Throttle.maxDelay, max(0.0, when - time.time()))
+                except (TypeError, ValueError):
+                    pass
+
+        return Throttle.delay(attempt)
+
+
+class Bucket(object):
+    '''A token bucket that limits the number of requests started each second
+    for a single host. Each request takes a token, and tokens are added back at
+    the rate of the bucket up to its burst size.'''
+
+    def __init__(self, rate, burst):
+
+        self.limit = rate        # Fastest the bucket is allowed to go
+        self.rate = rate         # Number of tokens added each second right now
+        self.burst = burst       # Most tokens the bucket can hold
+        self.tokens = burst      # Tokens left, below zero when requests are waiting on a token
+        self.last = time.time()  # Time the tokens were last added
+        self.lock = threading.Lock()
+
+
+    def take(self):
+        '''Takes a token, waiting until one is free. Returns the seconds waited.'''
+
+        with self.lock:
+            now = time.time()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserve the token now and wait for it outside of the lock
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+    def slowDown(self):
+        '''Halves the rate after the host throttled a request.'''
+
+        with self.lock:
+            self.rate = max(Throttle.minRate, self.rate / 2)
+
+
+    def speedUp(self):
+        '''Moves the rate back up towards the limit after a request succeeded.'''
+
+        with self.lock:
+            self.rate = min(self.limit, self.rate + Throttle.recovery)
@@ -0,0 +1,139 @@
+import requests
+from requests.adapters import HTTPAdapter
+from SingleFlight import SingleFlight
+
+
+class Transport(object):
+    '''This class handles every HTTP request made while scraping. It keeps a pool
+    of keep-alive connections open for each host so that the many requests made
+    to www.nfl.com and www.espn.com reuse connections instead of opening a new
+    TCP/TLS connection every time. Requests can be scheduled by a throttle that
+    limits how fast each host is asked for pages and retries failed requests.
+    Requests for a page that is already being fetched wait for that fetch and
+    share its response instead of asking the site again.'''
+
+    ###########################################
+    # Declare all static class varibales here #
+    ###########################################
+
+    timeout = (5, 15)  # Default (connect, read) timeout in seconds for every request
+    poolSize = 8       # Default number of connections kept alive for each host
+    hostCount = 10     # Number of hosts that can have a pool of connections at once
+
+    # Headers sent with every request
+    headers = {"Accept-Encoding": "gzip, deflate"}
+
+
+    def __init__(self, timeout = None, poolSize = None, cache = None, archive = None, replay = None, throttle = None):
+
+        # Use the class defaults for anything that was not given
+        self.timeout = timeout if timeout else Transport.timeout
+        self.poolSize = poolSize if poolSize else Transport.poolSize
+        self.cache = cache  # On disk cache of responses, None when caching is turned off
+        self.archive = archive  # Archive the raw HTML of each page is saved to, None when archiving is turned off
+        self.replay = replay    # Recorded fixtures every page is served from, None when using the web
+        self.throttle = throttle  # Limits the rate of requests to each host and retries them, None to send them straight away
+
+        self.fetches = SingleFlight()  # Shares the response of every page fetched at the same time
+        self.parses = SingleFlight()   # Shares the parsed result of every league page read at the same time
+
+        # The adapter holds one pool of connections for each host that is used
+        self.adapter = HTTPAdapter(pool_connections = Transport.hostCount, pool_maxsize = self.poolSize)
+
+        # Create the session that all requests are made through
+        self.session = requests.Session()
+        self.session.headers.update(Transport.headers)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+
+    def get(self, link):
+        '''Makes a GET request to the link using one of the pooled connections
+        and returns the response. Pages are served from the cache when one is used
+        and handed to the archive when archiving is turned on. When replaying a
+        recorded run the page always comes from the fixtures instead of the web.
+        Callers asking for a page that is already being fetched get the same response.'''
+
+        return self.fetches.do(link, lambda: self.fetch(link))
+
+
+    def fetch(self, link):
+        '''Gets the page of the link from the fixtures, the cache or the web.'''
+
+        if self.replay:
+            return self.replay.load(link)
+
+        if self.cache:
+            webpage = self.cache.get(link, self.request)
+        else:
+            webpage = self.request(link)
+
+        # Queue the raw page to be written to the archive in the background
+        if self.archive and webpage.status_code == 200:
+            self.archive.add(link, webpage.content)
+
+        return webpage
+
+
+    def shared(self, link, function):
+        '''Runs function, which fetches and parses the page of the link, only once
+        for every caller that asks for the same page while it is still running.'''
+
+        return self.parses.do(link, function)
+
+
+    def request(self, link, headers = None):
+        '''Sends a single request for the link over the web, through the throttle
+        when one is used so that cached pages never count against a hosts rate.'''
+
+        if self.throttle:
+            return self.throttle.fetch(link, lambda: self.session.get(link, timeout = self.timeout, headers = headers))
+
+        return self.session.get(link, timeout = self.timeout, headers = headers)
+
+
+    def getStats(self):
+        '''Returns a dictionary of the number of requests made, connections opened
+        and connections reused for each host used so far.'''
+
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+
+        # Go through the pool of connections for each host
+        for key in pools.keys():
+            pool = pools[key]
+            stats[pool.host] = {"requests": pool.num_requests,
+                                "connections": pool.num_connections,
+                                "reused": max(pool.num_requests - pool.num_connections, 0)}
+
+        return stats
+
+
+    def printStats(self):
+        '''Prints how many connections were reused for each host to the console.'''
+
+        print("\nConnections used:\n")
+        for host, s in self.getStats().items():
+            print("  - {0} : {1} requests, {2} connections opened, {3} reused"
+                  .format(host, s["requests"], s["connections"], s["reused"]))
+        print()
+
+        fetches = self.fetches.getStats()
+        parses = self.parses.getStats()
+        print("Requests shared: {0} of {1} page requests and {2} of {3} league page parses were already running"
+              .format(fetches["shared"], fetches["started"] + fetches["shared"],
+                      parses["shared"], parses["started"] + parses["shared"]))
+        print()
+
+        if self.throttle:
+            self.throttle.printStats()
+        if self.cache:
+            self.cache.printStats()
+
+
+    def close(self):
+        '''Finishes writing the archive and closes all of the connections held by the transport.'''
+
+        if self.archive:
+            self.archive.close()
+        self.session.close()
@@ -0,0 +1,94 @@
+import copy
+import os
+import sys
+import numpy as np
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Player import Player
+from Matchups import Matchups
+from Teams import Teams
+
+
+@pytest.fixture
+def league():
+    '''Fills the league rankings with random stats and restores them afterwards.'''
+
+    rng = np.random.default_rng(7)
+    saved = (dict(Player.defenseRankings), Matchups.current)
+
+    Player.defenseRankings.clear()
+    for team in range(Teams.BYE):
+        Player.defenseRankings[team] = rng.uniform(10, 400, 4)
+    Player.defenseRankings[Teams.BYE] = np.zeros(4)
+
+    yield rng
+
+    Player.defenseRankings.clear()
+    Player.defenseRankings.update(saved[0])
+    Matchups.current = saved[1]
+
+
+def makePlayers(rng):
+    '''Returns players covering every case calculateScore handles.'''
+
+    cases = [("on-a-bye", 3, [1, 2, 4], Teams.BYE),
+             ("unknown-team", None, [5, 6, 7, 8], 9),
+             ("no-games-yet", 10, [], 11),
+             ("repeat-opponent", 12, [13, 13, 14], 15),
+             ("known-team", 0, [16, 17], 18),
+             ("another-known-team", 1, [19], 20)]
+
+    players = []
+    for name, team, schedule, opponent in cases:
+        p = Player(name)
+        p.teamId = team
+        p.schedule = list(schedule)
+        p.opponent = opponent
+        players.append(p)
+
+    # A larger roster of random players and opponents
+    for i in range(40):
+        p = Player("random-{0}".format(i))
+        p.teamId = int(rng.integers(0, Teams.BYE))
+        p.schedule = [int(t) for t in rng.integers(0, Teams.BYE, int(rng.integers(0, 9)))]
+        p.opponent = int(rng.integers(0, Teams.count))
+        players.append(p)
+
+    return players
+
+
+def compare(players):
+    '''Scores copies of the players both ways and checks that they match.'''
+
+    single = [copy.deepcopy(p) for p in players]
+    batch = [copy.deepcopy(p) for p in players]
+
+    for p in single:
+        p.calculateScore()
+    Player.calculateScores(batch)
+
+    for a, b in zip(single, batch):
+        assert a.score == b.score, a.name
+        assert np.allclose(a.matchup, b.matchup), a.name
+
+
+def test_without_matchups(league):
+
+    Matchups.current = None
+    compare(makePlayers(league))
+
+
+def test_with_matchups(league):
+
+    # Only some of the teams are known to the matchups, the rest use their own schedule
+    schedules = {0: [2, 3, 4], 1: [5, 5], 12: [], 20: [21, 22]}
+    Matchups.current = Matchups("5", Player.defenseRankings, Player.defenseRankings, schedules, {0: 18, 18: 0})
+    compare(makePlayers(league))
+
+
+def test_empty_roster(league):
+
+    Player.calculateScores([])
@@ -0,0 +1,127 @@
+import itertools
+import os
+import random
+import sys
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lineup import Lineup
+
+
+class Member(object):
+    '''Stands in for a player or defense with just what the lineup looks at.'''
+
+    def __init__(self, name, position, score, salary):
+
+        self.name = name
+        self.position = position
+        self.score = score
+        self.salary = salary
+
+
+def makeTeam(rng, size, positions = ("QB", "RB", "WR", "TE")):
+    '''Returns random players and two random defenses.'''
+
+    players = [Member("p{0}".format(i), rng.choice(positions), rng.randint(0, 30), rng.randrange(0, 3000, 100))
+               for i in range(size)]
+    defenses = [Member("d{0}".format(i), "DST", rng.randint(0, 10), rng.randrange(0, 1500, 100)) for i in range(2)]
+    return players, defenses
+
+
+def counts(players, defenses, slots):
+    '''Returns the number of each slot that can be filled, never more than there
+    are players for.'''
+
+    have = {}
+    for x in players:
+        have[x.position] = have.get(x.position, 0) + 1
+    have["DST"] = len(defenses)
+
+    fixed = {pos: min(n, have.get(pos, 0)) for pos, n in slots.items() if pos not in ["FLEX", "BENCH"]}
+    left = sum(have.get(pos, 0) - fixed.get(pos, 0) for pos in Lineup.flex)
+    fixed["FLEX"] = min(slots.get("FLEX", 0), left)
+    return fixed
+
+
+def bruteForce(players, defenses, slots, cap):
+    '''Tries every way of filling the slots and returns the best total score
+    under the cap, or None when no lineup fits.'''
+
+    everyone = players + defenses
+    wanted = [pos for pos, n in counts(players, defenses, slots).items() for _ in range(n)]
+
+    def fits(slot, x):
+        return x.position == slot or (slot == "FLEX" and x.position in Lineup.flex)
+
+    best = None
+    for picks in itertools.permutations(everyone, len(wanted)):
+        if all(fits(slot, x) for slot, x in zip(wanted, picks)) and sum(x.salary for x in picks) <= cap:
+            score = sum(x.score for x in picks)
+            if best is None or score > best:
+                best = score
+
+    return best
+
+
+def check(players, defenses, slots, cap):
+    '''Checks that the lineup picked under the cap is as good as the best lineup
+    found by trying every way.'''
+
+    best = bruteForce(players, defenses, slots, cap)
+    if best is None:
+        with pytest.raises(ValueError):
+            Lineup(players, defenses, slots, cap)
+        return
+
+    lineup = Lineup(players, defenses, slots, cap)
+    assert lineup.salary <= cap
+    assert lineup.score == best
+    # Every starter is in a slot they can fill, and nobody starts twice
+    for slot, x in lineup.starters:
+        assert x.position == slot or (slot == "FLEX" and x.position in Lineup.flex)
+    assert len(set(id(x) for _, x in lineup.starters)) == len(lineup.starters)
+
+
+def test_random_rosters():
+
+    rng = random.Random(5)
+    slots = {"QB": 1, "RB": 1, "WR": 1, "FLEX": 1, "DST": 1}
+    for _ in range(30):
+        players, defenses = makeTeam(rng, rng.randint(4, 7))
+        check(players, defenses, slots, rng.randrange(2000, 9000, 100))
+
+
+def test_flex():
+
+    # The best lineup under the cap puts the cheap second tight end in the FLEX slot
+    players = [Member("qb", "QB", 20, 3000), Member("rb", "RB", 18, 2500), Member("rb2", "RB", 15, 2600),
+               Member("wr", "WR", 16, 2000), Member("te", "TE", 12, 1500), Member("te2", "TE", 11, 500)]
+    defenses = [Member("dst", "DST", 5, 1000)]
+    slots = {"QB": 1, "RB": 1, "WR": 1, "TE": 1, "FLEX": 1, "DST": 1}
+    check(players, defenses, slots, 10500)
+
+    lineup = Lineup(players, defenses, slots, 10500)
+    assert [x.name for slot, x in lineup.starters if slot == "FLEX"] == ["te2"]
+
+
+def test_under_filled_position():
+
+    # There are no tight ends, so the TE slot is left empty
+    rng = random.Random(11)
+    slots = {"QB": 1, "RB": 2, "WR": 1, "TE": 1, "FLEX": 1, "DST": 1}
+    for _ in range(10):
+        players, defenses = makeTeam(rng, 6, positions = ("QB", "RB", "WR"))
+        check(players, defenses, slots, rng.randrange(4000, 12000, 100))
+
+
+def test_nothing_fits_under_the_cap():
+
+    players = [Member("qb", "QB", 20, 3000), Member("rb", "RB", 18, 2500)]
+    defenses = [Member("dst", "DST", 5, 1000)]
+    slots = {"QB": 1, "RB": 1, "DST": 1}
+
+    assert bruteForce(players, defenses, slots, 6000) is None
+    with pytest.raises(ValueError):
+        Lineup(players, defenses, slots, 6000)
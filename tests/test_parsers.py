@@ -0,0 +1,111 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Parser import Parser
+from Player import Player
+from Defense import Defense
+from Scraper import Scraper
+from Teams import Teams
+
+fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def page(name):
+    '''Returns the content of a saved page from the fixtures directory.'''
+
+    with open(os.path.join(fixtures, name), "rb") as f:
+        return f.read()
+
+
+def parseAll():
+    '''Parses every saved page with the current backend and returns everything
+    the parsers extracted, in a form that can be compared.'''
+
+    player = Player("patrick-mahomes")
+    player.parseData(page("player_stats.html"))
+    player.parseScheduleData(page("player_gamelog.html"))
+
+    defense = Defense("Kansas City Chiefs")
+    defense.parseSchedule(page("team_schedule.html"))
+
+    week, games = Scraper.parseCurrentWeek(page("schedule.html"))
+    defenseRankings = Player.parseDefenseRankings(page("defense_rankings.html"), {})
+    offenseRankings = Defense.parseOffenseRankings(page("offense_rankings.html"), {})
+
+    return {"week": week,
+            "games": games,
+            "player": (player.position, player.gameCategories, player.gameStats, player.categories,
+                       player.stats, player.schedule, player.teamId),
+            "defense": (defense.schedule, defense.opponent),
+            "defenseRankings": {team: list(stats) for team, stats in defenseRankings.items()},
+            "offenseRankings": {team: list(stats) for team, stats in offenseRankings.items()}}
+
+
+def installed(backend):
+    '''Returns whether BeautifulSoup can use the backend.'''
+
+    from bs4 import BeautifulSoup, FeatureNotFound
+    try:
+        BeautifulSoup("", backend)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+@pytest.fixture
+def backend():
+    '''Restores the parser backend picked before the test.'''
+
+    saved = Parser.backend
+    yield
+    Parser.backend = saved
+
+
+def test_pages(backend):
+
+    Parser.useBackend("html.parser")
+    result = parseAll()
+
+    assert result["week"] == "5"
+    assert len(result["games"]) == 15
+    assert result["games"][Teams.find("Arizona Cardinals")] == Teams.find("Atlanta Falcons")
+
+    position, gameCategories, gameStats, categories, stats, schedule, teamId = result["player"]
+    assert position == "QB"
+    assert gameCategories[:2] == ["WK", "OPP"]
+    assert [g[0] for g in gameStats] == ["1", "2", "3", "4"]
+    assert [s[0] for s in stats] == ["2018", "2019", "2020"]
+    assert teamId == Teams.find("Kansas City Chiefs")
+    # The stats page and the game log each add the four teams played
+    assert schedule == [Teams.find(t) for t in ["HOU", "LAC", "BAL", "NE"] * 2]
+
+    assert result["defense"] == ([Teams.find(t) for t in ["HOU", "LAC", "BAL", "NE"]], Teams.find("LV"))
+
+    for rankings in (result["defenseRankings"], result["offenseRankings"]):
+        assert len(rankings) == Teams.count
+        assert all(len(stats) == 4 and not np.isnan(stats).any() for stats in rankings.values())
+
+
+@pytest.mark.parametrize("name", Parser.backends)
+@pytest.mark.parametrize("strained", [True, False])
+def test_backends_match(backend, monkeypatch, name, strained):
+
+    if not installed(name):
+        pytest.skip("{0} is not installed".format(name))
+
+    # The whole page, built without a strainer, is what every other way is checked against
+    Parser.useBackend("html.parser")
+    with monkeypatch.context() as m:
+        m.setattr(Parser, "strainer", staticmethod(lambda tags = None, classes = None: None))
+        expected = parseAll()
+
+    Parser.useBackend(name)
+    if not strained:
+        monkeypatch.setattr(Parser, "strainer", staticmethod(lambda tags = None, classes = None: None))
+
+    assert parseAll() == expected
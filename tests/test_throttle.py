@@ -0,0 +1,110 @@
+import email.utils
+import os
+import sys
+import time
+import pytest
+import requests
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Throttle as throttleModule
+from Throttle import Throttle
+
+link = "https://www.espn.com/nfl/schedule"
+
+
+class Response(object):
+    '''Stands in for a response with just what the throttle looks at.'''
+
+    def __init__(self, status, headers = None):
+
+        self.status_code = status
+        self.headers = headers if headers else {}
+
+
+def stub(*outcomes):
+    '''Returns a request that gives each outcome in turn, raising the ones that
+    are errors, and the list of calls made to it.'''
+
+    calls = []
+
+    def request():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return request, calls
+
+
+@pytest.fixture
+def noWaiting(monkeypatch):
+    '''Retries straight away and records every wait asked for instead.'''
+
+    monkeypatch.setattr(Throttle, "backoff", 0)
+    monkeypatch.setattr(Throttle, "maxDelay", 0)
+    waits = []
+    monkeypatch.setattr(throttleModule.time, "sleep", waits.append)
+    return waits
+
+
+def test_throttled_then_ok(noWaiting):
+
+    throttle = Throttle(retries = 2)
+    ok = Response(200)
+    request, calls = stub(Response(429), ok)
+
+    assert throttle.fetch(link, request) is ok
+    assert len(calls) == 2
+
+    stats = throttle.getStats()["www.espn.com"]
+    assert (stats["requests"], stats["retries"], stats["throttled"]) == (2, 1, 1)
+    # The host was slowed down by the 429 and sped back up a little by the 200
+    assert stats["rate"] == Throttle.rate / 2 + Throttle.recovery
+
+
+def test_errors_until_retries_run_out(noWaiting):
+
+    throttle = Throttle(retries = 3)
+    request, calls = stub(*[Response(503)] * 4)
+
+    with pytest.raises(requests.exceptions.HTTPError, match = "503 from {0} after 4 attempts".format(link)) as e:
+        throttle.fetch(link, request)
+    assert e.value.response.status_code == 503
+    assert len(calls) == 4
+    assert throttle.getStats()["www.espn.com"]["errors"] == 4
+
+
+def test_connection_error_is_retried(noWaiting):
+
+    throttle = Throttle(retries = 1)
+    ok = Response(200)
+    request, calls = stub(requests.exceptions.ConnectionError("reset"), ok)
+
+    assert throttle.fetch(link, request) is ok
+    assert len(calls) == 2
+
+    # Once the retries run out the error itself is raised
+    request, calls = stub(requests.exceptions.Timeout("slow"), requests.exceptions.Timeout("slow"))
+    with pytest.raises(requests.exceptions.Timeout):
+        throttle.fetch(link, request)
+    assert len(calls) == 2
+
+
+def test_retry_after(noWaiting, monkeypatch):
+
+    monkeypatch.setattr(Throttle, "maxDelay", 60)
+    throttle = Throttle(retries = 2)
+
+    # The wait the site asks for is used instead of the backoff, in seconds or as a date
+    later = email.utils.formatdate(time.time() + 30, usegmt = True)
+    request, calls = stub(Response(429, {"Retry-After": "7"}), Response(503, {"Retry-After": later}), Response(200))
+
+    assert throttle.fetch(link, request).status_code == 200
+    assert noWaiting[0] == 7
+    assert 25 < noWaiting[1] <= 30
+
+    # A wait longer than the longest allowed is cut short
+    assert Throttle.retryAfter(Response(429, {"Retry-After": "600"}), 0) == 60